@@ -0,0 +1,62 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+from app.core.config import settings
+from app.core.database import Base
+import app.models  # noqa: F401 - registers the models on Base.metadata
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
+target_metadata = Base.metadata
+
+# Schema objects managed outside the models: SQLite FTS5 tables, monthly
+# reviews_archive partitions and the review search index
+UNMANAGED_PREFIXES = ("reviews_fts", "reviews_archive_", "ix_reviews_search")
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Keep autogenerate from dropping schema objects the models don't describe"""
+    if reflected and compare_to is None and name and name.startswith(UNMANAGED_PREFIXES):
+        return False
+    return True
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
+        transaction_per_migration=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations against DATABASE_URL, committing after each revision"""
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool
+    )
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            transaction_per_migration=True
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
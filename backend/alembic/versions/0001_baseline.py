@@ -0,0 +1,111 @@
+"""Baseline schema: users, locations, posts and reviews
+
+Databases created by the app's create_all before migrations already have
+these tables; they are left as they are, so such a database is upgraded
+with a plain `alembic upgrade head`, no stamping needed.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 20:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("full_name", sa.String()),
+            sa.Column("is_active", sa.Boolean()),
+            sa.Column("is_superuser", sa.Boolean()),
+            sa.Column("google_access_token", sa.String(), nullable=True),
+            sa.Column("google_refresh_token", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True))
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if "locations" not in existing:
+        op.create_table(
+            "locations",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("google_location_id", sa.String()),
+            sa.Column("name", sa.String(), nullable=False),
+            sa.Column("address", sa.String()),
+            sa.Column("phone", sa.String()),
+            sa.Column("website", sa.String()),
+            sa.Column("category", sa.String()),
+            sa.Column("auto_reply_enabled", sa.Boolean()),
+            sa.Column("auto_post_enabled", sa.Boolean()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True))
+        )
+        op.create_index("ix_locations_id", "locations", ["id"])
+        op.create_index("ix_locations_google_location_id", "locations", ["google_location_id"], unique=True)
+
+    if "posts" not in existing:
+        op.create_table(
+            "posts",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("location_id", sa.Integer(), sa.ForeignKey("locations.id"), nullable=False),
+            sa.Column("google_post_id", sa.String(), nullable=True),
+            sa.Column("post_type", sa.Enum("UPDATE", "EVENT", "OFFER", name="posttype")),
+            sa.Column("status", sa.Enum("DRAFT", "SCHEDULED", "PUBLISHED", "FAILED", name="poststatus")),
+            sa.Column("title", sa.String(), nullable=True),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("media_url", sa.String(), nullable=True),
+            sa.Column("scheduled_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("ai_generated", sa.Integer()),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True))
+        )
+        op.create_index("ix_posts_id", "posts", ["id"])
+        op.create_index("ix_posts_google_post_id", "posts", ["google_post_id"], unique=True)
+
+    if "reviews" not in existing:
+        op.create_table(
+            "reviews",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("location_id", sa.Integer(), sa.ForeignKey("locations.id"), nullable=False),
+            sa.Column("google_review_id", sa.String()),
+            sa.Column("reviewer_name", sa.String()),
+            sa.Column("reviewer_profile_photo", sa.String(), nullable=True),
+            sa.Column("rating", sa.Float(), nullable=False),
+            sa.Column("comment", sa.Text(), nullable=True),
+            sa.Column("reply_text", sa.Text(), nullable=True),
+            sa.Column("reply_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("ai_generated_reply", sa.Boolean()),
+            sa.Column("review_created_at", sa.DateTime(timezone=True)),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True))
+        )
+        op.create_index("ix_reviews_id", "reviews", ["id"])
+        op.create_index("ix_reviews_google_review_id", "reviews", ["google_review_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table("reviews")
+    op.drop_table("posts")
+    op.drop_table("locations")
+    op.drop_table("users")
+    sa.Enum(name="poststatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="posttype").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,69 @@
+"""Review triage, near-duplicate and content hash columns
+
+Adds the columns of the local review classifier (sentiment, sentiment_score,
+topics, urgency), near-duplicate detection (content_signature,
+duplicate_of_id) and sync change detection (reviews.content_hash,
+locations.content_hash). They start empty for existing rows:
+
+- run the sign_stored_reviews task once after upgrading to classify and
+  MinHash-sign stored reviews;
+- empty content hashes never match, so each old review and location is
+  rewritten once on its next sync;
+- duplicate_of_id stays empty: clusters form among reviews synced from now on.
+
+The new columns are nullable without defaults, so adding them doesn't
+rewrite the tables. On Postgres the indexes are built CONCURRENTLY; if an
+index build is interrupted, drop the INVALID index before running the
+migration again.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 20:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("reviews", sa.Column("sentiment", sa.String(), nullable=True))
+    op.add_column("reviews", sa.Column("sentiment_score", sa.Float(), nullable=True))
+    op.add_column("reviews", sa.Column("topics", sa.JSON(), nullable=True))
+    op.add_column("reviews", sa.Column("urgency", sa.String(), nullable=True))
+    op.add_column("reviews", sa.Column("content_signature", sa.LargeBinary(), nullable=True))
+    op.add_column("reviews", sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+    op.add_column("reviews", sa.Column("content_hash", sa.String(64), nullable=True))
+    op.add_column("locations", sa.Column("content_hash", sa.String(64), nullable=True))
+    # SQLite can't add a constraint to an existing table (nor does it enforce foreign keys by default)
+    if op.get_bind().dialect.name != "sqlite":
+        op.create_foreign_key(
+            "reviews_duplicate_of_id_fkey", "reviews", "reviews", ["duplicate_of_id"], ["id"], ondelete="SET NULL"
+        )
+
+    with op.get_context().autocommit_block():
+        for column in ("sentiment", "urgency", "duplicate_of_id"):
+            op.create_index(
+                f"ix_reviews_{column}", "reviews", [column],
+                if_not_exists=True, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    for column in ("sentiment", "urgency", "duplicate_of_id"):
+        op.drop_index(f"ix_reviews_{column}", table_name="reviews")
+    if op.get_bind().dialect.name != "sqlite":
+        op.drop_constraint("reviews_duplicate_of_id_fkey", "reviews", type_="foreignkey")
+    op.drop_column("locations", "content_hash")
+    for column in (
+        "content_hash", "duplicate_of_id", "content_signature", "urgency", "topics", "sentiment_score", "sentiment"
+    ):
+        op.drop_column("reviews", column)
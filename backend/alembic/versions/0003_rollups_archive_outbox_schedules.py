@@ -0,0 +1,172 @@
+"""Tables the app used to create at startup: rollups, review archive, replication heartbeat, task outbox, sync schedules
+
+location_stats and review_daily_buckets are filled from the existing
+reviews and posts, so dashboards are right without running
+rebuild_location_stats after upgrading.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 20:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ROLLUP_COUNTERS = (
+    "review_count", "rating_sum", "rating_1", "rating_2", "rating_3", "rating_4", "rating_5",
+    "replied_count", "reply_latency_count", "reply_latency_seconds_sum",
+    "posts_draft", "posts_scheduled", "posts_published", "posts_failed"
+)
+FLOAT_COUNTERS = ("rating_sum", "reply_latency_seconds_sum")
+POST_STATUSES = ("DRAFT", "SCHEDULED", "PUBLISHED", "FAILED")
+# Ratings at or below this count as negative in the daily buckets
+NEGATIVE_RATING_THRESHOLD = 2
+
+
+def _counter(name):
+    counter_type = sa.Float() if name in FLOAT_COUNTERS else sa.Integer()
+    return sa.Column(name, counter_type, nullable=False, server_default="0")
+
+
+def _create_rollups():
+    op.create_table(
+        "location_stats",
+        sa.Column("location_id", sa.Integer(), sa.ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True),
+        *[_counter(name) for name in ROLLUP_COUNTERS],
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now())
+    )
+    op.create_table(
+        "review_daily_buckets",
+        sa.Column("location_id", sa.Integer(), sa.ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("review_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rating_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("negative_count", sa.Integer(), nullable=False, server_default="0")
+    )
+
+
+def _backfill_rollups(bind):
+    # Same counters as app.models.stats, frozen here and computed in the database
+    if bind.dialect.name == "postgresql":
+        day = "CAST(timezone('UTC', review_created_at) AS DATE)"
+        latency = "EXTRACT(EPOCH FROM reply_at - review_created_at)"
+    else:
+        day = "date(review_created_at)"
+        latency = "(julianday(reply_at) - julianday(review_created_at)) * 86400"
+    has_latency = "reply_at IS NOT NULL AND review_created_at IS NOT NULL"
+    # Star ratings round to the nearest histogram column, clamped to 1..5
+    stars = (
+        "CASE WHEN COALESCE(rating, 0) < 1.5 THEN 1 WHEN rating < 2.5 THEN 2"
+        " WHEN rating < 3.5 THEN 3 WHEN rating < 4.5 THEN 4 ELSE 5 END"
+    )
+    rating_columns = ",\n".join(
+        f"sum(CASE WHEN {stars} = {value} THEN 1 ELSE 0 END) AS rating_{value}" for value in range(1, 6)
+    )
+    post_columns = ",\n".join(
+        f"sum(CASE WHEN {'status IS NULL OR ' if status == 'DRAFT' else ''}status = '{status}' THEN 1 ELSE 0 END)"
+        f" AS posts_{status.lower()}"
+        for status in POST_STATUSES
+    )
+    bind.execute(sa.text(f"""
+        INSERT INTO location_stats (location_id, {", ".join(ROLLUP_COUNTERS)})
+        SELECT locations.id, {", ".join(f"COALESCE({name}, 0)" for name in ROLLUP_COUNTERS)}
+        FROM locations
+        LEFT JOIN (
+            SELECT location_id,
+                count(*) AS review_count,
+                sum(COALESCE(rating, 0)) AS rating_sum,
+                {rating_columns},
+                count(reply_at) AS replied_count,
+                sum(CASE WHEN {has_latency} THEN 1 ELSE 0 END) AS reply_latency_count,
+                sum(CASE WHEN {has_latency} AND {latency} > 0 THEN {latency} ELSE 0 END) AS reply_latency_seconds_sum
+            FROM reviews GROUP BY location_id
+        ) review_counters ON review_counters.location_id = locations.id
+        LEFT JOIN (
+            SELECT location_id,
+                {post_columns}
+            FROM posts GROUP BY location_id
+        ) post_counters ON post_counters.location_id = locations.id
+    """))
+    bind.execute(sa.text(f"""
+        INSERT INTO review_daily_buckets (location_id, day, review_count, rating_sum, negative_count)
+        SELECT location_id, {day}, count(*), sum(COALESCE(rating, 0)),
+            sum(CASE WHEN COALESCE(rating, 0) <= {NEGATIVE_RATING_THRESHOLD} THEN 1 ELSE 0 END)
+        FROM reviews WHERE review_created_at IS NOT NULL
+        GROUP BY location_id, {day}
+    """))
+
+
+def _create_review_archive():
+    # Same columns as reviews, keyed on (id, review_created_at) as Postgres partitioning requires
+    op.create_table(
+        "reviews_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("location_id", sa.Integer(), nullable=False),
+        sa.Column("google_review_id", sa.String()),
+        sa.Column("reviewer_name", sa.String()),
+        sa.Column("reviewer_profile_photo", sa.String()),
+        sa.Column("rating", sa.Float(), nullable=False),
+        sa.Column("comment", sa.Text()),
+        sa.Column("reply_text", sa.Text()),
+        sa.Column("reply_at", sa.DateTime(timezone=True)),
+        sa.Column("ai_generated_reply", sa.Boolean()),
+        sa.Column("sentiment", sa.String()),
+        sa.Column("sentiment_score", sa.Float()),
+        sa.Column("topics", sa.JSON()),
+        sa.Column("urgency", sa.String()),
+        sa.Column("content_signature", sa.LargeBinary()),
+        sa.Column("duplicate_of_id", sa.Integer()),
+        sa.Column("content_hash", sa.String(64)),
+        sa.Column("review_created_at", sa.DateTime(timezone=True), primary_key=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        postgresql_partition_by="RANGE (review_created_at)"
+    )
+    op.create_index("ix_reviews_archive_location_created", "reviews_archive", ["location_id", "review_created_at"])
+    op.create_index("ix_reviews_archive_google_review_id", "reviews_archive", ["google_review_id"])
+
+
+def upgrade() -> None:
+    _create_rollups()
+    _backfill_rollups(op.get_bind())
+    _create_review_archive()
+
+    op.create_table(
+        "replication_heartbeat",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("beat_at", sa.Float(), nullable=False)
+    )
+    op.create_table(
+        "task_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("task_name", sa.String(), nullable=False),
+        sa.Column("args", sa.JSON(), nullable=False),
+        sa.Column("kwargs", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now())
+    )
+    op.create_table(
+        "location_sync_schedules",
+        sa.Column("location_id", sa.Integer(), sa.ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("review_rate_per_day", sa.Float(), nullable=False),
+        sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("next_sync_at", sa.DateTime(timezone=True), nullable=False)
+    )
+    op.create_index("ix_location_sync_schedules_next_sync_at", "location_sync_schedules", ["next_sync_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("location_sync_schedules")
+    op.drop_table("task_outbox")
+    op.drop_table("replication_heartbeat")
+    op.drop_table("reviews_archive")
+    op.drop_table("review_daily_buckets")
+    op.drop_table("location_stats")
@@ -0,0 +1,73 @@
+"""Review full-text search index
+
+Postgres gets a GIN index on the tsvector expression search_reviews
+matches against, in REVIEW_SEARCH_LANGUAGE, built CONCURRENTLY so reviews
+stay writable; there is no stored column, so the table isn't rewritten.
+Databases where the API used to add the generated `search_vector` column
+at startup have that column and its index dropped once the new index is
+in place. SQLite gets an external-content FTS5 table kept in step with
+reviews by triggers.
+
+If the Postgres index build is interrupted, drop the INVALID
+ix_reviews_search before running the migration again.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 21:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FTS_TABLE = "reviews_fts"
+
+SQLITE_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"comment, reply_text, content='reviews', content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON reviews BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, comment, reply_text) VALUES (new.id, new.comment, new.reply_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON reviews BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, comment, reply_text) "
+    f"VALUES ('delete', old.id, old.comment, old.reply_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF comment, reply_text ON reviews BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, comment, reply_text) "
+    f"VALUES ('delete', old.id, old.comment, old.reply_text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, comment, reply_text) VALUES (new.id, new.comment, new.reply_text); END",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        from app.core.config import settings
+        from app.services.review_search import search_vector_sql
+
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_reviews_search ON reviews "
+                f"USING GIN (({search_vector_sql(settings.REVIEW_SEARCH_LANGUAGE, None)}))"
+            )
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_reviews_search_vector")
+        op.execute("ALTER TABLE reviews DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_reviews_search")
+    elif bind.dialect.name == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
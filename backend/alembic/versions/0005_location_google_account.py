@@ -0,0 +1,33 @@
+"""Google account of each location, for v4 resource names
+
+Reviews, replies and local posts are addressed as
+accounts/{account}/locations/{location} in the v4 API, while location sync
+stores the v1 name locations/{location}. The owning account is filled in
+by the next location sync, or by the next Pub/Sub notification for the
+location; until then its reviews and posts are skipped with a message.
+Locations stored under a full accounts/... name need nothing.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 21:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("locations", sa.Column("google_account_id", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("locations", "google_account_id")
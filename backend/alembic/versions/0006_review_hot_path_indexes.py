@@ -0,0 +1,46 @@
+"""Hot-path review indexes: newest and unreplied reviews per location, archival scans
+
+Built CONCURRENTLY on Postgres, so reviews stay writable while the indexes
+are built. If a build is interrupted, drop the INVALID index before
+running the migration again.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 22:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_reviews_location_created", "reviews", ["location_id", "review_created_at"],
+            if_not_exists=True, postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_reviews_unreplied", "reviews", ["location_id", "review_created_at"],
+            postgresql_where=sa.text("reply_text IS NULL"),
+            sqlite_where=sa.text("reply_text IS NULL"),
+            if_not_exists=True, postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_reviews_review_created_at", "reviews", ["review_created_at"],
+            if_not_exists=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reviews_review_created_at", table_name="reviews")
+    op.drop_index("ix_reviews_unreplied", table_name="reviews")
+    op.drop_index("ix_reviews_location_created", table_name="reviews")
@@ -0,0 +1,30 @@
+"""Claim leases on task outbox rows
+
+Relays claim a batch by setting claimed_until in a short transaction,
+publish it without holding locks, then delete it; rows whose relay died
+are claimed again once the lease runs out.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 23:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("task_outbox", sa.Column("claimed_until", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("task_outbox", "claimed_until")
@@ -0,0 +1,30 @@
+"""Claim leases on posts being published
+
+publish_post claims a post by setting claimed_until before calling
+Google and marks it PUBLISHED only once Google accepted it. Scheduled
+posts whose claim ran out are queued again.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-20 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("posts", sa.Column("claimed_until", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("posts", "claimed_until")
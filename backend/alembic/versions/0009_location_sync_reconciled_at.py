@@ -0,0 +1,30 @@
+"""When each location last fetched every review
+
+Review syncs fetch only the reviews changed since the previous sync, and
+every review once per REVIEW_RECONCILE_INTERVAL_SECONDS. Existing
+locations start with a full fetch.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-20 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("location_sync_schedules", sa.Column("last_reconciled_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("location_sync_schedules", "last_reconciled_at")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import auth_router, locations_router, posts_router, reviews_router
+from .endpoints import auth_router, locations_router, posts_router, reviews_router, stats_router, notifications_router, tasks_router, events_router
 
 api_router = APIRouter()
 
@@ -7,3 +7,7 @@ api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(locations_router, prefix="/locations", tags=["locations"])
 api_router.include_router(posts_router, prefix="/posts", tags=["posts"])
 api_router.include_router(reviews_router, prefix="/reviews", tags=["reviews"])
+api_router.include_router(stats_router, prefix="/stats", tags=["stats"])
+api_router.include_router(notifications_router, prefix="/notifications", tags=["notifications"])
+api_router.include_router(tasks_router, prefix="/tasks", tags=["tasks"])
+api_router.include_router(events_router, prefix="/events", tags=["events"])
@@ -2,10 +2,18 @@ from .auth import router as auth_router
 from .locations import router as locations_router
 from .posts import router as posts_router
 from .reviews import router as reviews_router
+from .stats import router as stats_router
+from .notifications import router as notifications_router
+from .tasks import router as tasks_router
+from .events import router as events_router
 
 __all__ = [
     "auth_router",
     "locations_router",
     "posts_router",
-    "reviews_router"
+    "reviews_router",
+    "stats_router",
+    "notifications_router",
+    "tasks_router",
+    "events_router"
 ]
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
-from app.core import get_db, verify_password, create_access_token, get_password_hash, settings
+from app.core import get_db, create_access_token, settings
+from app.core.database import SessionLocal
+from app.core.db_routing import read_session
+from app.core.login_throttle import LoginThrottled, check_login_allowed, clear_login_failures, record_login_failure
+from app.core.password_hashing import PasswordHashingBusy, check_password, hash_password
 from app.models import User
 from app.schemas import Token, UserCreate, User as UserSchema
 
@@ -10,8 +14,7 @@ router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """Get current authenticated user"""
+def _user_from_token(token: str, db: Session) -> User:
     from app.core.security import decode_access_token
     
     credentials_exception = HTTPException(
@@ -35,9 +38,61 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     return user
 
 
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    """Get current authenticated user"""
+    return _user_from_token(token, db)
+
+
+def get_current_user_detached(token: str = Depends(oauth2_scheme)) -> User:
+    """Get current authenticated user without holding a primary connection for the request.
+    
+    The user is loaded in a short-lived session that is closed before the
+    endpoint runs, for endpoints that read from a replica or stream.
+    """
+    db = SessionLocal()
+    try:
+        return _user_from_token(token, db)
+    finally:
+        db.close()
+
+
+def get_read_db(current_user: User = Depends(get_current_user_detached)):
+    """Dependency for read-only endpoints: a replica session unless the user just wrote"""
+    db = read_session(current_user.id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _client_ip(request: Request):
+    return request.client.host if request.client else None
+
+
+def _throttled(e: LoginThrottled) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(e),
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many logins in progress, please retry",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/register", response_model=UserSchema)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+def register(user_data: UserCreate, request: Request, db: Session = Depends(get_db)):
     """Register a new user"""
+    try:
+        check_login_allowed(_client_ip(request))
+    except LoginThrottled as e:
+        raise _throttled(e)
+    
     # Check if user already exists
     existing_user = db.query(User).filter(User.email == user_data.email).first()
     if existing_user:
@@ -46,8 +101,12 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user (the connection goes back to the pool while bcrypt runs)
+    db.close()
+    try:
+        hashed_password = hash_password(user_data.password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
     new_user = User(
         email=user_data.email,
         full_name=user_data.full_name,
@@ -62,11 +121,27 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login and get access token"""
+    client_ip = _client_ip(request)
+    try:
+        check_login_allowed(client_ip, form_data.username)
+    except LoginThrottled as e:
+        raise _throttled(e)
+    
     user = db.query(User).filter(User.email == form_data.username).first()
+    # Hand the connection back to the pool while bcrypt runs
+    db.close()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = check_password(user.id, form_data.password, user.hashed_password)
+        except PasswordHashingBusy:
+            raise _hashing_busy()
+    
+    if not valid:
+        record_login_failure(form_data.username, client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -79,6 +154,12 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
             detail="Inactive user"
         )
     
+    clear_login_failures(form_data.username, client_ip)
+    if new_hash:
+        # Stored hash used outdated parameters (BCRYPT_ROUNDS changed)
+        db.query(User).filter(User.id == user.id).update({"hashed_password": new_hash})
+        db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
@@ -0,0 +1,86 @@
+import asyncio
+from datetime import timedelta
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.event_stream import event_hub
+from app.core.security import create_access_token
+from app.models import User
+from .auth import get_current_user_detached
+
+router = APIRouter()
+
+STREAM_TOKEN_SCOPE = "events"
+
+
+def _stream_user_id(request: Request, token: str = None) -> int:
+    """Authenticate a stream from the bearer header or, for EventSource, the ?token= parameter.
+    
+    The header takes an access token. The query string, which ends up in
+    proxy and server logs, only takes a stream token from POST /events/token.
+    Uses a short-lived session rather than get_db, which would hold a
+    database connection for as long as the stream stays open.
+    """
+    from app.core.database import SessionLocal
+    from app.core.security import decode_access_token
+    
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        payload = decode_access_token(authorization[7:])
+    else:
+        payload = decode_access_token(token, scope=STREAM_TOKEN_SCOPE) if token else None
+    email = payload.get("sub") if payload else None
+    
+    user_id = None
+    if email:
+        db = SessionLocal()
+        try:
+            user_id = db.query(User.id).filter(User.email == email).scalar()
+        finally:
+            db.close()
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
+
+
+async def _events(user_id: int):
+    queue = event_hub.subscribe(user_id)
+    try:
+        # Clients reconnect after 5 seconds and should re-read their views, as events may have been missed
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                frame = await asyncio.wait_for(queue.get(), timeout=settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing idle connections
+                yield ": ping\n\n"
+                continue
+            yield frame
+    finally:
+        event_hub.unsubscribe(user_id, queue)
+
+
+@router.post("/token")
+def create_stream_token(current_user: User = Depends(get_current_user_detached)):
+    """Issue a short-lived token that only opens the event stream, for EventSource's ?token="""
+    token = create_access_token(
+        data={"sub": current_user.email, "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=settings.EVENT_STREAM_TOKEN_SECONDS)
+    )
+    return {"token": token, "expires_in": settings.EVENT_STREAM_TOKEN_SECONDS}
+
+
+@router.get("/")
+async def stream_events(request: Request, token: str = None):
+    """Server-sent events for the current user: task lifecycle and progress, and changed resources"""
+    user_id = await run_in_threadpool(_stream_user_id, request, token)
+    return StreamingResponse(
+        _events(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,37 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import date
+import numpy as np
 from app.core import get_db
-from app.models import Location, User
-from app.schemas import Location as LocationSchema, LocationCreate, LocationUpdate
-from .auth import get_current_user
+from app.core.http_cache import collection_validators, conditional_response, invalidate_responses
+from app.models import Location, ReviewDailyBucket, User
+from app.schemas import Location as LocationSchema, LocationCreate, LocationUpdate, LocationSyncProgress, RatingTrend
+from app.services.analytics import aggregate_rating_trend
+from .auth import get_current_user, get_current_user_detached, get_read_db
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[LocationSchema])
 def get_locations(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
 ):
     """Get all locations for current user"""
-    locations = db.query(Location).filter(
-        Location.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    query = db.query(Location).filter(Location.user_id == current_user.id)
     
-    return locations
+    return conditional_response(
+        request, current_user.id, "locations",
+        validators=lambda: collection_validators(query, Location),
+        load=lambda: query.offset(skip).limit(limit).all(),
+        response_type=List[LocationSchema]
+    )
 
 
 @router.get("/{location_id}", response_model=LocationSchema)
 def get_location(
     location_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific location"""
-    location = db.query(Location).filter(
+    query = db.query(Location).filter(
+        Location.id == location_id,
+        Location.user_id == current_user.id
+    )
+    
+    return conditional_response(
+        request, current_user.id, "locations",
+        validators=lambda: collection_validators(query, Location),
+        load=lambda: query.first(),
+        response_type=LocationSchema,
+        not_found_detail="Location not found"
+    )
+
+
+@router.get("/{location_id}/rating-trend", response_model=RatingTrend)
+def get_rating_trend(
+    location_id: int,
+    start: date = None,
+    end: date = None,
+    interval: str = Query("day", pattern="^(day|week|month)$"),
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
+):
+    """Get average rating, volume and negative share over time from daily buckets"""
+    location = db.query(Location.id).filter(
         Location.id == location_id,
         Location.user_id == current_user.id
     ).first()
@@ -42,7 +75,33 @@ def get_location(
             detail="Location not found"
         )
     
-    return location
+    query = db.query(
+        ReviewDailyBucket.day,
+        ReviewDailyBucket.review_count,
+        ReviewDailyBucket.rating_sum,
+        ReviewDailyBucket.negative_count
+    ).filter(ReviewDailyBucket.location_id == location_id)
+    
+    if start:
+        query = query.filter(ReviewDailyBucket.day >= start)
+    if end:
+        query = query.filter(ReviewDailyBucket.day <= end)
+    
+    rows = query.order_by(ReviewDailyBucket.day).all()
+    days = np.array([row[0] for row in rows], dtype="datetime64[D]")
+    counters = np.array([row[1:] for row in rows], dtype="float64").reshape(len(rows), 3)
+    review_count, rating_sum, negative_count = counters.sum(axis=0)
+    
+    return {
+        "location_id": location_id,
+        "interval": interval,
+        "start": start,
+        "end": end,
+        "review_count": int(review_count),
+        "average_rating": round(rating_sum / review_count, 2) if review_count else None,
+        "negative_share": round(negative_count / review_count, 4) if review_count else None,
+        "points": aggregate_rating_trend(days, counters[:, 0], counters[:, 1], counters[:, 2], interval)
+    }
 
 
 @router.post("/", response_model=LocationSchema, status_code=status.HTTP_201_CREATED)
@@ -71,6 +130,7 @@ def create_location(
     db.add(new_location)
     db.commit()
     db.refresh(new_location)
+    invalidate_responses(current_user.id, "locations")
     
     return new_location
 
@@ -101,6 +161,7 @@ def update_location(
     
     db.commit()
     db.refresh(location)
+    invalidate_responses(current_user.id, "locations")
     
     return location
 
@@ -125,58 +186,51 @@ def delete_location(
     
     db.delete(location)
     db.commit()
+    invalidate_responses(current_user.id, "locations", "posts", "reviews")
     
     return None
 
 
-@router.post("/sync")
+@router.post("/sync", status_code=status.HTTP_202_ACCEPTED)
 def sync_google_locations(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user)
 ):
-    """Sync locations from Google Business Profile"""
+    """Sync locations from Google Business Profile in the background"""
     if not current_user.google_access_token:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Google account not connected"
         )
     
-    from app.services import GoogleBusinessService
+    from app.core.task_events import enqueue_for_user
+    from app.tasks import sync_user_locations
     
-    gb_service = GoogleBusinessService(
-        access_token=current_user.google_access_token,
-        refresh_token=current_user.google_refresh_token
-    )
+    task = enqueue_for_user(sync_user_locations, current_user.id, current_user.id)
+    return {"message": "Syncing locations", "task_id": task.id}
+
+
+@router.get("/sync/{task_id}", response_model=LocationSyncProgress)
+def get_location_sync(
+    task_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get the progress of a location sync"""
+    from app.core.task_events import task_owner
     
-    # Get accounts
-    accounts = gb_service.get_accounts()
-    synced_count = 0
-    
-    for account in accounts:
-        account_id = account.get('name', '').split('/')[-1]
-        locations = gb_service.get_locations(account_id)
-        
-        for g_location in locations:
-            google_location_id = g_location.get('name', '')
-            
-            # Check if location already exists
-            existing = db.query(Location).filter(
-                Location.google_location_id == google_location_id
-            ).first()
-            
-            if not existing:
-                new_location = Location(
-                    user_id=current_user.id,
-                    google_location_id=google_location_id,
-                    name=g_location.get('title', ''),
-                    address=g_location.get('storefrontAddress', {}).get('addressLines', [''])[0],
-                    phone=g_location.get('phoneNumbers', {}).get('primaryPhone', ''),
-                    website=g_location.get('websiteUri', ''),
-                    category=g_location.get('categories', {}).get('primaryCategory', {}).get('displayName', '')
-                )
-                db.add(new_location)
-                synced_count += 1
+    if task_owner(task_id) != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sync not found"
+        )
     
-    db.commit()
+    from app.tasks import celery_app
+    
+    result = celery_app.AsyncResult(task_id)
+    info = result.info if isinstance(result.info, dict) else {}
     
-    return {"message": f"Synced {synced_count} new locations"}
+    return LocationSyncProgress(
+        task_id=task_id,
+        state=result.state,
+        result=str(result.result) if result.ready() else None,
+        **info
+    )
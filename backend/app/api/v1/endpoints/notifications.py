@@ -0,0 +1,125 @@
+import base64
+import binascii
+import hmac
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core import get_db
+from app.core.config import settings
+from app.models import Location
+from app.schemas import PubSubPushEnvelope, GbpNotification
+
+router = APIRouter()
+
+REVIEW_NOTIFICATION_TYPES = {"NEW_REVIEW", "UPDATED_REVIEW"}
+SEEN_MESSAGE_TTL_SECONDS = 24 * 3600
+
+
+def verify_push_request(request: Request, token: str = None):
+    """Accept only pushes from our Pub/Sub subscription (OIDC token or shared URL token)"""
+    if settings.PUBSUB_AUDIENCE:
+        from google.auth.transport import requests as google_requests
+        from google.oauth2 import id_token
+        
+        authorization = request.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Missing push token")
+        try:
+            claims = id_token.verify_oauth2_token(
+                authorization[len("Bearer "):],
+                google_requests.Request(),
+                audience=settings.PUBSUB_AUDIENCE
+            )
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid push token")
+        if settings.PUBSUB_SERVICE_ACCOUNT and (
+            claims.get("email") != settings.PUBSUB_SERVICE_ACCOUNT or not claims.get("email_verified")
+        ):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid push token")
+    elif settings.PUBSUB_VERIFICATION_TOKEN:
+        if not token or not hmac.compare_digest(token, settings.PUBSUB_VERIFICATION_TOKEN):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid push token")
+    else:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Push notifications are not configured")
+
+
+def first_delivery(message_id: str) -> bool:
+    """Pub/Sub delivers at least once; only the first delivery of a message is processed"""
+    from app.core.redis_client import get_redis
+    
+    try:
+        return bool(get_redis().set(f"pubsub:message:{message_id}", 1, nx=True, ex=SEEN_MESSAGE_TTL_SECONDS))
+    except Exception as e:
+        # Ingestion is idempotent, so a duplicate is better than a dropped review
+        print(f"Error checking Pub/Sub message {message_id}: {e}")
+        return True
+
+
+def forget_delivery(message_id: str):
+    """Let a redelivery of a message we failed to process through `first_delivery` again"""
+    from app.core.redis_client import get_redis
+    
+    try:
+        get_redis().delete(f"pubsub:message:{message_id}")
+    except Exception as e:
+        print(f"Error releasing Pub/Sub message {message_id}: {e}")
+
+
+@router.post("/gbp", status_code=status.HTTP_204_NO_CONTENT)
+def receive_gbp_notification(
+    envelope: PubSubPushEnvelope,
+    request: Request,
+    token: str = None,
+    db: Session = Depends(get_db)
+):
+    """Receive a Google Business Profile notification pushed by Pub/Sub"""
+    verify_push_request(request, token)
+    
+    try:
+        notification = GbpNotification.model_validate_json(base64.b64decode(envelope.message.data, validate=True))
+    except (binascii.Error, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid notification payload"
+        )
+    
+    # Acknowledge everything we don't act on so Pub/Sub stops redelivering it
+    if notification.type not in REVIEW_NOTIFICATION_TYPES or not notification.review:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    
+    # Review names look like accounts/{account}/locations/{location}/reviews/{review}
+    parts = notification.review.split("/")
+    if len(parts) != 6 or parts[0] != "accounts" or parts[2] != "locations" or parts[4] != "reviews":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid review name"
+        )
+    
+    if not first_delivery(envelope.message.message_id):
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    
+    # The message counts as seen only once its ingestion is committed; until then a
+    # failure releases it, so Pub/Sub's redelivery (after our 500) is processed
+    try:
+        location = db.query(Location.id).filter(or_(
+            Location.google_location_id == "/".join(parts[2:4]),
+            Location.google_location_id == "/".join(parts[:4])
+        )).first()
+        
+        if location:
+            # Notifications name the account, so locations synced before it was stored learn it here
+            db.query(Location).filter(
+                Location.id == location.id,
+                Location.google_account_id.is_(None),
+                Location.google_location_id == "/".join(parts[2:4])
+            ).update({"google_account_id": "/".join(parts[:2])}, synchronize_session=False)
+            
+            from app.services.outbox import enqueue_after_commit
+            from app.tasks import ingest_review_notification
+            enqueue_after_commit(db, ingest_review_notification, location.id, notification.review)
+            db.commit()
+    except Exception:
+        forget_delivery(envelope.message.message_id)
+        raise
+    
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,21 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import date
 from app.core import get_db
+from app.core.http_cache import collection_validators, conditional_response, invalidate_responses
 from app.models import Post, Location, User
-from app.schemas import Post as PostSchema, PostCreate, PostUpdate, PostGenerate
-from .auth import get_current_user
+from app.schemas import Post as PostSchema, PostCreate, PostUpdate, PostGenerate, PostCampaign, PostCampaignProgress, PostImportResult
+from .auth import get_current_user, get_current_user_detached, get_read_db
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[PostSchema])
 def get_posts(
+    request: Request,
     location_id: int = None,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
 ):
     """Get all posts for current user"""
     query = db.query(Post).join(Location).filter(Location.user_id == current_user.id)
@@ -23,29 +26,63 @@ def get_posts(
     if location_id:
         query = query.filter(Post.location_id == location_id)
     
-    posts = query.offset(skip).limit(limit).all()
-    return posts
+    return conditional_response(
+        request, current_user.id, "posts",
+        validators=lambda: collection_validators(query, Post),
+        load=lambda: query.offset(skip).limit(limit).all(),
+        response_type=List[PostSchema]
+    )
+
+
+@router.get("/export")
+def export_posts(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet)$"),
+    columns: str = None,
+    location_id: int = None,
+    start: date = None,
+    end: date = None,
+    current_user: User = Depends(get_current_user_detached)
+):
+    """Stream all posts of current user as CSV, NDJSON or Parquet"""
+    from app.services.export import export_response
+    
+    try:
+        return export_response(
+            "posts",
+            current_user.id,
+            export_format,
+            columns=columns,
+            location_id=location_id,
+            start=start,
+            end=end
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.get("/{post_id}", response_model=PostSchema)
 def get_post(
     post_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific post"""
-    post = db.query(Post).join(Location).filter(
+    query = db.query(Post).join(Location).filter(
         Post.id == post_id,
         Location.user_id == current_user.id
-    ).first()
-    
-    if not post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Post not found"
-        )
+    )
     
-    return post
+    return conditional_response(
+        request, current_user.id, "posts",
+        validators=lambda: collection_validators(query, Post),
+        load=lambda: query.first(),
+        response_type=PostSchema,
+        not_found_detail="Post not found"
+    )
 
 
 @router.post("/", response_model=PostSchema, status_code=status.HTTP_201_CREATED)
@@ -72,10 +109,29 @@ def create_post(
     db.add(new_post)
     db.commit()
     db.refresh(new_post)
+    invalidate_responses(current_user.id, "posts")
     
     return new_post
 
 
+@router.post("/import", response_model=PostImportResult)
+def import_posts(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    current_user: User = Depends(get_current_user_detached)
+):
+    """Create posts in bulk from a CSV file, reporting invalid rows"""
+    from app.services.post_import import import_posts_csv
+    
+    try:
+        return import_posts_csv(file.file, current_user.id, dry_run=dry_run)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.put("/{post_id}", response_model=PostSchema)
 def update_post(
     post_id: int,
@@ -102,6 +158,7 @@ def update_post(
     
     db.commit()
     db.refresh(post)
+    invalidate_responses(current_user.id, "posts")
     
     return post
 
@@ -126,6 +183,7 @@ def delete_post(
     
     db.delete(post)
     db.commit()
+    invalidate_responses(current_user.id, "posts")
     
     return None
 
@@ -148,8 +206,9 @@ def publish_post(
             detail="Post not found"
         )
     
+    from app.core.task_events import enqueue_for_user
     from app.tasks import publish_post as publish_post_task
-    task = publish_post_task.delay(post_id)
+    task = enqueue_for_user(publish_post_task, current_user.id, post_id)
     
     return {"message": "Post queued for publishing", "task_id": task.id}
 
@@ -174,11 +233,12 @@ def generate_ai_post(
         )
     
     from app.services import AIResponseService
+    from app.services.post_cache import cached_post_content
     
     ai_service = AIResponseService()
-    content = ai_service.generate_post_content(
-        business_name=location.name,
-        business_category=location.category or "business",
+    content = cached_post_content(
+        ai_service,
+        location,
         topic=post_data.topic,
         post_type=post_data.post_type.value
     )
@@ -199,5 +259,82 @@ def generate_ai_post(
     db.add(new_post)
     db.commit()
     db.refresh(new_post)
+    invalidate_responses(current_user.id, "posts")
     
     return new_post
+
+
+@router.post("/campaigns", status_code=status.HTTP_202_ACCEPTED)
+def create_post_campaign(
+    campaign: PostCampaign,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Generate scheduled AI posts for many locations in the background"""
+    location_ids = sorted(set(campaign.location_ids))
+    owned = db.query(Location.id).filter(
+        Location.id.in_(location_ids),
+        Location.user_id == current_user.id
+    ).count()
+    
+    if owned != len(location_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Location not found"
+        )
+    
+    from app.core.config import settings
+    from app.core.task_events import enqueue_for_user
+    from app.tasks import generate_post_campaign
+    from app.tasks.post_tasks import campaign_schedule
+    
+    total = len(location_ids) * len(campaign_schedule(
+        campaign.start_date, campaign.end_date, campaign.cadence_days, campaign.post_time
+    ))
+    if total > settings.CAMPAIGN_MAX_POSTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campaign would create {total} posts, the limit is {settings.CAMPAIGN_MAX_POSTS}"
+        )
+    
+    task = enqueue_for_user(
+        generate_post_campaign,
+        current_user.id,
+        location_ids=location_ids,
+        start_date=campaign.start_date.isoformat(),
+        end_date=campaign.end_date.isoformat(),
+        cadence_days=campaign.cadence_days,
+        post_time=campaign.post_time.isoformat(),
+        topics=campaign.topics,
+        post_type=campaign.post_type.value,
+        status=campaign.status.value
+    )
+    
+    return {"message": f"Generating {total} posts", "task_id": task.id, "total": total}
+
+
+@router.get("/campaigns/{task_id}", response_model=PostCampaignProgress)
+def get_post_campaign(
+    task_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get the progress of a post campaign"""
+    from app.core.task_events import task_owner
+    
+    if task_owner(task_id) != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign not found"
+        )
+    
+    from app.tasks import celery_app
+    
+    result = celery_app.AsyncResult(task_id)
+    info = result.info if isinstance(result.info, dict) else {}
+    
+    return PostCampaignProgress(
+        task_id=task_id,
+        state=result.state,
+        result=str(result.result) if result.ready() else None,
+        **info
+    )
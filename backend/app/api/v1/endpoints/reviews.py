@@ -1,51 +1,147 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import date
 from app.core import get_db
+from app.core.http_cache import collection_validators, conditional_response, invalidate_responses
 from app.models import Review, Location, User
-from app.schemas import Review as ReviewSchema, ReviewUpdate, ReviewReplyGenerate
-from .auth import get_current_user
+from app.schemas import Review as ReviewSchema, ReviewUpdate, ReviewReplyGenerate, ReviewSearchResults, ReviewHistoryItem
+from .auth import get_current_user, get_current_user_detached, get_read_db
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[ReviewSchema])
 def get_reviews(
+    request: Request,
     location_id: int = None,
+    unreplied: bool = False,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
 ):
-    """Get all reviews for current user"""
+    """Get reviews for current user, newest first (archived reviews are under /history)"""
     query = db.query(Review).join(Location).filter(Location.user_id == current_user.id)
     
     if location_id:
         query = query.filter(Review.location_id == location_id)
+    if unreplied:
+        query = query.filter(Review.reply_text.is_(None))
+    query = query.order_by(Review.review_created_at.desc(), Review.id.desc())
+    
+    return conditional_response(
+        request, current_user.id, "reviews",
+        validators=lambda: collection_validators(query, Review),
+        load=lambda: query.offset(skip).limit(limit).all(),
+        response_type=List[ReviewSchema]
+    )
+
+
+@router.get("/export")
+def export_reviews(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet)$"),
+    columns: str = None,
+    location_id: int = None,
+    start: date = None,
+    end: date = None,
+    current_user: User = Depends(get_current_user_detached)
+):
+    """Stream all reviews of current user as CSV, NDJSON or Parquet"""
+    from app.services.export import export_response
     
-    reviews = query.offset(skip).limit(limit).all()
-    return reviews
+    try:
+        return export_response(
+            "reviews",
+            current_user.id,
+            export_format,
+            columns=columns,
+            location_id=location_id,
+            start=start,
+            end=end
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get("/history", response_model=List[ReviewHistoryItem])
+def get_review_history(
+    location_id: int = None,
+    start: date = None,
+    end: date = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
+):
+    """Get live and archived reviews for current user, newest first"""
+    from app.services.review_archive import review_history
+    
+    rows = review_history(db, current_user.id, location_id, start, end, skip, limit)
+    return [ReviewHistoryItem.model_validate(row) for row in rows]
+
+
+@router.get("/search", response_model=ReviewSearchResults)
+def search_reviews(
+    q: str = Query(..., min_length=1, max_length=256),
+    location_id: int = None,
+    min_rating: float = None,
+    max_rating: float = None,
+    cursor: str = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
+):
+    """Full-text search over review comments and replies, best match first"""
+    from app.services.review_search import search_reviews as run_search
+    
+    try:
+        hits, next_cursor = run_search(
+            db,
+            current_user.id,
+            q,
+            location_id=location_id,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    items = [
+        {**ReviewSchema.model_validate(review).model_dump(), "rank": rank}
+        for review, rank in hits
+    ]
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.get("/{review_id}", response_model=ReviewSchema)
 def get_review(
     review_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific review"""
-    review = db.query(Review).join(Location).filter(
+    query = db.query(Review).join(Location).filter(
         Review.id == review_id,
         Location.user_id == current_user.id
-    ).first()
-    
-    if not review:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Review not found"
-        )
+    )
     
-    return review
+    return conditional_response(
+        request, current_user.id, "reviews",
+        validators=lambda: collection_validators(query, Review),
+        load=lambda: query.first(),
+        response_type=ReviewSchema,
+        not_found_detail="Review not found"
+    )
 
 
 @router.put("/{review_id}", response_model=ReviewSchema)
@@ -74,6 +170,7 @@ def update_review(
     
     db.commit()
     db.refresh(review)
+    invalidate_responses(current_user.id, "reviews")
     
     return review
 
@@ -106,20 +203,29 @@ def reply_to_review(
         )
     
     from app.services import GoogleBusinessService
+    from app.services.google_business import v4_location_name
     from datetime import datetime
     
+    location_name = v4_location_name(location.google_account_id, location.google_location_id)
+    if not location_name:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Google account of this location unknown, sync locations first"
+        )
+    
     gb_service = GoogleBusinessService(
         access_token=current_user.google_access_token,
         refresh_token=current_user.google_refresh_token
     )
     
-    result = gb_service.reply_to_review(review.google_review_id, reply_text)
+    result = gb_service.reply_to_review(f"{location_name}/reviews/{review.google_review_id}", reply_text)
     
     if result:
         review.reply_text = reply_text
         review.reply_at = datetime.utcnow()
         review.ai_generated_reply = False
         db.commit()
+        invalidate_responses(current_user.id, "reviews")
         
         return {"message": "Reply posted successfully"}
     else:
@@ -183,6 +289,7 @@ def sync_reviews(
             detail="Google account not connected"
         )
     
+    from app.core.task_events import enqueue_for_user
     from app.tasks import sync_location_reviews, sync_reviews as sync_all_reviews
     
     if location_id:
@@ -198,8 +305,8 @@ def sync_reviews(
                 detail="Location not found"
             )
         
-        task = sync_location_reviews.delay(location_id)
+        task = enqueue_for_user(sync_location_reviews, current_user.id, location_id)
         return {"message": f"Syncing reviews for location {location_id}", "task_id": task.id}
     else:
-        task = sync_all_reviews.delay()
+        task = enqueue_for_user(sync_all_reviews, current_user.id, current_user.id)
         return {"message": "Syncing reviews for all locations", "task_id": task.id}
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import Dict
+from app.models import Location, LocationStats, PostStatus, User
+from app.models.stats import COUNTER_COLUMNS
+from app.schemas import UserStats
+from .auth import get_current_user_detached, get_read_db
+
+router = APIRouter()
+
+def _summarize(counters: Dict[str, float]) -> Dict:
+    """Turn raw rollup counters into averages and breakdowns"""
+    review_count = int(counters["review_count"])
+    replied_count = int(counters["replied_count"])
+    latency_count = counters["reply_latency_count"]
+    
+    return {
+        "review_count": review_count,
+        "average_rating": round(counters["rating_sum"] / review_count, 2) if review_count else None,
+        "rating_histogram": {star: int(counters[f"rating_{star}"]) for star in range(1, 6)},
+        "replied_count": replied_count,
+        "unreplied_count": review_count - replied_count,
+        "average_reply_latency_seconds": (
+            round(counters["reply_latency_seconds_sum"] / latency_count, 1) if latency_count else None
+        ),
+        "posts_by_status": {
+            status.value: int(counters[f"posts_{status.value.lower()}"]) for status in PostStatus
+        }
+    }
+
+
+@router.get("/", response_model=UserStats)
+def get_stats(
+    location_id: int = None,
+    current_user: User = Depends(get_current_user_detached),
+    db: Session = Depends(get_read_db)
+):
+    """Get review and post aggregates per location and for the current user"""
+    query = db.query(Location.id, Location.name, LocationStats).outerjoin(
+        LocationStats, LocationStats.location_id == Location.id
+    ).filter(Location.user_id == current_user.id)
+    
+    if location_id:
+        query = query.filter(Location.id == location_id)
+    
+    totals = dict.fromkeys(COUNTER_COLUMNS, 0)
+    locations = []
+    for loc_id, loc_name, stats in query.all():
+        counters = {column: (getattr(stats, column) or 0) if stats else 0 for column in COUNTER_COLUMNS}
+        for column, value in counters.items():
+            totals[column] += value
+        locations.append({"location_id": loc_id, "location_name": loc_name, **_summarize(counters)})
+    
+    return {"location_count": len(locations), "locations": locations, **_summarize(totals)}
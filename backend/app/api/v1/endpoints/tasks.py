@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.task_events import task_owner
+from app.models import User
+from app.schemas import TaskStatus
+from .auth import get_current_user
+
+router = APIRouter()
+
+
+@router.get("/{task_id}", response_model=TaskStatus)
+def get_task(
+    task_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get the state of a task started by the current user"""
+    if task_owner(task_id) != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    
+    from app.tasks import celery_app
+    
+    result = celery_app.AsyncResult(task_id)
+    return TaskStatus(
+        task_id=task_id,
+        state=result.state,
+        progress=result.info if result.state == "PROGRESS" and isinstance(result.info, dict) else None,
+        result=str(result.result) if result.ready() else None
+    )
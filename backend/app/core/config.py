@@ -10,26 +10,147 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Read replicas (see core/db_routing.py)
+    DATABASE_REPLICA_URLS: str = ""  # comma-separated; empty sends every read to DATABASE_URL
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # replicas further behind are skipped
+    REPLICA_LAG_CHECK_SECONDS: float = 2.0
+    READ_YOUR_WRITES_SECONDS: int = 15  # a user's reads stay on the primary this long after their writes
+    
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    BCRYPT_ROUNDS: int = 12  # existing hashes are upgraded on the next login after a change
+    
+    # Password hashing pool and login throttling (see core/password_hashing.py, core/login_throttle.py)
+    PASSWORD_HASH_WORKERS: int = 2  # 0 hashes in the request thread
+    PASSWORD_HASH_MAX_PENDING: int = 8  # hashes queued or running before logins get 503
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
+    PASSWORD_VERIFY_CACHE_SECONDS: int = 300  # 0 disables
+    PASSWORD_VERIFY_CACHE_SIZE: int = 10000
+    LOGIN_THROTTLE_WINDOW_SECONDS: int = 300
+    LOGIN_MAX_ATTEMPTS_PER_IP: int = 100  # 0 disables
+    LOGIN_MAX_FAILURES_PER_EMAIL: int = 5  # 0 disables
     
     # Google Business Profile API
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str
+    GBP_API_BASE_URL: Optional[str] = None  # e.g. http://localhost:8090 for scripts/fake_upstream_server.py
+    GBP_REQUEST_TIMEOUT_SECONDS: float = 30.0
     
     # OpenAI
     OPENAI_API_KEY: str
+    OPENAI_BASE_URL: Optional[str] = None  # e.g. http://localhost:8090/v1 for scripts/fake_upstream_server.py
+    OPENAI_FAST_MODEL: str = "gpt-4o-mini"
+    OPENAI_QUALITY_MODEL: str = "gpt-4o"
+    REVIEW_COMMENT_TOKEN_BUDGET: int = 400
+    REVIEW_REPLY_SENSITIVE_TOKENS: int = 150
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_TOKENS_PER_MINUTE: int = 200000
+    
+    # Location sync
+    LOCATION_SYNC_CONCURRENCY: int = 8
+    
+    # Post content cache (see services/post_cache.py)
+    POST_CACHE_ENABLED: bool = False
+    POST_CACHE_SCOPE: str = "account"  # "account" or "global"
+    POST_CACHE_MAX_USES: int = 10
+    POST_CACHE_MAX_VARIANTS: int = 8
+    POST_CACHE_TTL_SECONDS: int = 14 * 24 * 3600
+    
+    # Conditional GETs and response cache (see core/http_cache.py)
+    RESPONSE_CACHE_ENABLED: bool = False
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    
+    # Post publishing (see tasks/post_tasks.py)
+    POST_PUBLISH_CLAIM_SECONDS: float = 300.0  # a post whose publish run died is published again after this
+    
+    # Bulk CSV post import
+    POST_IMPORT_BATCH_SIZE: int = 1000
+    POST_IMPORT_MAX_ROWS: int = 100000
+    POST_IMPORT_MAX_ERRORS: int = 1000
+    
+    # Streaming exports
+    EXPORT_BATCH_SIZE: int = 5000
+    
+    # Review full-text search
+    REVIEW_SEARCH_LANGUAGE: str = "english"  # Postgres text search configuration, the one ix_reviews_search is built for
+    
+    # Review archival (see services/review_archive.py)
+    REVIEW_RETENTION_DAYS: int = 730  # 0 disables archival
+    REVIEW_ARCHIVE_BATCH_SIZE: int = 5000
+    REVIEW_ARCHIVE_INTERVAL_SECONDS: float = 24 * 3600
+    REVIEW_ARCHIVE_TABLESPACE: Optional[str] = None  # Postgres tablespace for archive partitions, e.g. on cheaper disks
+    
+    # Post campaigns
+    CAMPAIGN_CONCURRENCY: int = 8
+    CAMPAIGN_MAX_POSTS: int = 20000
+    CAMPAIGN_INSERT_BATCH_SIZE: int = 500
+    
+    # Review triage
+    REVIEW_CLASSIFIER_MODEL_PATH: Optional[str] = None
+    REVIEW_CLASSIFIER_MAX_TRAINING_REVIEWS: int = 50000  # most recent labelled reviews the model is fitted on
+    REPLY_DISPATCH_INTERVAL_SECONDS: float = 30.0
+    REPLY_DISPATCH_MAX_LOCATIONS: int = 50
+    REPLY_DISPATCH_PER_LOCATION: int = 2
+    REPLY_VISIBILITY_TIMEOUT_SECONDS: float = 15 * 60  # a dispatched review is queued again if not handled by then
+    REPLY_MAX_ATTEMPTS: int = 5
+    DEDUP_MIN_TOKENS: int = 6
+    DEDUP_MIN_SIMILARITY: float = 0.6
+    DEDUP_INDEX_MAX_REVIEWS: int = 250000  # per account, about 250 bytes each
+    DEDUP_CACHED_ACCOUNTS: int = 4
+    
+    # Adaptive review sync (see services/sync_schedule.py)
+    REVIEW_SYNC_SCHEDULER_INTERVAL_SECONDS: float = 60.0  # how often due locations are queued
+    REVIEW_SYNC_MIN_INTERVAL_SECONDS: float = 15 * 60
+    REVIEW_RECONCILE_INTERVAL_SECONDS: float = 48 * 3600  # longest gap between syncs of a location
+    REVIEW_SYNC_TARGET_REVIEWS: float = 1.0  # expected new reviews per sync
+    REVIEW_SYNC_RATE_HALF_LIFE_DAYS: float = 14.0
+    REVIEW_SYNC_JITTER: float = 0.2  # intervals vary by up to this fraction either way
+    REVIEW_SYNC_MAX_LOCATIONS_PER_RUN: int = 1000
+    
+    # GBP push notifications (Pub/Sub push subscription)
+    PUBSUB_VERIFICATION_TOKEN: Optional[str] = None  # shared ?token= on the push endpoint URL
+    PUBSUB_AUDIENCE: Optional[str] = None  # verify the push OIDC token when set
+    PUBSUB_SERVICE_ACCOUNT: Optional[str] = None
     
     # Redis
     REDIS_URL: str
+    REDIS_SOCKET_TIMEOUT: float = 2.0
     
     # Celery
     CELERY_BROKER_URL: str
     CELERY_RESULT_BACKEND: str
     
+    # Task outbox (see services/outbox.py)
+    OUTBOX_BATCH_SIZE: int = 1000  # tasks published per transaction and broker connection
+    OUTBOX_INLINE_MAX_BATCHES: int = 10  # relayed right after a commit; the beat relay takes the rest
+    OUTBOX_RELAY_INTERVAL_SECONDS: float = 5.0
+    OUTBOX_CLAIM_SECONDS: float = 300.0  # rows a relay claimed but never deleted are sent again after this
+    
+    # Live events (see core/task_events.py, core/event_stream.py)
+    TASK_OWNER_TTL_SECONDS: int = 86400  # how long a task's status stays readable by its user
+    EVENT_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    EVENT_STREAM_QUEUE_SIZE: int = 100  # per connection; a client that falls behind is told to resync
+    EVENT_STREAM_TOKEN_SECONDS: int = 60  # lifetime of the ?token= for EventSource, checked on connect
+    
+    # Metrics
+    CELERY_METRICS_PORT: int = 9808
+    
+    # Tracing
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "otlp"  # "otlp" or "file"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    
+    # Health checks
+    HEALTH_CACHE_SECONDS: float = 5.0
+    HEALTH_CHECK_TIMEOUT: float = 2.0
+    HEALTH_DB_LATENCY_THRESHOLD: float = 0.5
+    HEALTH_MAX_QUEUE_DEPTH: int = 1000
+    
     # Environment
     ENVIRONMENT: str = "development"
     
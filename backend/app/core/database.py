@@ -2,10 +2,22 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .metrics import instrument_engine
 
 engine = create_engine(settings.DATABASE_URL)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replicas, used through core/db_routing.py
+replica_engines = [
+    create_engine(url.strip()) for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()
+]
+for replica_engine in replica_engines:
+    instrument_engine(replica_engine, pool_gauges=False)
+ReplicaSessions = [
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) for replica_engine in replica_engines
+]
+
 Base = declarative_base()
 
 
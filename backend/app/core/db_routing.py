@@ -0,0 +1,119 @@
+import itertools
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+from .config import settings
+from .database import ReplicaSessions, SessionLocal, engine, replica_engines
+from .metrics import DB_READ_ROUTING, DB_REPLICA_LAG
+
+LAST_WRITE_KEY_PREFIX = "db_routing:last_write:"
+HEARTBEAT_ID = 1
+
+_round_robin = itertools.count()
+_lag_lock = threading.Lock()
+_lag = {"checked_at": float("-inf"), "lags": [None] * len(replica_engines)}
+
+
+def _beat_primary(now: float):
+    from app.models import ReplicationHeartbeat
+    
+    heartbeat = ReplicationHeartbeat.__table__
+    with engine.begin() as conn:
+        updated = conn.execute(
+            update(heartbeat).where(heartbeat.c.id == HEARTBEAT_ID).values(beat_at=now)
+        ).rowcount
+        if not updated:
+            conn.execute(insert(heartbeat).values(id=HEARTBEAT_ID, beat_at=now))
+
+
+def _replica_lag(replica_engine, now: float) -> Optional[float]:
+    from app.models import ReplicationHeartbeat
+    
+    heartbeat = ReplicationHeartbeat.__table__
+    try:
+        with replica_engine.connect() as conn:
+            beat_at = conn.execute(select(heartbeat.c.beat_at).where(heartbeat.c.id == HEARTBEAT_ID)).scalar()
+    except Exception as e:
+        print(f"Error checking replica lag: {e}")
+        return None
+    if beat_at is None:
+        return None
+    return max(now - beat_at, 0.0)
+
+
+def replica_lags() -> List[Optional[float]]:
+    """Seconds each replica trails the primary, None when it can't be read.
+    
+    The primary's heartbeat row is stamped and every replica's copy read at
+    most once per REPLICA_LAG_CHECK_SECONDS per process. A replica that has
+    applied the previous stamp is reported up to one check interval behind,
+    so the figure is an upper bound.
+    """
+    if time.monotonic() - _lag["checked_at"] < settings.REPLICA_LAG_CHECK_SECONDS:
+        return _lag["lags"]
+    with _lag_lock:
+        if time.monotonic() - _lag["checked_at"] < settings.REPLICA_LAG_CHECK_SECONDS:
+            return _lag["lags"]
+        now = time.time()
+        lags = [_replica_lag(replica_engine, now) for replica_engine in replica_engines]
+        try:
+            _beat_primary(now)
+        except Exception as e:
+            print(f"Error writing replication heartbeat: {e}")
+        for index, lag in enumerate(lags):
+            DB_REPLICA_LAG.labels(str(index)).set(-1 if lag is None else lag)
+        _lag.update(checked_at=time.monotonic(), lags=lags)
+        return lags
+
+
+def record_write(user_id: Optional[int]):
+    """Pin a user's reads to the primary for READ_YOUR_WRITES_SECONDS after they change data"""
+    if not replica_engines or user_id is None:
+        return
+    from .redis_client import get_redis
+    
+    try:
+        get_redis().set(f"{LAST_WRITE_KEY_PREFIX}{user_id}", 1, ex=settings.READ_YOUR_WRITES_SECONDS)
+    except Exception as e:
+        print(f"Error recording write for user {user_id}: {e}")
+
+
+def _wrote_recently(user_id: int) -> bool:
+    from .redis_client import get_redis
+    
+    try:
+        return bool(get_redis().exists(f"{LAST_WRITE_KEY_PREFIX}{user_id}"))
+    except Exception as e:
+        # Without the marker a replica could hide the user's own changes
+        print(f"Error reading last write for user {user_id}: {e}")
+        return True
+
+
+def _primary(reason: str) -> Session:
+    DB_READ_ROUTING.labels("primary", reason).inc()
+    return SessionLocal()
+
+
+def read_session(user_id: Optional[int] = None) -> Session:
+    """Session for read-only work: a replica within REPLICA_MAX_LAG_SECONDS, else the primary.
+    
+    Replicas are used round robin. Reads fall back to the primary when
+    none are configured or fresh enough, and, for `user_id`, when that
+    user wrote within READ_YOUR_WRITES_SECONDS (see `record_write`).
+    Never write through the returned session.
+    """
+    if not replica_engines:
+        return SessionLocal()
+    if user_id is not None and _wrote_recently(user_id):
+        return _primary("recent_write")
+    
+    healthy = [
+        index for index, lag in enumerate(replica_lags())
+        if lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS
+    ]
+    if not healthy:
+        return _primary("replica_lag")
+    DB_READ_ROUTING.labels("replica", "ok").inc()
+    return ReplicaSessions[healthy[next(_round_robin) % len(healthy)]]()
@@ -0,0 +1,114 @@
+import asyncio
+import json
+from typing import Dict, Optional, Set
+from .config import settings
+from .metrics import EVENT_STREAM_CONNECTIONS
+from .task_events import CHANNEL_PREFIX
+
+RESYNC_FRAME = 'event: resync\ndata: {"type": "resync"}\n\n'
+
+
+def get_async_redis():
+    """Redis client for the pub/sub reader; no socket timeout, since it blocks on idle channels"""
+    import redis.asyncio
+    
+    return redis.asyncio.Redis.from_url(settings.REDIS_URL, health_check_interval=30)
+
+
+def sse_frame(data: str) -> str:
+    """Format a published event as a server-sent event named after its type"""
+    event_type = json.loads(data).get("type", "message")
+    return f"event: {event_type}\ndata: {data}\n\n"
+
+
+class EventHub:
+    """Fans user events from Redis pub/sub out to this process's stream connections.
+    
+    One pattern subscription per process serves every connection, so an
+    idle client costs a queue and a parked coroutine, not a Redis
+    connection. Each connection's queue is bounded; a client that stops
+    reading gets a `resync` event instead of an ever-growing backlog, and
+    so does everyone after the Redis connection drops.
+    """
+    
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._reader: Optional[asyncio.Task] = None
+    
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=settings.EVENT_STREAM_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        EVENT_STREAM_CONNECTIONS.inc()
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.get_running_loop().create_task(self._read())
+        return queue
+    
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        queues = self._subscribers.get(user_id)
+        if queues is None or queue not in queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+        EVENT_STREAM_CONNECTIONS.dec()
+    
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+    
+    def _deliver(self, queue: asyncio.Queue, frame: str):
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_FRAME)
+    
+    def _dispatch(self, channel: str, data: str):
+        try:
+            user_id = int(channel[len(CHANNEL_PREFIX):])
+        except ValueError:
+            return
+        queues = self._subscribers.get(user_id)
+        if not queues:
+            return
+        frame = sse_frame(data)
+        for queue in list(queues):
+            self._deliver(queue, frame)
+    
+    async def _read(self):
+        delay = 1.0
+        while self._subscribers:
+            client = get_async_redis()
+            pubsub = client.pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                delay = 1.0
+                while self._subscribers:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] == "pmessage":
+                        channel, data = message["channel"], message["data"]
+                        self._dispatch(
+                            channel.decode() if isinstance(channel, bytes) else channel,
+                            data.decode() if isinstance(data, bytes) else data
+                        )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error reading event stream from Redis: {e}")
+                # Events published while disconnected are lost
+                for queues in list(self._subscribers.values()):
+                    for queue in list(queues):
+                        self._deliver(queue, RESYNC_FRAME)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                try:
+                    await pubsub.aclose()
+                    await client.aclose()
+                except Exception:
+                    pass
+
+
+event_hub = EventHub()
@@ -0,0 +1,160 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict
+from kombu.exceptions import ChannelError
+from sqlalchemy import text
+from .config import settings
+from .database import engine
+from .redis_client import get_redis
+
+OK = "ok"
+DEGRADED = "degraded"
+DOWN = "down"
+
+# Checks whose failure means this pod should stop receiving traffic
+CRITICAL_CHECKS = ("database", "redis", "broker")
+
+_lock = threading.Lock()
+_cache = {"checked_at": 0.0, "report": None}
+
+
+def check_database() -> Dict:
+    """Round-trip a trivial query and report pool saturation"""
+    start = time.perf_counter()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    latency = time.perf_counter() - start
+
+    result = {"status": OK}
+    pool = engine.pool
+    if hasattr(pool, "checkedout") and hasattr(pool, "size"):
+        capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+        result["pool_checked_out"] = pool.checkedout()
+        result["pool_capacity"] = capacity
+        if result["pool_checked_out"] >= capacity:
+            result["status"] = DEGRADED
+    if latency > settings.HEALTH_DB_LATENCY_THRESHOLD:
+        result["status"] = DEGRADED
+    return result
+
+
+def check_replicas() -> Dict:
+    """Report read replica lag; reads fall back to the primary, so this never fails readiness"""
+    from .db_routing import replica_lags
+
+    lags = replica_lags()
+    healthy = sum(1 for lag in lags if lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS)
+    return {
+        "status": OK if healthy == len(lags) else DEGRADED,
+        "replicas": len(lags),
+        "healthy": healthy,
+        "lag_seconds": [None if lag is None else round(lag, 2) for lag in lags]
+    }
+
+
+def check_redis() -> Dict:
+    """Ping the cache Redis"""
+    get_redis().ping()
+    return {"status": OK}
+
+
+def check_broker() -> Dict:
+    """Open a connection to the Celery broker"""
+    from app.tasks.celery_app import celery_app
+
+    with celery_app.connection_for_write() as conn:
+        conn.ensure_connection(max_retries=1, timeout=settings.HEALTH_CHECK_TIMEOUT)
+    return {"status": OK}
+
+
+def check_workers() -> Dict:
+    """Ping Celery workers and read the default queue depth"""
+    from app.tasks.celery_app import celery_app
+
+    replies = celery_app.control.ping(timeout=settings.HEALTH_CHECK_TIMEOUT / 2)
+    queue = celery_app.conf.task_default_queue
+    with celery_app.connection_for_read() as conn:
+        try:
+            depth = conn.default_channel.queue_declare(queue=queue, passive=True).message_count
+        except ChannelError:
+            # The Redis transport keeps a queue as a list, and Redis deletes
+            # empty lists: a queue that isn't there is an empty one
+            depth = 0
+
+    if not replies:
+        status = DOWN
+    elif depth > settings.HEALTH_MAX_QUEUE_DEPTH:
+        status = DEGRADED
+    else:
+        status = OK
+    return {"status": status, "workers": len(replies), "queue": queue, "queue_depth": depth}
+
+
+CHECKS: Dict[str, Callable[[], Dict]] = {
+    "database": check_database,
+    "redis": check_redis,
+    "broker": check_broker,
+    "workers": check_workers,
+    "replicas": check_replicas,
+}
+
+# One thread per check, so checks never queue behind each other
+_executor = ThreadPoolExecutor(max_workers=len(CHECKS), thread_name_prefix="health-check")
+
+
+def _timed(check: Callable[[], Dict]) -> Dict:
+    start = time.perf_counter()
+    try:
+        result = check()
+    except Exception as e:
+        result = {"status": DOWN, "error": str(e)}
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def _run_checks() -> Dict:
+    futures = {name: _executor.submit(_timed, check) for name, check in CHECKS.items()}
+    wait(futures.values(), timeout=settings.HEALTH_CHECK_TIMEOUT)
+
+    checks = {}
+    for name, future in futures.items():
+        if future.done():
+            checks[name] = future.result()
+        else:
+            checks[name] = {
+                "status": DOWN,
+                "error": "timed out",
+                "latency_ms": settings.HEALTH_CHECK_TIMEOUT * 1000
+            }
+
+    if any(checks[name]["status"] != OK for name in CRITICAL_CHECKS):
+        status = DOWN
+    elif any(check["status"] != OK for check in checks.values()):
+        status = DEGRADED
+    else:
+        status = OK
+
+    return {"status": status, "ready": status != DOWN, "checks": checks}
+
+
+def readiness_report() -> Dict:
+    """Dependency health, cached for HEALTH_CACHE_SECONDS so probes don't add load.
+
+    A critical dependency that is down or merely degraded (slow database,
+    exhausted pool) marks the pod not ready, so the load balancer drains it
+    before requests start timing out. Missing workers or a backed-up queue
+    only degrade the report, since the API can still serve reads.
+    """
+    report = _cache["report"]
+    if report is not None and time.monotonic() - _cache["checked_at"] < settings.HEALTH_CACHE_SECONDS:
+        return report
+
+    with _lock:
+        # Another probe may have refreshed the report while we waited
+        if _cache["report"] is not None and time.monotonic() - _cache["checked_at"] < settings.HEALTH_CACHE_SECONDS:
+            return _cache["report"]
+        report = _run_checks()
+        _cache["report"] = report
+        _cache["checked_at"] = time.monotonic()
+        return report
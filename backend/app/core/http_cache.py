@@ -0,0 +1,156 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Optional, Tuple
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import func
+from starlette.requests import Request
+from starlette.responses import Response
+from .config import settings
+
+VERSION_KEY_PREFIX = "http_cache:version:"
+RESPONSE_KEY_PREFIX = "http_cache:response:"
+
+_adapters = {}
+
+
+def collection_validators(query, model) -> Tuple[int, Optional[datetime]]:
+    """Row count and latest change time of the rows a query selects"""
+    count, last_modified = query.order_by(None).with_entities(
+        func.count(model.id),
+        func.max(func.coalesce(model.updated_at, model.created_at))
+    ).one()
+    return count, last_modified
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _etag(user_id: int, resource: str, request: Request, *parts) -> str:
+    digest = hashlib.sha1(
+        "|".join(str(part) for part in (user_id, resource, request.url.path, request.url.query, *parts)).encode()
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _not_modified(request: Request, etag: str, last_modified: Optional[str]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or etag[2:] in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _headers(etag: str, last_modified: Optional[str]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
+
+def _redis():
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    from .redis_client import get_redis
+    return get_redis()
+
+
+def invalidate_responses(user_id: int, *resources: str):
+    """Drop cached responses of a user's resources after a write"""
+    from .db_routing import record_write
+    from .task_events import publish_event
+
+    # Also keeps the user's reads on the primary until replicas catch up,
+    # and tells the user's open clients which views to re-fetch
+    record_write(user_id)
+    publish_event(user_id, {"type": "invalidate", "resources": list(resources)})
+    client = _redis()
+    if client is None or user_id is None:
+        return
+    try:
+        pipe = client.pipeline()
+        for resource in resources:
+            pipe.incr(f"{VERSION_KEY_PREFIX}{user_id}:{resource}")
+        pipe.execute()
+    except Exception as e:
+        print(f"Error invalidating response cache: {e}")
+
+
+def conditional_response(
+    request: Request,
+    user_id: int,
+    resource: str,
+    validators: Callable[[], Tuple[int, Optional[datetime]]],
+    load: Callable[[], Any],
+    response_type: Any,
+    not_found_detail: Optional[str] = None
+) -> Response:
+    """Serve a read with ETag/Last-Modified, answering 304 when the client copy is current.
+
+    The validators are a count and latest change time for the user's rows. With
+    RESPONSE_CACHE_ENABLED, serialized bodies are also kept in Redis under a
+    per-user, per-resource version that writes bump via `invalidate_responses`,
+    so cache hits skip the database entirely.
+    """
+    client = _redis()
+    cache_key = None
+    if client is not None:
+        try:
+            version = int(client.get(f"{VERSION_KEY_PREFIX}{user_id}:{resource}") or 0)
+            cache_key = f"{RESPONSE_KEY_PREFIX}{user_id}:{resource}:{version}:" + hashlib.sha1(
+                f"{request.url.path}?{request.url.query}".encode()
+            ).hexdigest()
+            cached = client.get(cache_key)
+        except Exception as e:
+            print(f"Error reading response cache: {e}")
+            client, cached = None, None
+        if cached:
+            entry = json.loads(cached)
+            if _not_modified(request, entry["etag"], entry["last_modified"]):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_headers(entry["etag"], entry["last_modified"]))
+            return Response(
+                content=entry["body"],
+                media_type="application/json",
+                headers=_headers(entry["etag"], entry["last_modified"])
+            )
+
+    count, changed_at = validators()
+    if not_found_detail and not count:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found_detail)
+
+    # The ETag keeps full timestamp precision; Last-Modified is whole seconds
+    changed_at = _as_utc(changed_at)
+    last_modified = format_datetime(changed_at.replace(microsecond=0), usegmt=True) if changed_at else None
+    etag = _etag(user_id, resource, request, count, changed_at.isoformat() if changed_at else "")
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_headers(etag, last_modified))
+
+    adapter = _adapters.get(response_type)
+    if adapter is None:
+        adapter = _adapters[response_type] = TypeAdapter(response_type)
+    body = adapter.dump_json(adapter.validate_python(load(), from_attributes=True))
+
+    if client is not None and cache_key:
+        try:
+            client.set(
+                cache_key,
+                json.dumps({"etag": etag, "last_modified": last_modified, "body": body.decode()}),
+                ex=settings.RESPONSE_CACHE_TTL_SECONDS
+            )
+        except Exception as e:
+            print(f"Error writing response cache: {e}")
+
+    return Response(content=body, media_type="application/json", headers=_headers(etag, last_modified))
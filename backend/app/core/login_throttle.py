@@ -0,0 +1,88 @@
+import hashlib
+import time
+from typing import Optional
+from .config import settings
+
+KEY_PREFIX = "login_throttle:"
+
+
+class LoginThrottled(Exception):
+    """Raised when an IP, or an email from that IP, has used up its login attempts for the window"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Too many login attempts, retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+def _window() -> int:
+    return int(time.time() // settings.LOGIN_THROTTLE_WINDOW_SECONDS)
+
+
+def _retry_after() -> int:
+    window = settings.LOGIN_THROTTLE_WINDOW_SECONDS
+    return max(int(window - time.time() % window), 1)
+
+
+def _email_key(email: str, ip: Optional[str]) -> str:
+    # Per email and IP, so failures from one client can't lock the account out for
+    # everyone else; hashed so addresses don't show up in Redis
+    digest = hashlib.sha256(f"{email.strip().lower()}\0{ip or ''}".encode()).hexdigest()[:32]
+    return f"{KEY_PREFIX}email:{digest}:{_window()}"
+
+
+def _redis():
+    from .redis_client import get_redis
+    return get_redis()
+
+
+def check_login_allowed(ip: Optional[str], email: Optional[str] = None):
+    """Count an attempt from `ip` and raise LoginThrottled when the IP, or the email from it, is over its limit.
+
+    Fixed windows of LOGIN_THROTTLE_WINDOW_SECONDS in Redis: every attempt
+    counts against the IP, only failures (record_login_failure) against the
+    email and IP pair. Failures from other clients never block an email, so
+    guessing a victim's password can't lock the victim out. Runs before any
+    bcrypt work. Fails open if Redis is unavailable.
+    """
+    try:
+        client = _redis()
+        if ip and settings.LOGIN_MAX_ATTEMPTS_PER_IP > 0:
+            key = f"{KEY_PREFIX}ip:{ip}:{_window()}"
+            pipe = client.pipeline()
+            pipe.incr(key)
+            pipe.expire(key, settings.LOGIN_THROTTLE_WINDOW_SECONDS)
+            attempts = pipe.execute()[0]
+            if attempts > settings.LOGIN_MAX_ATTEMPTS_PER_IP:
+                raise LoginThrottled(_retry_after())
+        if email and settings.LOGIN_MAX_FAILURES_PER_EMAIL > 0:
+            failures = int(client.get(_email_key(email, ip)) or 0)
+            if failures >= settings.LOGIN_MAX_FAILURES_PER_EMAIL:
+                raise LoginThrottled(_retry_after())
+    except LoginThrottled:
+        raise
+    except Exception as e:
+        print(f"Error checking login throttle: {e}")
+
+
+def record_login_failure(email: str, ip: Optional[str]):
+    """Count a failed password for an email from `ip`"""
+    if settings.LOGIN_MAX_FAILURES_PER_EMAIL <= 0:
+        return
+    try:
+        key = _email_key(email, ip)
+        pipe = _redis().pipeline()
+        pipe.incr(key)
+        pipe.expire(key, settings.LOGIN_THROTTLE_WINDOW_SECONDS)
+        pipe.execute()
+    except Exception as e:
+        print(f"Error recording login failure: {e}")
+
+
+def clear_login_failures(email: str, ip: Optional[str]):
+    """Forget an email's failures from `ip` after a successful login there"""
+    if settings.LOGIN_MAX_FAILURES_PER_EMAIL <= 0:
+        return
+    try:
+        _redis().delete(_email_key(email, ip))
+    except Exception as e:
+        print(f"Error clearing login failures: {e}")
@@ -0,0 +1,230 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    start_http_server,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from starlette.requests import Request
+from starlette.responses import Response
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "gmb_http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"]
+)
+CELERY_TASK_DURATION = Histogram(
+    "gmb_celery_task_duration_seconds",
+    "Celery task execution time",
+    ["task", "state"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+CELERY_TASK_QUEUE_WAIT = Histogram(
+    "gmb_celery_task_queue_wait_seconds",
+    "Time between a task being published and a worker starting it",
+    ["task"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900)
+)
+UPSTREAM_LATENCY = Histogram(
+    "gmb_upstream_request_duration_seconds",
+    "Latency of calls to Google Business Profile and OpenAI",
+    ["service", "method"]
+)
+UPSTREAM_ERRORS = Counter(
+    "gmb_upstream_errors_total",
+    "Failed calls to Google Business Profile and OpenAI",
+    ["service", "method"]
+)
+OPENAI_TOKENS = Counter(
+    "gmb_openai_tokens_total",
+    "OpenAI tokens used",
+    ["method", "kind"]
+)
+DB_QUERY_DURATION = Histogram(
+    "gmb_db_query_duration_seconds",
+    "Duration of individual SQL statements",
+    ["statement"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+DB_QUERIES_PER_UNIT = Histogram(
+    "gmb_db_queries_per_unit",
+    "SQL statements issued per HTTP request or Celery task",
+    ["unit"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 250, 500, 1000)
+)
+DB_TIME_PER_UNIT = Histogram(
+    "gmb_db_time_per_unit_seconds",
+    "Total SQL time per HTTP request or Celery task",
+    ["unit"]
+)
+REVIEW_TIME_TO_REPLY = Histogram(
+    "gmb_review_time_to_reply_seconds",
+    "Time from a review being written to our reply being posted",
+    ["sentiment"],
+    buckets=(60, 300, 900, 1800, 3600, 2 * 3600, 4 * 3600, 8 * 3600, 24 * 3600, 48 * 3600, 7 * 24 * 3600)
+)
+POST_CACHE_REQUESTS = Counter(
+    "gmb_post_cache_requests_total",
+    "Post content cache lookups by result (hit, miss, error)",
+    ["result"]
+)
+POST_CACHE_EVICTIONS = Counter(
+    "gmb_post_cache_evictions_total",
+    "Cached post variants dropped, by reason (exhausted, capacity)",
+    ["reason"]
+)
+REPLY_QUEUE_DEPTH = Gauge("gmb_reply_queue_depth", "Reviews waiting in the reply triage queue")
+DB_POOL_CHECKED_OUT = Gauge("gmb_db_pool_checked_out", "Connections currently checked out of the pool")
+DB_POOL_SIZE = Gauge("gmb_db_pool_size", "Configured connection pool size")
+DB_POOL_OVERFLOW = Gauge("gmb_db_pool_overflow", "Connections opened beyond the pool size")
+EVENT_STREAM_CONNECTIONS = Gauge("gmb_event_stream_connections", "Open live event stream connections")
+DB_REPLICA_LAG = Gauge("gmb_db_replica_lag_seconds", "Heartbeat lag of each read replica, -1 when unreachable", ["replica"])
+DB_READ_ROUTING = Counter(
+    "gmb_db_read_routing_total",
+    "Read sessions by target (replica, primary) and reason",
+    ["target", "reason"]
+)
+
+# [query_count, query_seconds] for the request or task being handled
+_unit_stats: ContextVar[Optional[list]] = ContextVar("gmb_db_unit_stats", default=None)
+_task_started = {}
+
+
+def start_unit():
+    """Start counting SQL statements for the current request or task"""
+    stats = [0, 0.0]
+    _unit_stats.set(stats)
+    return stats
+
+
+def finish_unit(unit: str, stats: list):
+    """Record the SQL statements counted for a request or task"""
+    DB_QUERIES_PER_UNIT.labels(unit).observe(stats[0])
+    DB_TIME_PER_UNIT.labels(unit).observe(stats[1])
+
+
+@contextmanager
+def track_upstream(service: str, method: str):
+    """Time an upstream API call and count it as an error if it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.labels(service, method).inc()
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(service, method).observe(time.perf_counter() - start)
+
+
+def record_openai_usage(method: str, usage):
+    """Count prompt and completion tokens from an OpenAI response"""
+    if usage is None:
+        return
+    OPENAI_TOKENS.labels(method, "prompt").inc(usage.prompt_tokens or 0)
+    OPENAI_TOKENS.labels(method, "completion").inc(usage.completion_tokens or 0)
+    details = getattr(usage, "prompt_tokens_details", None)
+    if details is not None:
+        OPENAI_TOKENS.labels(method, "cached_prompt").inc(getattr(details, "cached_tokens", 0) or 0)
+
+
+def instrument_engine(engine, pool_gauges: bool = True):
+    """Attach query timing hooks and pool gauges to a SQLAlchemy engine.
+
+    Pool gauges describe a single engine; pass pool_gauges=False for
+    replica engines so they keep reporting the primary.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        DB_QUERY_DURATION.labels(statement.lstrip().split(" ", 1)[0].upper()).observe(elapsed)
+        stats = _unit_stats.get()
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += elapsed
+
+    if not pool_gauges:
+        return
+    pool = engine.pool
+    if hasattr(pool, "checkedout"):
+        DB_POOL_CHECKED_OUT.set_function(pool.checkedout)
+    if hasattr(pool, "size"):
+        DB_POOL_SIZE.set_function(pool.size)
+    if hasattr(pool, "overflow"):
+        DB_POOL_OVERFLOW.set_function(lambda: max(pool.overflow(), 0))
+
+
+async def metrics_middleware(request: Request, call_next):
+    """Record latency and SQL usage per route"""
+    stats = start_unit()
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        route_path = route.path if route is not None else "unmatched"
+        HTTP_REQUEST_LATENCY.labels(request.method, route_path, str(status_code)).observe(
+            time.perf_counter() - start
+        )
+        finish_unit(route_path, stats)
+
+
+def _registry():
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    from prometheus_client import REGISTRY
+    return REGISTRY
+
+
+def metrics_response() -> Response:
+    """Render all metrics in the Prometheus text format"""
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+def instrument_celery(metrics_port: int):
+    """Connect Celery signals for task metrics and start the worker exporter"""
+    from celery.signals import before_task_publish, task_prerun, task_postrun, worker_init
+
+    @before_task_publish.connect(weak=False)
+    def _stamp_sent_at(headers=None, **kwargs):
+        if headers is not None:
+            headers.setdefault("sent_at", time.time())
+
+    @task_prerun.connect(weak=False)
+    def _task_prerun(task_id=None, task=None, **kwargs):
+        sent_at = getattr(task.request, "sent_at", None)
+        if sent_at:
+            CELERY_TASK_QUEUE_WAIT.labels(task.name).observe(max(time.time() - sent_at, 0))
+        _task_started[task_id] = (time.perf_counter(), start_unit())
+
+    @task_postrun.connect(weak=False)
+    def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+        started = _task_started.pop(task_id, None)
+        if started is None:
+            return
+        start, stats = started
+        CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - start)
+        finish_unit(task.name, stats)
+        _unit_stats.set(None)
+
+    @worker_init.connect(weak=False)
+    def _start_exporter(**kwargs):
+        start_http_server(metrics_port, registry=_registry())
@@ -0,0 +1,13 @@
+import os
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def upgrade_database(revision: str = "head"):
+    """Apply the Alembic migrations to DATABASE_URL, as `make migrate` does (scripts, benchmarks, tests)"""
+    from alembic import command
+    from alembic.config import Config
+    
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    command.upgrade(config, revision)
@@ -0,0 +1,125 @@
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+from .config import settings
+from .security import get_password_hash, verify_and_update_password
+
+_pool: Optional[ProcessPoolExecutor] = None
+_slots: Optional[threading.BoundedSemaphore] = None
+_pool_lock = threading.Lock()
+
+# Digests of recently verified passwords, keyed with a secret that never leaves this process
+_cache_key = os.urandom(32)
+_verified: "OrderedDict[bytes, float]" = OrderedDict()
+_verified_lock = threading.Lock()
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when PASSWORD_HASH_MAX_PENDING hashes are already queued or running, or one times out"""
+
+
+def _executor() -> Tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            # Spawned rather than forked: the API process has threads running
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+        return _pool, _slots
+
+
+def shutdown_password_pool():
+    """Stop the worker processes; the next hash starts a new pool"""
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = _slots = None
+
+
+def _run(fn, *args):
+    """Run a bcrypt call in the worker pool, or inline when PASSWORD_HASH_WORKERS is 0.
+
+    The request thread only waits on the result, so bcrypt CPU stays out of
+    the API process. At most PASSWORD_HASH_MAX_PENDING calls are queued or
+    running; beyond that PasswordHashingBusy is raised instead of queueing,
+    which keeps a login storm from tying up the request threadpool. So is a
+    call not done within PASSWORD_HASH_TIMEOUT_SECONDS; it keeps its slot
+    until the worker finishes.
+    """
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+    pool, slots = _executor()
+    if not slots.acquire(blocking=False):
+        raise PasswordHashingBusy()
+    try:
+        future = pool.submit(fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        raise PasswordHashingBusy()
+    except BrokenProcessPool:
+        shutdown_password_pool()
+        raise
+
+
+def _cache_digest(user_id: int, hashed_password: str, password: str) -> bytes:
+    return hmac.new(_cache_key, f"{user_id}\0{hashed_password}\0{password}".encode(), hashlib.sha256).digest()
+
+
+def _cached(digest: bytes) -> bool:
+    with _verified_lock:
+        expires_at = _verified.get(digest)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del _verified[digest]
+            return False
+        return True
+
+
+def _remember(digest: bytes):
+    with _verified_lock:
+        _verified[digest] = time.monotonic() + settings.PASSWORD_VERIFY_CACHE_SECONDS
+        _verified.move_to_end(digest)
+        while len(_verified) > settings.PASSWORD_VERIFY_CACHE_SIZE:
+            _verified.popitem(last=False)
+
+
+def hash_password(password: str) -> str:
+    """Hash a password in the worker pool; raises PasswordHashingBusy when it is full"""
+    return _run(get_password_hash, password)
+
+
+def check_password(user_id: int, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password in the worker pool, returning (valid, new hash or None).
+
+    A new hash is returned when the stored one was made with other
+    parameters (BCRYPT_ROUNDS) and should replace it. Successful checks are
+    remembered for PASSWORD_VERIFY_CACHE_SECONDS as an in-memory HMAC, so
+    repeated logins with the same password and hash skip bcrypt; failures
+    always go through bcrypt. Raises PasswordHashingBusy when the pool is full.
+    """
+    use_cache = settings.PASSWORD_VERIFY_CACHE_SECONDS > 0
+    digest = _cache_digest(user_id, hashed_password, password) if use_cache else None
+    if use_cache and _cached(digest):
+        return True, None
+
+    valid, new_hash = _run(verify_and_update_password, password, hashed_password)
+    if valid and use_cache:
+        _remember(_cache_digest(user_id, new_hash, password) if new_hash else digest)
+    return valid, new_hash
@@ -0,0 +1,13 @@
+from functools import lru_cache
+import redis
+from .config import settings
+
+
+@lru_cache
+def get_redis() -> redis.Redis:
+    """Shared Redis client for caching, queues and pub/sub"""
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT
+    )
@@ -0,0 +1,89 @@
+import json
+from typing import Any, Dict, Optional
+from uuid import uuid4
+from .config import settings
+
+CHANNEL_PREFIX = "events:user:"
+OWNER_KEY_PREFIX = "task_events:owner:"
+OWNER_HEADER = "owner_user_id"
+
+# Owners of the tasks running in this worker process, by task id
+_running: Dict[str, int] = {}
+
+
+def publish_event(user_id: Optional[int], event: Dict[str, Any]):
+    """Push an event to the user's connected clients; best effort"""
+    if user_id is None:
+        return
+    from .redis_client import get_redis
+    
+    try:
+        get_redis().publish(f"{CHANNEL_PREFIX}{user_id}", json.dumps(event, default=str))
+    except Exception as e:
+        print(f"Error publishing event for user {user_id}: {e}")
+
+
+def enqueue_for_user(task, user_id: int, *args, **kwargs):
+    """Queue a Celery task whose lifecycle and progress are pushed to `user_id`.
+    
+    The owner travels in a message header for the worker and is stored in
+    Redis for `task_owner`, keyed by a task id chosen before publishing.
+    """
+    from .redis_client import get_redis
+    
+    task_id = str(uuid4())
+    try:
+        get_redis().set(f"{OWNER_KEY_PREFIX}{task_id}", user_id, ex=settings.TASK_OWNER_TTL_SECONDS)
+    except Exception as e:
+        print(f"Error recording owner of task {task_id}: {e}")
+    return task.apply_async(args, kwargs, task_id=task_id, headers={OWNER_HEADER: user_id})
+
+
+def task_owner(task_id: str) -> Optional[int]:
+    """User a task was queued for with `enqueue_for_user`, or None"""
+    from .redis_client import get_redis
+    
+    try:
+        owner = get_redis().get(f"{OWNER_KEY_PREFIX}{task_id}")
+    except Exception as e:
+        print(f"Error reading owner of task {task_id}: {e}")
+        return None
+    return int(owner) if owner is not None else None
+
+
+def _task_event(task_id: str, task_name: str, state: str, **fields) -> Dict[str, Any]:
+    return {"type": "task", "task_id": task_id, "task": task_name.rsplit(".", 1)[-1], "state": state, **fields}
+
+
+def report_progress(task, meta: Dict[str, Any]):
+    """`update_state(state="PROGRESS")` that also pushes the progress to the task's owner"""
+    task.update_state(state="PROGRESS", meta=meta)
+    task_id = task.request.id
+    owner = _running.get(task_id)
+    if owner is not None:
+        publish_event(owner, _task_event(task_id, task.name, "PROGRESS", progress=meta))
+
+
+def _owner_header(request) -> Optional[int]:
+    # Custom headers are request attributes on workers, but stay in request.headers when run eagerly
+    owner = getattr(request, OWNER_HEADER, None)
+    if owner is None:
+        owner = (getattr(request, "headers", None) or {}).get(OWNER_HEADER)
+    return int(owner) if owner is not None else None
+
+
+def on_task_prerun(task_id=None, task=None, **kwargs):
+    """Celery task_prerun handler: tell the owner, if any, that the task started"""
+    owner = _owner_header(task.request)
+    if owner is None:
+        return
+    _running[task_id] = owner
+    publish_event(owner, _task_event(task_id, task.name, "STARTED"))
+
+
+def on_task_postrun(task_id=None, task=None, retval=None, state=None, **kwargs):
+    """Celery task_postrun handler: push the final state and result"""
+    owner = _running.pop(task_id, None)
+    if owner is None:
+        return
+    publish_event(owner, _task_event(task_id, task.name, state or "SUCCESS", result=str(retval)))
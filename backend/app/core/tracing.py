@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from .config import settings
+
+tracer = trace.get_tracer("gmb_automation")
+_configured = False
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Write finished spans to a local file, one JSON document per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans) -> SpanExportResult:
+        with open(self.path, "a") as f:
+            for span in spans:
+                f.write(span.to_json(indent=None) + "\n")
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def _build_exporter():
+    if settings.TRACING_EXPORTER == "file":
+        return JsonLinesSpanExporter(settings.TRACING_FILE_PATH)
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+
+
+def configure_tracing(service_name: str, app=None):
+    """Install the tracer provider and instrument FastAPI, SQLAlchemy and Celery.
+
+    Does nothing unless TRACING_ENABLED is set, so the OpenTelemetry API stays
+    on its no-op implementation and spans cost a function call.
+    """
+    global _configured
+    if not settings.TRACING_ENABLED:
+        return
+
+    if not _configured:
+        provider = TracerProvider(
+            resource=Resource.create({"service.name": service_name}),
+            sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+        )
+        provider.add_span_processor(BatchSpanProcessor(_build_exporter()))
+        trace.set_tracer_provider(provider)
+
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+        from opentelemetry.instrumentation.celery import CeleryInstrumentor
+        from .database import engine
+
+        SQLAlchemyInstrumentor().instrument(engine=engine)
+        CeleryInstrumentor().instrument()
+        _instrument_queue_wait()
+        _configured = True
+
+    if app is not None:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        FastAPIInstrumentor.instrument_app(app, excluded_urls="health,metrics")
+
+
+def _instrument_queue_wait():
+    from celery.signals import task_prerun
+
+    @task_prerun.connect(weak=False)
+    def _record_queue_wait(task=None, **kwargs):
+        # Runs after the Celery instrumentor's prerun hook, so the current span is the task span
+        sent_at = getattr(task.request, "sent_at", None)
+        current = trace.get_current_span()
+        if not sent_at or not current.is_recording():
+            return
+        now_ns = time.time_ns()
+        start_ns = min(int(sent_at * 1e9), now_ns)
+        current.set_attribute("celery.queue_wait_seconds", (now_ns - start_ns) / 1e9)
+        span = tracer.start_span("celery.queue_wait", start_time=start_ns)
+        span.set_attribute("celery.task_name", task.name)
+        span.end(end_time=now_ns)
+
+
+@contextmanager
+def upstream_span(service: str, method: str):
+    """Open a client span around a Google Business Profile or OpenAI call"""
+    with tracer.start_as_current_span(f"{service}.{method}", kind=trace.SpanKind.CLIENT) as span:
+        span.set_attribute("peer.service", service)
+        yield span
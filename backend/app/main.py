@@ -1,11 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.event_stream import event_hub
+from app.core.health import readiness_report
+from app.core.metrics import metrics_middleware, metrics_response
+from app.core.tracing import configure_tracing
 from app.api.v1 import api_router
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Tables, columns and indexes, review search included, come from the Alembic migrations (`make migrate`)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -21,6 +24,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency and per-route query metrics
+app.middleware("http")(metrics_middleware)
+
+# Distributed tracing (no-op unless TRACING_ENABLED)
+configure_tracing("gmb-api", app=app)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -36,11 +45,32 @@ def root():
 
 
 @app.get("/health")
+@app.get("/health/live")
 def health_check():
-    """Health check endpoint"""
+    """Liveness probe - the process is up and serving requests"""
     return {"status": "healthy"}
 
 
+@app.get("/health/ready")
+def readiness_check():
+    """Readiness probe - database, Redis, broker and workers with latency"""
+    report = readiness_report()
+    status_code = status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE
+    return JSONResponse(content=report, status_code=status_code)
+
+
+@app.on_event("shutdown")
+async def close_event_stream():
+    """Stop reading live events from Redis"""
+    await event_hub.close()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics endpoint"""
+    return metrics_response()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,7 +1,11 @@
 from .user import User
 from .location import Location
 from .post import Post, PostType, PostStatus
-from .review import Review
+from .review import Review, ArchivedReview
+from .stats import LocationStats, ReviewDailyBucket
+from .replication import ReplicationHeartbeat
+from .outbox import TaskOutbox
+from .sync_schedule import LocationSyncSchedule
 
 __all__ = [
     "User",
@@ -9,5 +13,11 @@ __all__ = [
     "Post",
     "PostType",
     "PostStatus",
-    "Review"
+    "Review",
+    "ArchivedReview",
+    "LocationStats",
+    "ReviewDailyBucket",
+    "ReplicationHeartbeat",
+    "TaskOutbox",
+    "LocationSyncSchedule"
 ]
@@ -12,11 +12,13 @@ class Location(Base):
     
     # Google Business Profile data
     google_location_id = Column(String, unique=True, index=True)
+    google_account_id = Column(String, nullable=True)  # accounts/{id} owning the location, for v4 calls
     name = Column(String, nullable=False)
     address = Column(String)
     phone = Column(String)
     website = Column(String)
     category = Column(String)
+    content_hash = Column(String(64), nullable=True)  # of the synced fields, to skip no-op updates
     
     # Settings
     auto_reply_enabled = Column(Boolean, default=False)
@@ -29,3 +31,4 @@ class Location(Base):
     user = relationship("User", back_populates="locations")
     posts = relationship("Post", back_populates="location")
     reviews = relationship("Review", back_populates="location")
+    stats = relationship("LocationStats", back_populates="location", uselist=False, passive_deletes=True)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class TaskOutbox(Base):
+    """Celery tasks to publish once the transaction that wrote them commits (see services/outbox.py)"""
+    __tablename__ = "task_outbox"
+    
+    id = Column(Integer, primary_key=True)
+    task_name = Column(String, nullable=False)
+    args = Column(JSON, nullable=False)
+    kwargs = Column(JSON, nullable=False)
+    claimed_until = Column(Float, nullable=True)  # epoch seconds; a relay is sending the row until then
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
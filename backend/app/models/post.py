@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum, Float
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -36,6 +36,7 @@ class Post(Base):
     # Scheduling
     scheduled_at = Column(DateTime(timezone=True), nullable=True)
     published_at = Column(DateTime(timezone=True), nullable=True)
+    claimed_until = Column(Float, nullable=True)  # epoch seconds; a publish run is calling Google until then
     
     # AI Generated
     ai_generated = Column(Integer, default=False)
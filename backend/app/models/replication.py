@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, Float
+from app.core.database import Base
+
+
+class ReplicationHeartbeat(Base):
+    """Single row the primary stamps so replicas can report how far behind they are"""
+    __tablename__ = "replication_heartbeat"
+    
+    id = Column(Integer, primary_key=True)
+    beat_at = Column(Float, nullable=False)  # Unix time, so the lag doesn't depend on time zones
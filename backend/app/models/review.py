@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Float, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Float, Boolean, JSON, LargeBinary, Index, Table
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -6,6 +6,17 @@ from app.core.database import Base
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # Hot-path listings: a location's newest reviews, and its unreplied ones
+        Index("ix_reviews_location_created", "location_id", "review_created_at"),
+        Index(
+            "ix_reviews_unreplied", "location_id", "review_created_at",
+            postgresql_where=Column("reply_text").is_(None),
+            sqlite_where=Column("reply_text").is_(None)
+        ),
+        # Archival scans for reviews past the retention window
+        Index("ix_reviews_review_created_at", "review_created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     location_id = Column(Integer, ForeignKey("locations.id"), nullable=False)
@@ -23,9 +34,52 @@ class Review(Base):
     reply_at = Column(DateTime(timezone=True), nullable=True)
     ai_generated_reply = Column(Boolean, default=False)
     
+    # Local triage (see services/review_classifier.py)
+    sentiment = Column(String, nullable=True, index=True)
+    sentiment_score = Column(Float, nullable=True)
+    topics = Column(JSON, nullable=True)
+    urgency = Column(String, nullable=True, index=True)
+    
+    # Near-duplicate detection (see services/dedup.py); duplicates point at the first review of their cluster
+    content_signature = Column(LargeBinary, nullable=True)
+    duplicate_of_id = Column(Integer, ForeignKey("reviews.id", ondelete="SET NULL"), nullable=True, index=True)
+    
+    # Hash of the synced upstream fields; unchanged reviews are not rewritten
+    content_hash = Column(String(64), nullable=True)
+    
     review_created_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     location = relationship("Location", back_populates="reviews")
+
+
+def _archive_columns():
+    """Copies of the review columns, keyed on (id, review_created_at) as Postgres partitioning requires"""
+    return [
+        Column(
+            column.name,
+            column.type,
+            primary_key=column.name in ("id", "review_created_at"),
+            nullable=column.nullable and column.name != "review_created_at",
+            autoincrement=False
+        )
+        for column in Review.__table__.columns
+    ]
+
+
+class ArchivedReview(Base):
+    """Reviews moved out of `reviews` by the archival task (see services/review_archive.py).
+    
+    Range partitioned by month of review_created_at on Postgres; partitions
+    are created by the archival task as it needs them.
+    """
+    __table__ = Table(
+        "reviews_archive",
+        Base.metadata,
+        *_archive_columns(),
+        Index("ix_reviews_archive_location_created", "location_id", "review_created_at"),
+        Index("ix_reviews_archive_google_review_id", "google_review_id"),
+        postgresql_partition_by="RANGE (review_created_at)"
+    )
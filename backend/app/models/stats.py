@@ -0,0 +1,236 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy import Column, Integer, Float, ForeignKey, Date, DateTime, event, insert, inspect, update
+from sqlalchemy.orm import Session, relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+from .post import PostStatus
+
+
+class LocationStats(Base):
+    """Per-location review and post aggregates, maintained incrementally on write"""
+    __tablename__ = "location_stats"
+    
+    location_id = Column(Integer, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Reviews
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Float, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    replied_count = Column(Integer, nullable=False, default=0)
+    reply_latency_count = Column(Integer, nullable=False, default=0)
+    reply_latency_seconds_sum = Column(Float, nullable=False, default=0)
+    
+    # Posts by status
+    posts_draft = Column(Integer, nullable=False, default=0)
+    posts_scheduled = Column(Integer, nullable=False, default=0)
+    posts_published = Column(Integer, nullable=False, default=0)
+    posts_failed = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    location = relationship("Location", back_populates="stats")
+
+
+class ReviewDailyBucket(Base):
+    """Reviews per location and UTC day, for rating trends over long ranges"""
+    __tablename__ = "review_daily_buckets"
+    
+    location_id = Column(Integer, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Float, nullable=False, default=0)
+    negative_count = Column(Integer, nullable=False, default=0)
+
+
+COUNTER_COLUMNS = [
+    column.name for column in LocationStats.__table__.columns
+    if column.name not in ("location_id", "updated_at")
+]
+
+# Ratings at or below this count as negative in trends
+NEGATIVE_RATING_THRESHOLD = 2
+
+
+def rating_column(rating: float) -> str:
+    """Name of the histogram column a star rating falls into"""
+    return f"rating_{min(max(int(round(rating or 0)), 1), 5)}"
+
+
+def post_status_column(status) -> str:
+    """Name of the counter column for a post status"""
+    return f"posts_{PostStatus(status or PostStatus.DRAFT).value.lower()}"
+
+
+def as_naive_utc(value: datetime) -> datetime:
+    """Convert an aware datetime to naive UTC, leaving naive values as they are"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def review_bucket_delta(rating, review_created_at, sign: int = 1) -> Optional[Tuple[date, Dict[str, float]]]:
+    """Daily bucket and counter changes for adding or removing a review"""
+    if review_created_at is None:
+        return None
+    return as_naive_utc(review_created_at).date(), {
+        "review_count": sign,
+        "rating_sum": sign * (rating or 0),
+        "negative_count": sign if (rating or 0) <= NEGATIVE_RATING_THRESHOLD else 0
+    }
+
+
+def review_stats_delta(rating, reply_at, review_created_at, sign: int = 1) -> Dict[str, float]:
+    """Counter changes caused by adding (sign=1) or removing (sign=-1) a review"""
+    delta = {
+        "review_count": sign,
+        "rating_sum": sign * (rating or 0),
+        rating_column(rating): sign
+    }
+    if reply_at is not None:
+        delta["replied_count"] = sign
+        if review_created_at is not None:
+            latency = (as_naive_utc(reply_at) - as_naive_utc(review_created_at)).total_seconds()
+            delta["reply_latency_count"] = sign
+            delta["reply_latency_seconds_sum"] = sign * max(latency, 0)
+    return delta
+
+
+def upsert_insert(connection):
+    """Dialect insert construct with ON CONFLICT support, or None"""
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif connection.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def _apply_deltas(connection, table, key_columns, deltas):
+    # INSERT ... ON CONFLICT DO UPDATE, so two transactions creating the same
+    # row (say, a sync and a notification on a new day) both land
+    dialect_insert = upsert_insert(connection)
+    for key, delta in deltas.items():
+        delta = {column: value for column, value in delta.items() if value}
+        if not delta:
+            continue
+        keys = dict(zip(key_columns, key if isinstance(key, tuple) else (key,)))
+        if dialect_insert is not None:
+            statement = dialect_insert(table).values(**keys, **delta)
+            changes = {column: table.c[column] + statement.excluded[column] for column in delta}
+            if "updated_at" in table.c:
+                # ON CONFLICT DO UPDATE skips column onupdate defaults
+                changes["updated_at"] = func.now()
+            connection.execute(statement.on_conflict_do_update(index_elements=list(key_columns), set_=changes))
+            continue
+        result = connection.execute(
+            update(table)
+            .where(*[table.c[column] == value for column, value in keys.items()])
+            .values({column: table.c[column] + value for column, value in delta.items()})
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(**keys, **delta))
+
+
+def apply_stats_deltas(connection, deltas: Dict[int, Dict[str, float]]):
+    """Add counter deltas to location_stats rows, creating rows that don't exist yet"""
+    _apply_deltas(connection, LocationStats.__table__, ("location_id",), deltas)
+
+
+def apply_bucket_deltas(connection, deltas: Dict[Tuple[int, date], Dict[str, float]]):
+    """Add counter deltas to review_daily_buckets rows, creating rows that don't exist yet"""
+    _apply_deltas(connection, ReviewDailyBucket.__table__, ("location_id", "day"), deltas)
+
+
+def _merge(deltas, key, delta):
+    for column, value in delta.items():
+        deltas[key][column] += value
+
+
+def _merge_review(deltas, buckets, location_id, rating, reply_at, review_created_at, sign=1):
+    _merge(deltas, location_id, review_stats_delta(rating, reply_at, review_created_at, sign))
+    bucket = review_bucket_delta(rating, review_created_at, sign)
+    if bucket is not None:
+        _merge(buckets, (location_id, bucket[0]), bucket[1])
+
+
+def _previous(state, name):
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    return state.attrs[name].value
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_location_stats(session, flush_context):
+    """Keep location_stats and review_daily_buckets in step with ORM writes"""
+    from .location import Location
+    from .post import Post
+    from .review import Review
+
+    deltas = defaultdict(lambda: defaultdict(float))
+    buckets = defaultdict(lambda: defaultdict(float))
+    new_locations = []
+    deleted_locations = []
+
+    for obj in session.new:
+        if isinstance(obj, Review):
+            _merge_review(deltas, buckets, obj.location_id, obj.rating, obj.reply_at, obj.review_created_at)
+        elif isinstance(obj, Post):
+            _merge(deltas, obj.location_id, {post_status_column(obj.status): 1})
+        elif isinstance(obj, Location):
+            new_locations.append(obj.id)
+
+    for obj in session.dirty:
+        if not isinstance(obj, (Review, Post)) or not session.is_modified(obj, include_collections=False):
+            continue
+        state = inspect(obj)
+        if isinstance(obj, Review):
+            fields = ("location_id", "rating", "reply_at", "review_created_at")
+            if not any(state.attrs[name].history.has_changes() for name in fields):
+                continue
+            _merge_review(
+                deltas, buckets,
+                _previous(state, "location_id"),
+                _previous(state, "rating"),
+                _previous(state, "reply_at"),
+                _previous(state, "review_created_at"),
+                sign=-1
+            )
+            _merge_review(deltas, buckets, obj.location_id, obj.rating, obj.reply_at, obj.review_created_at)
+        else:
+            if not any(state.attrs[name].history.has_changes() for name in ("location_id", "status")):
+                continue
+            _merge(deltas, _previous(state, "location_id"), {post_status_column(_previous(state, "status")): -1})
+            _merge(deltas, obj.location_id, {post_status_column(obj.status): 1})
+
+    for obj in session.deleted:
+        if isinstance(obj, Location):
+            deleted_locations.append(obj.id)
+        elif isinstance(obj, Review):
+            _merge_review(deltas, buckets, obj.location_id, obj.rating, obj.reply_at, obj.review_created_at, sign=-1)
+        elif isinstance(obj, Post):
+            _merge(deltas, obj.location_id, {post_status_column(obj.status): -1})
+
+    # Rollup rows of deleted locations go away with the location (ON DELETE CASCADE)
+    for location_id in deleted_locations:
+        deltas.pop(location_id, None)
+    buckets = {key: delta for key, delta in buckets.items() if key[0] not in deleted_locations}
+
+    if not new_locations and not deltas and not buckets:
+        return
+
+    connection = session.connection()
+    for location_id in new_locations:
+        if location_id not in deltas:
+            connection.execute(insert(LocationStats.__table__).values(location_id=location_id))
+    apply_stats_deltas(connection, deltas)
+    apply_bucket_deltas(connection, buckets)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime
+from app.core.database import Base
+
+
+class LocationSyncSchedule(Base):
+    """When each location's reviews are next synced, from its observed review rate (see services/sync_schedule.py)"""
+    __tablename__ = "location_sync_schedules"
+    
+    location_id = Column(Integer, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    review_rate_per_day = Column(Float, nullable=False, default=0)  # EWMA of review arrivals
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    last_reconciled_at = Column(DateTime(timezone=True), nullable=True)  # last sync that fetched every review
+    next_sync_at = Column(DateTime(timezone=True), nullable=False, index=True)
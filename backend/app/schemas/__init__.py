@@ -1,7 +1,10 @@
 from .user import User, UserCreate, UserUpdate, Token, TokenData
-from .location import Location, LocationCreate, LocationUpdate
-from .post import Post, PostCreate, PostUpdate, PostGenerate
-from .review import Review, ReviewCreate, ReviewUpdate, ReviewReplyGenerate
+from .location import Location, LocationCreate, LocationUpdate, LocationSyncProgress
+from .post import Post, PostCreate, PostUpdate, PostGenerate, PostCampaign, PostCampaignProgress, PostImportResult
+from .review import Review, ReviewCreate, ReviewUpdate, ReviewReplyGenerate, ReviewSearchHit, ReviewSearchResults, ReviewHistoryItem
+from .notification import PubSubPushEnvelope, GbpNotification
+from .stats import LocationStats, UserStats, RatingTrend, RatingTrendPoint
+from .task import TaskStatus
 
 __all__ = [
     "User",
@@ -12,12 +15,26 @@ __all__ = [
     "Location",
     "LocationCreate",
     "LocationUpdate",
+    "LocationSyncProgress",
     "Post",
     "PostCreate",
     "PostUpdate",
     "PostGenerate",
+    "PostCampaign",
+    "PostCampaignProgress",
+    "PostImportResult",
     "Review",
     "ReviewCreate",
     "ReviewUpdate",
-    "ReviewReplyGenerate"
+    "ReviewReplyGenerate",
+    "ReviewSearchHit",
+    "ReviewSearchResults",
+    "ReviewHistoryItem",
+    "PubSubPushEnvelope",
+    "GbpNotification",
+    "LocationStats",
+    "UserStats",
+    "RatingTrend",
+    "RatingTrendPoint",
+    "TaskStatus"
 ]
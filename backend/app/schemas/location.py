@@ -13,6 +13,7 @@ class LocationBase(BaseModel):
 
 class LocationCreate(LocationBase):
     google_location_id: str
+    google_account_id: Optional[str] = None
 
 
 class LocationUpdate(BaseModel):
@@ -29,6 +30,7 @@ class LocationInDB(LocationBase):
     id: int
     user_id: int
     google_location_id: str
+    google_account_id: Optional[str] = None
     auto_reply_enabled: bool
     auto_post_enabled: bool
     created_at: datetime
@@ -39,3 +41,17 @@ class LocationInDB(LocationBase):
 
 class Location(LocationInDB):
     pass
+
+
+class LocationSyncProgress(BaseModel):
+    task_id: str
+    state: str
+    accounts_total: Optional[int] = None
+    accounts_done: Optional[int] = None
+    accounts_failed: Optional[int] = None
+    locations_seen: Optional[int] = None
+    created: Optional[int] = None
+    updated: Optional[int] = None
+    unchanged: Optional[int] = None
+    skipped: Optional[int] = None
+    result: Optional[str] = None
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+
+
+class PubSubMessage(BaseModel):
+    data: str
+    message_id: str = Field(..., alias="messageId")
+    publish_time: Optional[str] = Field(None, alias="publishTime")
+    attributes: Dict[str, str] = {}
+
+
+class PubSubPushEnvelope(BaseModel):
+    message: PubSubMessage
+    subscription: str
+
+
+class GbpNotification(BaseModel):
+    type: str
+    location: Optional[str] = None
+    review: Optional[str] = None
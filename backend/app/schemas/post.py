@@ -1,6 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, List, Optional
+from datetime import date, datetime, time
 from app.models.post import PostType, PostStatus
 
 
@@ -16,6 +16,33 @@ class PostCreate(PostBase):
     scheduled_at: Optional[datetime] = None
 
 
+class PostImportRow(PostCreate):
+    status: Optional[PostStatus] = None
+    
+    @model_validator(mode="after")
+    def check_status(self):
+        if self.status not in (None, PostStatus.DRAFT, PostStatus.SCHEDULED):
+            raise ValueError("status must be DRAFT or SCHEDULED")
+        if self.status == PostStatus.SCHEDULED and not self.scheduled_at:
+            raise ValueError("scheduled_at is required for SCHEDULED posts")
+        return self
+
+
+class PostImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class PostImportResult(BaseModel):
+    rows: int
+    valid: int
+    imported: int
+    failed: int
+    errors: List[PostImportError]
+    errors_truncated: bool = False
+    dry_run: bool = False
+
+
 class PostUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
@@ -47,3 +74,32 @@ class PostGenerate(BaseModel):
     location_id: int
     topic: Optional[str] = None
     post_type: PostType = PostType.UPDATE
+
+
+class PostCampaign(BaseModel):
+    location_ids: List[int] = Field(..., min_length=1)
+    start_date: date
+    end_date: date
+    cadence_days: int = Field(7, ge=1)
+    post_time: time = time(10, 0)
+    topics: List[str] = []
+    post_type: PostType = PostType.UPDATE
+    status: PostStatus = PostStatus.DRAFT
+    
+    @model_validator(mode="after")
+    def check_campaign(self):
+        if self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        if self.status not in (PostStatus.DRAFT, PostStatus.SCHEDULED):
+            raise ValueError("status must be DRAFT or SCHEDULED")
+        return self
+
+
+class PostCampaignProgress(BaseModel):
+    task_id: str
+    state: str
+    total: Optional[int] = None
+    generated: Optional[int] = None
+    failed: Optional[int] = None
+    inserted: Optional[int] = None
+    result: Optional[Any] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -29,6 +29,11 @@ class ReviewInDB(ReviewBase):
     reply_text: Optional[str] = None
     reply_at: Optional[datetime] = None
     ai_generated_reply: bool
+    sentiment: Optional[str] = None
+    sentiment_score: Optional[float] = None
+    topics: Optional[List[str]] = None
+    urgency: Optional[str] = None
+    duplicate_of_id: Optional[int] = None
     review_created_at: datetime
     created_at: datetime
     
@@ -43,3 +48,16 @@ class Review(ReviewInDB):
 class ReviewReplyGenerate(BaseModel):
     review_id: int
     tone: Optional[str] = "professional"
+
+
+class ReviewSearchHit(Review):
+    rank: float
+
+
+class ReviewSearchResults(BaseModel):
+    items: List[ReviewSearchHit]
+    next_cursor: Optional[str] = None
+
+
+class ReviewHistoryItem(Review):
+    archived: bool = False
@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date
+
+
+class StatsBase(BaseModel):
+    review_count: int
+    average_rating: Optional[float] = None
+    rating_histogram: Dict[int, int]
+    replied_count: int
+    unreplied_count: int
+    average_reply_latency_seconds: Optional[float] = None
+    posts_by_status: Dict[str, int]
+
+
+class LocationStats(StatsBase):
+    location_id: int
+    location_name: str
+
+
+class UserStats(StatsBase):
+    location_count: int
+    locations: List[LocationStats]
+
+
+class RatingTrendPoint(BaseModel):
+    period_start: date
+    review_count: int
+    average_rating: Optional[float] = None
+    negative_share: Optional[float] = None
+
+
+class RatingTrend(BaseModel):
+    location_id: int
+    interval: str
+    start: Optional[date] = None
+    end: Optional[date] = None
+    review_count: int
+    average_rating: Optional[float] = None
+    negative_share: Optional[float] = None
+    points: List[RatingTrendPoint]
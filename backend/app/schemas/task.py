@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+
+
+class TaskStatus(BaseModel):
+    task_id: str
+    state: str
+    progress: Optional[Dict[str, Any]] = None
+    result: Optional[str] = None
@@ -1,13 +1,27 @@
 from openai import OpenAI
 from app.core.config import settings
-from typing import Optional
+from app.core.metrics import track_upstream, record_openai_usage
+from app.core.tracing import upstream_span
+from .prompts import count_tokens, get_template, select_review_reply_template, truncate_to_tokens
+from .review_classifier import get_review_classifier
+from typing import Any, Dict, Optional
 
 
 class AIResponseService:
     """Service for generating AI responses using OpenAI"""
     
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+    
+    def _complete(self, method: str, **kwargs) -> str:
+        """Run a chat completion, recording latency, errors and token usage"""
+        with upstream_span("openai", method) as span, track_upstream("openai", method):
+            response = self.client.chat.completions.create(**kwargs)
+            span.set_attribute("openai.model", kwargs.get("model", ""))
+            if response.usage is not None:
+                span.set_attribute("openai.total_tokens", response.usage.total_tokens)
+        record_openai_usage(method, response.usage)
+        return response.choices[0].message.content.strip()
     
     def generate_post_content(
         self,
@@ -17,41 +31,18 @@ class AIResponseService:
         post_type: str = "UPDATE"
     ) -> str:
         """Generate content for a Google Business post"""
-        
-        if topic:
-            prompt = f"""Create a {post_type.lower()} post for {business_name}, a {business_category} business, about: {topic}.
-            
-The post should be:
-- Engaging and professional
-- Between 100-300 characters
-- Include a call to action
-- Suitable for Google Business Profile
-
-Generate only the post content, no additional text."""
-        else:
-            prompt = f"""Create a {post_type.lower()} post for {business_name}, a {business_category} business.
-            
-The post should be:
-- Engaging and professional
-- Between 100-300 characters
-- Include a call to action
-- Suitable for Google Business Profile
-- Relevant to the business type
-
-Generate only the post content, no additional text."""
+        template = get_template("post")
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional social media manager specializing in Google Business Profile posts."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.7
+            return self._complete(
+                "generate_post_content",
+                **template.request(
+                    post_type=post_type,
+                    business_name=business_name,
+                    business_category=business_category,
+                    topic=topic or "none given"
+                )
             )
-            
-            return response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error generating post content: {e}")
             return ""
@@ -67,63 +58,30 @@ Generate only the post content, no additional text."""
         """Generate a reply to a customer review"""
         
         sentiment = "positive" if rating >= 4 else "negative" if rating <= 2 else "neutral"
-        
-        prompt = f"""Generate a {tone} reply to a {sentiment} review for {business_name}.
-
-Reviewer: {reviewer_name}
-Rating: {rating}/5 stars
-Review: {review_comment if review_comment else "No comment provided"}
-
-The reply should:
-- Be warm and {tone}
-- Thank the customer
-- Address their feedback appropriately
-- Be between 50-150 words
-- {"Acknowledge and apologize for any issues" if sentiment == "negative" else "Express gratitude"}
-
-Generate only the reply text, no additional formatting."""
+        comment = truncate_to_tokens(review_comment, settings.REVIEW_COMMENT_TOKEN_BUDGET)
+        template = select_review_reply_template(rating, count_tokens(comment))
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a professional customer service representative responding to online reviews."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=250,
-                temperature=0.7
+            return self._complete(
+                "generate_review_reply",
+                **template.request(
+                    business_name=business_name,
+                    tone=tone,
+                    sentiment=sentiment,
+                    reviewer_name=reviewer_name,
+                    rating=rating,
+                    review_comment=comment or "No comment provided"
+                )
             )
-            
-            return response.choices[0].message.content.strip()
         except Exception as e:
             print(f"Error generating review reply: {e}")
             return ""
     
-    def analyze_review_sentiment(self, review_text: str) -> Dict[str, any]:
-        """Analyze the sentiment of a review"""
-        
-        prompt = f"""Analyze the sentiment of this review and provide:
-1. Overall sentiment (positive/negative/neutral)
-2. Key topics mentioned
-3. Urgency level (low/medium/high)
-
-Review: {review_text}
-
-Respond in JSON format."""
+    def analyze_review_sentiment(self, review_text: str, rating: Optional[float] = None) -> Dict[str, Any]:
+        """Analyze the sentiment, topics and urgency of a review.
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a sentiment analysis expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=150,
-                temperature=0.3
-            )
-            
-            # Parse the response (simplified - in production, use proper JSON parsing)
-            return {"analysis": response.choices[0].message.content.strip()}
-        except Exception as e:
-            print(f"Error analyzing sentiment: {e}")
-            return {"analysis": "Unable to analyze"}
+        Runs the local classifier rather than a chat completion; GPT is only
+        used for drafting text.
+        """
+        ratings = [rating] if rating is not None else None
+        return get_review_classifier().classify([review_text], ratings)[0]
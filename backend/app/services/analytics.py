@@ -0,0 +1,49 @@
+from datetime import date
+from typing import Dict, List
+import numpy as np
+
+
+def aggregate_rating_trend(
+    days: np.ndarray,
+    review_counts: np.ndarray,
+    rating_sums: np.ndarray,
+    negative_counts: np.ndarray,
+    interval: str = "day"
+) -> List[Dict]:
+    """Roll daily buckets up into day/week/month periods.
+
+    `days` is a datetime64[D] array; the other arrays hold the per-day
+    counters in the same order. Weeks start on Monday.
+    """
+    if len(days) == 0:
+        return []
+
+    if interval == "week":
+        # 1970-01-01 was a Thursday, so (day + 3) % 7 is the weekday with Monday = 0
+        ordinals = days.astype("int64")
+        periods = (ordinals - (ordinals + 3) % 7).astype("datetime64[D]")
+    elif interval == "month":
+        periods = days.astype("datetime64[M]").astype("datetime64[D]")
+    else:
+        periods = days
+
+    starts, index = np.unique(periods, return_inverse=True)
+    counts = np.bincount(index, weights=review_counts, minlength=len(starts))
+    sums = np.bincount(index, weights=rating_sums, minlength=len(starts))
+    negatives = np.bincount(index, weights=negative_counts, minlength=len(starts))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = np.round(sums / counts, 2)
+        negative_shares = np.round(negatives / counts, 4)
+
+    return [
+        {
+            "period_start": start,
+            "review_count": int(count),
+            "average_rating": float(average) if count else None,
+            "negative_share": float(share) if count else None
+        }
+        for start, count, average, share in zip(
+            starts.astype(date).tolist(), counts, averages, negative_shares
+        )
+    ]
@@ -0,0 +1,21 @@
+import hashlib
+import json
+from typing import Any, Dict
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def content_hash(fields: Dict[str, Any]) -> str:
+    """Stable SHA-256 of upstream fields, ignoring whitespace and key order"""
+    payload = json.dumps(_normalize(fields), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -0,0 +1,223 @@
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+SHINGLE_SIZE = 2
+
+# 48 16-bit min-hashes, banded as 12 bands of 4 rows (one uint64 per band)
+NUM_HASHES = 48
+ROWS_PER_BAND = 4
+NUM_BANDS = NUM_HASHES // ROWS_PER_BAND
+
+_rng = np.random.default_rng(20240601)
+_HASH_A = _rng.integers(0, 2 ** 63, NUM_HASHES, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_HASH_B = _rng.integers(0, 2 ** 63, NUM_HASHES, dtype=np.uint64)
+
+
+def normalize_text(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens with punctuation and extra whitespace removed"""
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def minhash(text: Optional[str], min_tokens: int = 1) -> Optional[np.ndarray]:
+    """MinHash signature of a text's word bigrams, or None for texts shorter than `min_tokens`"""
+    tokens = normalize_text(text)
+    if len(tokens) < max(min_tokens, SHINGLE_SIZE):
+        return None
+
+    shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    # Multiply-shift hashing, keeping the top 16 bits of each permutation
+    permuted = (hashes[:, None] * _HASH_A + _HASH_B) >> np.uint64(48)
+    return permuted.min(axis=0).astype(np.uint16)
+
+
+def signature_to_bytes(signature: np.ndarray) -> bytes:
+    """Serialize a signature for the content_signature column"""
+    return signature.astype("<u2").tobytes()
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    """Inverse of `signature_to_bytes`"""
+    return np.frombuffer(data, dtype="<u2").astype(np.uint16)
+
+
+def _band_keys(signatures: np.ndarray) -> np.ndarray:
+    """(n, NUM_BANDS) uint64 keys, each packing one band's 4 min-hashes"""
+    return np.ascontiguousarray(signatures, dtype=np.uint16).view(np.uint64).reshape(-1, NUM_BANDS)
+
+
+class MinHashIndex:
+    """Near-duplicate lookup over MinHash signatures with LSH banding.
+
+    Each band is a sorted array of packed band keys, so a lookup is one
+    binary search per band followed by a vectorized similarity check of the
+    candidates. The index costs about 250 bytes per review. Signatures added
+    after construction go to per-band dicts until the next `compact`.
+    """
+
+    def __init__(self, ids: Sequence[int] = (), signatures: Optional[np.ndarray] = None, min_similarity: float = 0.6):
+        self.min_similarity = min_similarity
+        self._pending_ids: List[int] = []
+        self._pending_signatures: List[np.ndarray] = []
+        self._pending_bands: List[Dict[int, List[int]]] = [{} for _ in range(NUM_BANDS)]
+        if signatures is None:
+            signatures = np.empty((0, NUM_HASHES), dtype=np.uint16)
+        self._build(np.asarray(ids, dtype=np.int64), np.asarray(signatures, dtype=np.uint16))
+
+    def _build(self, ids: np.ndarray, signatures: np.ndarray):
+        self.ids = ids
+        self.signatures = signatures
+        keys = _band_keys(signatures)
+        self._band_values = []
+        self._band_order = []
+        for band in range(NUM_BANDS):
+            order = np.argsort(keys[:, band], kind="stable").astype(np.int32)
+            self._band_values.append(keys[order, band])
+            self._band_order.append(order)
+
+    def __len__(self):
+        return len(self.ids) + len(self._pending_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the compacted arrays"""
+        return self.ids.nbytes + self.signatures.nbytes + sum(
+            values.nbytes + order.nbytes for values, order in zip(self._band_values, self._band_order)
+        )
+
+    def add(self, item_id: int, signature: np.ndarray):
+        """Add a signature without rebuilding the sorted arrays"""
+        position = len(self._pending_ids)
+        self._pending_ids.append(item_id)
+        self._pending_signatures.append(signature)
+        for band, key in enumerate(_band_keys(signature)[0]):
+            self._pending_bands[band].setdefault(int(key), []).append(position)
+
+    def compact(self):
+        """Merge pending signatures into the sorted arrays"""
+        if not self._pending_ids:
+            return
+        ids = np.concatenate([self.ids, np.asarray(self._pending_ids, dtype=np.int64)])
+        signatures = np.concatenate([self.signatures, np.stack(self._pending_signatures)])
+        self._pending_ids, self._pending_signatures = [], []
+        self._pending_bands = [{} for _ in range(NUM_BANDS)]
+        self._build(ids, signatures)
+
+    def trim(self, max_size: int):
+        """Keep at most `max_size` recent signatures, compacting once pending adds pile up"""
+        if len(self) > max_size:
+            self.compact()
+            self._build(self.ids[-max_size:], self.signatures[-max_size:])
+        elif len(self._pending_ids) > max(4096, len(self.ids) // 4):
+            self.compact()
+
+    def query(self, signature: np.ndarray) -> Optional[int]:
+        """Id of the most similar indexed review at or above min_similarity, or None"""
+        keys = _band_keys(signature)[0]
+        best_id, best_similarity = None, 0.0
+
+        candidates = []
+        for band in range(NUM_BANDS):
+            values = self._band_values[band]
+            left = np.searchsorted(values, keys[band], side="left")
+            right = np.searchsorted(values, keys[band], side="right")
+            if right > left:
+                candidates.append(self._band_order[band][left:right])
+        if candidates:
+            positions = np.unique(np.concatenate(candidates))
+            similarities = (self.signatures[positions] == signature).mean(axis=1)
+            closest = int(np.argmax(similarities))
+            best_id, best_similarity = int(self.ids[positions[closest]]), float(similarities[closest])
+
+        pending = set()
+        for band in range(NUM_BANDS):
+            pending.update(self._pending_bands[band].get(int(keys[band]), ()))
+        for position in pending:
+            similarity = float((self._pending_signatures[position] == signature).mean())
+            if similarity > best_similarity:
+                best_id, best_similarity = self._pending_ids[position], similarity
+
+        return best_id if best_similarity >= self.min_similarity else None
+
+
+class _AccountIndex:
+    def __init__(self):
+        self.index = MinHashIndex(min_similarity=settings.DEDUP_MIN_SIMILARITY)
+        self.last_review_id = 0
+        self.lock = threading.Lock()
+
+
+_account_indexes: "OrderedDict[int, _AccountIndex]" = OrderedDict()
+_account_indexes_lock = threading.Lock()
+
+
+def _account_index(user_id: int) -> _AccountIndex:
+    with _account_indexes_lock:
+        entry = _account_indexes.pop(user_id, None) or _AccountIndex()
+        _account_indexes[user_id] = entry
+        while len(_account_indexes) > settings.DEDUP_CACHED_ACCOUNTS:
+            _account_indexes.popitem(last=False)
+        return entry
+
+
+def reset_account_index(user_id: int):
+    """Drop an account's cached index, e.g. after a rolled back sync"""
+    with _account_indexes_lock:
+        _account_indexes.pop(user_id, None)
+
+
+def find_duplicates(db: Session, user_id: int, reviews: Sequence) -> int:
+    """Sign new reviews and point near-duplicates at the first review of their cluster.
+
+    Reviews must already have ids (flush first). The account's index stays
+    in memory between calls and only loads reviews stored since the last
+    call, capped at DEDUP_INDEX_MAX_REVIEWS recent reviews per account.
+    Returns the number of duplicates found.
+    """
+    from app.models import Location, Review
+
+    entry = _account_index(user_id)
+    with entry.lock:
+        new_ids = {review.id for review in reviews}
+        rows = db.query(Review.id, Review.content_signature, Review.duplicate_of_id).join(Location).filter(
+            Location.user_id == user_id,
+            Review.id > entry.last_review_id,
+            Review.content_signature.isnot(None)
+        ).order_by(Review.id.desc()).limit(settings.DEDUP_INDEX_MAX_REVIEWS).all()
+        for review_id, signature, duplicate_of_id in reversed(rows):
+            entry.last_review_id = max(entry.last_review_id, review_id)
+            # Only cluster heads are indexed, so matches always resolve to the head
+            if review_id not in new_ids and duplicate_of_id is None:
+                entry.index.add(review_id, signature_from_bytes(signature))
+
+        duplicates = 0
+        stale = False
+        for review in sorted(reviews, key=lambda r: r.id):
+            signature = minhash(review.comment, settings.DEDUP_MIN_TOKENS)
+            if signature is None:
+                continue
+            review.content_signature = signature_to_bytes(signature)
+            head_id = entry.index.query(signature)
+            if head_id is not None and head_id not in new_ids:
+                # The head may have been archived since it was indexed
+                if not db.query(Review.id).filter(Review.id == head_id).first():
+                    head_id, stale = None, True
+            review.duplicate_of_id = head_id
+            if review.duplicate_of_id is None:
+                entry.index.add(review.id, signature)
+            else:
+                duplicates += 1
+            entry.last_review_id = max(entry.last_review_id, review.id)
+
+        entry.index.trim(settings.DEDUP_INDEX_MAX_REVIEWS)
+    if stale:
+        # Rebuilt from live reviews on the next call
+        reset_account_index(user_id)
+    return duplicates
@@ -0,0 +1,289 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime, time
+from typing import Dict, Iterator, List, Optional, Sequence
+from sqlalchemy import Boolean, DateTime, Enum as SAEnum, Float, Integer, JSON, select
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def _source(resource: str):
+    """Table a resource is exported from; reviews include the archive"""
+    from app.models import Post
+    from app.services.review_archive import review_history_source
+
+    if resource == "reviews":
+        return review_history_source()
+    return Post.__table__
+
+
+def export_columns(resource: str, source=None) -> Dict[str, object]:
+    """Exportable columns of a resource, in default output order"""
+    from app.models import Location, Post
+
+    if resource == "reviews":
+        review = (source if source is not None else _source(resource)).c
+        columns = [
+            review.id, review.location_id, Location.name.label("location_name"), review.google_review_id,
+            review.reviewer_name, review.rating, review.comment, review.reply_text, review.reply_at,
+            review.ai_generated_reply, review.sentiment, review.sentiment_score, review.topics,
+            review.urgency, review.duplicate_of_id, review.review_created_at, review.created_at,
+            review.archived
+        ]
+    else:
+        columns = [
+            Post.id, Post.location_id, Location.name.label("location_name"), Post.google_post_id,
+            Post.post_type, Post.status, Post.title, Post.content, Post.media_url, Post.scheduled_at,
+            Post.published_at, Post.ai_generated, Post.created_at
+        ]
+    return {column.key: column for column in columns}
+
+
+def select_columns(resource: str, names: Optional[str], source=None) -> List[object]:
+    """Columns for a comma-separated selection, all of them when empty; raises ValueError on unknown names"""
+    available = export_columns(resource, source)
+    if not names:
+        return list(available.values())
+    selected = [name.strip() for name in names.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)}. Available: {', '.join(available)}")
+    return [available[name] for name in dict.fromkeys(selected)]
+
+
+def date_bounds(start: Optional[date], end: Optional[date]):
+    """Datetime bounds for date filters, `end` inclusive"""
+    lower = datetime.combine(start, time.min) if start else None
+    upper = datetime.combine(end, time.max) if end else None
+    return lower, upper
+
+
+def export_query(
+    resource: str,
+    user_id: int,
+    columns: Sequence[object],
+    location_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    source=None
+):
+    """Core select over a user's reviews (live and archived) or posts, ordered by id"""
+    from app.models import Location
+
+    source = source if source is not None else _source(resource)
+    date_column = source.c.review_created_at if resource == "reviews" else source.c.created_at
+    query = select(*columns).select_from(source).join(Location, source.c.location_id == Location.id).where(
+        Location.user_id == user_id
+    )
+    if location_id:
+        query = query.where(source.c.location_id == location_id)
+    lower, upper = date_bounds(start, end)
+    if lower:
+        query = query.where(date_column >= lower)
+    if upper:
+        query = query.where(date_column <= upper)
+    return query.order_by(source.c.id)
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _enum_value(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _json_text(value):
+    return json.dumps(value) if value is not None else None
+
+
+def _converters(columns: Sequence[object], flat: bool) -> List[tuple]:
+    """(position, converter) for the columns whose values are not plain text or numbers.
+
+    Chosen once per export from the column types, so rows with no such
+    columns pass through untouched. `flat` also encodes JSON values (CSV).
+    """
+    converters = []
+    for position, column in enumerate(columns):
+        column_type = column.type
+        if isinstance(column_type, DateTime):
+            converters.append((position, _iso))
+        elif isinstance(column_type, SAEnum):
+            converters.append((position, _enum_value))
+        elif flat and isinstance(column_type, JSON):
+            converters.append((position, _json_text))
+    return converters
+
+
+def _convert(rows: Sequence, converters: List[tuple]) -> Iterator[Sequence]:
+    if not converters:
+        return iter(rows)
+    converted = []
+    for row in rows:
+        row = list(row)
+        for position, convert in converters:
+            row[position] = convert(row[position])
+        converted.append(row)
+    return iter(converted)
+
+
+def _csv_chunks(columns: Sequence[object], names: List[str], batches: Iterator[Sequence]) -> Iterator[bytes]:
+    converters = _converters(columns, flat=True)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for rows in batches:
+        writer.writerows(_convert(rows, converters))
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _ndjson_chunks(columns: Sequence[object], names: List[str], batches: Iterator[Sequence]) -> Iterator[bytes]:
+    converters = _converters(columns, flat=False)
+    encoder = json.JSONEncoder(ensure_ascii=False)
+    for rows in batches:
+        yield "".join(
+            encoder.encode(dict(zip(names, row))) + "\n"
+            for row in _convert(rows, converters)
+        ).encode()
+
+
+class _ChunkSink:
+    """Write-only file object whose contents are drained after each Parquet row group"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def _arrow_type(pa, column):
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        # Naive values from SQLite are UTC already; aware ones are converted
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(column_type, JSON):
+        return pa.list_(pa.string())
+    return pa.string()
+
+
+def _parquet_chunks(columns: Sequence[object], names: List[str], batches: Iterator[Sequence]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, _arrow_type(pa, column)) for name, column in zip(names, columns)])
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="snappy") as writer:
+        for rows in batches:
+            arrays = [
+                pa.array(
+                    [_enum_value(value) for value in values] if isinstance(column.type, SAEnum) else values,
+                    type=field.type
+                )
+                for column, field, values in zip(columns, schema, zip(*rows))
+            ]
+            # One row group per batch keeps memory flat; the footer is written on close
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def export_response(
+    resource: str,
+    user_id: int,
+    export_format: str,
+    columns: Optional[str] = None,
+    location_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+):
+    """StreamingResponse with a user's reviews or posts; raises ValueError on a bad request"""
+    from fastapi.responses import StreamingResponse
+    from app.core.config import settings
+
+    source = _source(resource)
+    selected = select_columns(resource, columns, source)
+    if export_format == "parquet" and not parquet_available():
+        raise ValueError("Parquet export is not available on this server (pyarrow is not installed)")
+
+    media_type, extension = FORMATS[export_format]
+    query = export_query(resource, user_id, selected, location_id, start, end, source)
+    filename = f"{resource}-{date.today().isoformat()}.{extension}"
+    return StreamingResponse(
+        stream_export(query, selected, export_format, settings.EXPORT_BATCH_SIZE, user_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def stream_export(
+    query,
+    columns: Sequence[object],
+    export_format: str,
+    batch_size: int,
+    user_id: Optional[int] = None
+) -> Iterator[bytes]:
+    """Encode a select as CSV, NDJSON or Parquet, fetching `batch_size` rows at a time.
+
+    Opens its own session, on a read replica when one is fresh enough,
+    because the response body is produced after the endpoint returns. Rows
+    stream from a server-side cursor as plain tuples, so memory stays flat
+    however many rows are exported.
+    """
+    from app.core.db_routing import read_session
+
+    names = [column.key for column in columns]
+    db = read_session(user_id)
+    try:
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        batches = result.partitions()
+        if export_format == "csv":
+            yield from _csv_chunks(columns, names, batches)
+        elif export_format == "ndjson":
+            yield from _ndjson_chunks(columns, names, batches)
+        else:
+            yield from _parquet_chunks(columns, names, batches)
+    finally:
+        db.close()
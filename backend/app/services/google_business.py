@@ -1,7 +1,46 @@
+import json
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+import httplib2
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from typing import List, Dict, Optional
+from googleapiclient.errors import HttpError
+from typing import Dict, Iterator, List, Optional
 from app.core.config import settings
+from app.core.metrics import track_upstream
+from app.core.tracing import upstream_span
+
+LOCATION_READ_MASK = "name,title,storefrontAddress,phoneNumbers,websiteUri,categories"
+
+# Reviews and local posts are only served by the v4 API, which has no bundled discovery document
+V4_API_URL = "https://mybusiness.googleapis.com/v4"
+
+
+def v4_location_name(google_account_id: Optional[str], google_location_id: Optional[str]) -> Optional[str]:
+    """The accounts/{account}/locations/{location} name v4 calls take, or None while the account is unknown.
+    
+    Business Information v1 names locations `locations/{id}`, but reviews and
+    local posts are addressed under the owning account.
+    """
+    if not google_location_id:
+        return None
+    if google_location_id.startswith("accounts/"):
+        return google_location_id
+    if not google_account_id:
+        return None
+    return f"{google_account_id}/{google_location_id}"
+
+
+def _update_time(g_review: Dict) -> datetime:
+    """A review's updateTime as naive UTC; datetime.max if it has none, so paging doesn't stop on it"""
+    value = g_review.get('updateTime') or g_review.get('createTime')
+    if not value:
+        return datetime.max
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
 
 
 class GoogleBusinessService:
@@ -15,24 +54,79 @@ class GoogleBusinessService:
             client_id=settings.GOOGLE_CLIENT_ID,
             client_secret=settings.GOOGLE_CLIENT_SECRET
         )
-        self.service = build('mybusinessbusinessinformation', 'v1', credentials=self.credentials)
-        self.account_service = build('mybusinessaccountmanagement', 'v1', credentials=self.credentials)
+        # GBP_API_BASE_URL points every GBP call at one host, e.g. scripts/fake_upstream_server.py
+        base_url = settings.GBP_API_BASE_URL.rstrip("/") if settings.GBP_API_BASE_URL else None
+        client_options = {"api_endpoint": base_url} if base_url else None
+        with upstream_span("gbp", "build"):
+            self.service = build(
+                'mybusinessbusinessinformation', 'v1', credentials=self.credentials, client_options=client_options
+            )
+            self.account_service = build(
+                'mybusinessaccountmanagement', 'v1', credentials=self.credentials, client_options=client_options
+            )
+        self.v4_url = f"{base_url}/v4" if base_url else V4_API_URL
+        self.http = AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=settings.GBP_REQUEST_TIMEOUT_SECONDS))
+    
+    def _execute(self, method: str, request):
+        """Execute an API request, recording latency and errors"""
+        with upstream_span("gbp", method), track_upstream("gbp", method):
+            return request.execute()
+    
+    def _v4(self, method: str, http_method: str, path: str, params: Optional[Dict] = None, body: Optional[Dict] = None) -> Dict:
+        """Call a v4 endpoint, recording latency and errors like `_execute`"""
+        uri = f"{self.v4_url}/{path}"
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        if params:
+            uri = f"{uri}?{urlencode(params)}"
+        with upstream_span("gbp", method), track_upstream("gbp", method):
+            response, content = self.http.request(
+                uri,
+                http_method,
+                body=json.dumps(body) if body is not None else None,
+                headers={"Content-Type": "application/json"}
+            )
+            if response.status >= 400:
+                raise HttpError(response, content, uri=uri)
+        return json.loads(content) if content else {}
     
     def get_accounts(self) -> List[Dict]:
         """Get all Google Business accounts"""
         try:
-            accounts = self.account_service.accounts().list().execute()
-            return accounts.get('accounts', [])
+            accounts = []
+            page_token = None
+            while True:
+                page = self._execute("get_accounts", self.account_service.accounts().list(
+                    pageSize=20,
+                    pageToken=page_token
+                ))
+                accounts.extend(page.get('accounts', []))
+                page_token = page.get('nextPageToken')
+                if not page_token:
+                    return accounts
         except Exception as e:
             print(f"Error getting accounts: {e}")
             return []
     
+    def iter_location_pages(self, account_id: str, page_size: int = 100) -> Iterator[List[Dict]]:
+        """Yield an account's locations one page at a time"""
+        parent = f"accounts/{account_id}"
+        page_token = None
+        while True:
+            page = self._execute("get_locations", self.service.accounts().locations().list(
+                parent=parent,
+                readMask=LOCATION_READ_MASK,
+                pageSize=page_size,
+                pageToken=page_token
+            ))
+            yield page.get('locations', [])
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return
+    
     def get_locations(self, account_id: str) -> List[Dict]:
         """Get all locations for an account"""
         try:
-            parent = f"accounts/{account_id}"
-            locations = self.service.accounts().locations().list(parent=parent).execute()
-            return locations.get('locations', [])
+            return [location for page in self.iter_location_pages(account_id) for location in page]
         except Exception as e:
             print(f"Error getting locations: {e}")
             return []
@@ -40,47 +134,62 @@ class GoogleBusinessService:
     def get_location(self, location_name: str) -> Optional[Dict]:
         """Get a specific location"""
         try:
-            location = self.service.locations().get(name=location_name).execute()
+            location = self._execute("get_location", self.service.locations().get(name=location_name))
             return location
         except Exception as e:
             print(f"Error getting location: {e}")
             return None
     
     def create_post(self, location_name: str, post_data: Dict) -> Optional[Dict]:
-        """Create a local post for a location"""
+        """Create a local post for a location, given its v4 name (`v4_location_name`)"""
         try:
-            # Note: The actual API endpoint may vary
-            # This is a simplified version
-            parent = location_name
-            post = self.service.locations().localPosts().create(
-                parent=parent,
-                body=post_data
-            ).execute()
-            return post
+            return self._v4("create_post", "POST", f"{location_name}/localPosts", body=post_data)
         except Exception as e:
             print(f"Error creating post: {e}")
             return None
     
-    def get_reviews(self, location_name: str) -> List[Dict]:
-        """Get reviews for a location"""
+    def get_reviews(
+        self, location_name: str, page_size: int = 50, updated_since: Optional[datetime] = None
+    ) -> Optional[List[Dict]]:
+        """Get a location's reviews, given its v4 name (`v4_location_name`), following pagination; None on error.
+        
+        Reviews are listed newest first by updateTime. With `updated_since`
+        (naive UTC), paging stops after the first page reaching back to it, so
+        only reviews changed since then, plus the rest of that page, are
+        fetched. Without it, every review is.
+        """
         try:
-            parent = location_name
-            reviews = self.service.accounts().locations().reviews().list(
-                parent=parent
-            ).execute()
-            return reviews.get('reviews', [])
+            reviews = []
+            page_token = None
+            while True:
+                page = self._v4("get_reviews", "GET", f"{location_name}/reviews", params={
+                    "pageSize": page_size,
+                    "pageToken": page_token,
+                    "orderBy": "updateTime desc"
+                })
+                page_reviews = page.get('reviews', [])
+                reviews.extend(page_reviews)
+                page_token = page.get('nextPageToken')
+                if not page_token:
+                    return reviews
+                if updated_since is not None and page_reviews and _update_time(page_reviews[-1]) <= updated_since:
+                    return reviews
         except Exception as e:
             print(f"Error getting reviews: {e}")
-            return []
+            return None
+    
+    def get_review(self, review_name: str) -> Optional[Dict]:
+        """Get a single review by resource name"""
+        try:
+            return self._v4("get_review", "GET", review_name)
+        except Exception as e:
+            print(f"Error getting review: {e}")
+            return None
     
     def reply_to_review(self, review_name: str, reply_text: str) -> Optional[Dict]:
-        """Reply to a review"""
+        """Reply to a review, given its full resource name"""
         try:
-            reply = self.service.accounts().locations().reviews().updateReply(
-                name=review_name,
-                body={'comment': reply_text}
-            ).execute()
-            return reply
+            return self._v4("reply_to_review", "PUT", f"{review_name}/reply", body={'comment': reply_text})
         except Exception as e:
             print(f"Error replying to review: {e}")
             return None
@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import Iterable, Optional, Sequence
+from sqlalchemy import delete, event, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+PENDING_KEY = "task_outbox_pending"
+
+_state = threading.local()
+
+
+def enqueue_after_commit(db: Session, task, *args, **kwargs):
+    """Queue a Celery task in `db`'s transaction; it is published only if the transaction commits"""
+    from app.models import TaskOutbox
+    
+    db.add(TaskOutbox(task_name=task.name, args=list(args), kwargs=kwargs))
+    db.info[PENDING_KEY] = True
+
+
+def enqueue_many(db: Session, task, arg_lists: Iterable[Sequence]) -> int:
+    """`enqueue_after_commit` for one call of `task` per argument list, in a single INSERT"""
+    from app.models import TaskOutbox
+    
+    rows = [{"task_name": task.name, "args": list(args), "kwargs": {}} for args in arg_lists]
+    if rows:
+        db.execute(insert(TaskOutbox), rows)
+        db.info[PENDING_KEY] = True
+    return len(rows)
+
+
+def _claim_batch(batch_size: int):
+    """Lease the oldest unclaimed rows to this relay and commit; returns them in id order"""
+    from app.core.database import SessionLocal
+    from app.models import TaskOutbox
+    
+    outbox = TaskOutbox.__table__
+    now = time.time()
+    db = SessionLocal()
+    try:
+        claimable = (
+            select(outbox.c.id)
+            .where(or_(outbox.c.claimed_until.is_(None), outbox.c.claimed_until < now))
+            .order_by(outbox.c.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        # The claim condition is checked again by the UPDATE itself, so of
+        # two relays racing for a row (SQLite has no SKIP LOCKED) one wins
+        rows = db.execute(
+            update(outbox)
+            .where(outbox.c.id.in_(claimable))
+            .where(or_(outbox.c.claimed_until.is_(None), outbox.c.claimed_until < now))
+            .values(claimed_until=now + settings.OUTBOX_CLAIM_SECONDS)
+            .returning(outbox.c.id, outbox.c.task_name, outbox.c.args, outbox.c.kwargs)
+        ).all()
+        db.commit()
+        return sorted(rows, key=lambda row: row.id)
+    finally:
+        db.close()
+
+
+def _finish_batch(sent_ids: Sequence[int], unsent_ids: Sequence[int]):
+    """Delete the rows that were sent and release the claim on the rest"""
+    from app.core.database import SessionLocal
+    from app.models import TaskOutbox
+    
+    outbox = TaskOutbox.__table__
+    db = SessionLocal()
+    try:
+        if sent_ids:
+            db.execute(delete(outbox).where(outbox.c.id.in_(sent_ids)))
+        if unsent_ids:
+            db.execute(update(outbox).where(outbox.c.id.in_(unsent_ids)).values(claimed_until=None))
+        db.commit()
+    finally:
+        db.close()
+
+
+def relay_outbox(batch_size: Optional[int] = None, max_batches: Optional[int] = None) -> int:
+    """Publish committed outbox rows to Celery in id order; returns the number published.
+    
+    Each batch is claimed for OUTBOX_CLAIM_SECONDS in its own short
+    transaction, so concurrent relays never send the same rows and no locks
+    are held while publishing (eager tasks write to the database). The batch
+    is sent over one broker connection, then the sent rows are deleted and
+    the claim on any unsent ones is released. A relay that dies before
+    deleting leaves its rows to be sent again when the claim runs out:
+    delivery is at least once, and tasks must tolerate running twice.
+    Calls made while this thread is already relaying return 0 (eager mode).
+    """
+    from app.tasks import celery_app
+    
+    if getattr(_state, "relaying", False):
+        return 0
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    relayed = 0
+    batches = 0
+    _state.relaying = True
+    try:
+        while max_batches is None or batches < max_batches:
+            rows = _claim_batch(batch_size)
+            if not rows:
+                break
+            sent_ids = []
+            try:
+                with celery_app.producer_or_acquire() as producer:
+                    for row in rows:
+                        task = celery_app.tasks.get(row.task_name)
+                        if task is None:
+                            # Renamed or removed task; it can never be delivered
+                            print(f"Error relaying outbox row {row.id}: unknown task {row.task_name}")
+                        else:
+                            task.apply_async(row.args, row.kwargs, producer=producer)
+                        sent_ids.append(row.id)
+            finally:
+                _finish_batch(sent_ids, [row.id for row in rows[len(sent_ids):]])
+            relayed += len(rows)
+            batches += 1
+    finally:
+        _state.relaying = False
+    return relayed
+
+
+@event.listens_for(Session, "after_commit")
+def _relay_after_commit(session: Session):
+    if not session.info.pop(PENDING_KEY, False):
+        return
+    # The beat relay retries whatever this leaves behind
+    try:
+        relay_outbox(max_batches=settings.OUTBOX_INLINE_MAX_BATCHES)
+    except Exception as e:
+        print(f"Error relaying task outbox: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session):
+    session.info.pop(PENDING_KEY, None)
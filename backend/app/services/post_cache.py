@@ -0,0 +1,139 @@
+import hashlib
+import re
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import POST_CACHE_EVICTIONS, POST_CACHE_REQUESTS
+from app.core.redis_client import get_redis
+
+KEY_PREFIX = "post_cache:"
+BUSINESS_NAME_PLACEHOLDER = "{{business_name}}"
+
+# Serves the least used variant that is under the use limit and has not gone to
+# this location or to another location in the same area yet.
+_TAKE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1] .. ':uses', '-inf', '(' .. ARGV[1])
+for _, id in ipairs(ids) do
+    local areas = KEYS[1] .. ':areas:' .. id
+    local locations = KEYS[1] .. ':locations:' .. id
+    if (ARGV[2] == '' or redis.call('SISMEMBER', areas, ARGV[2]) == 0)
+        and redis.call('SISMEMBER', locations, ARGV[3]) == 0 then
+        redis.call('ZINCRBY', KEYS[1] .. ':uses', 1, id)
+        if ARGV[2] ~= '' then
+            redis.call('SADD', areas, ARGV[2])
+        end
+        redis.call('SADD', locations, ARGV[3])
+        return redis.call('HGET', KEYS[1] .. ':text', id)
+    end
+end
+return false
+"""
+
+# Adds a variant, first dropping used-up variants and then, while the pool is
+# full, the most used one. Returns {exhausted evictions, capacity evictions}.
+_STORE_SCRIPT = """
+local uses = KEYS[1] .. ':uses'
+local function drop(id)
+    redis.call('ZREM', uses, id)
+    redis.call('HDEL', KEYS[1] .. ':text', id)
+    redis.call('DEL', KEYS[1] .. ':areas:' .. id, KEYS[1] .. ':locations:' .. id)
+end
+local exhausted = redis.call('ZRANGEBYSCORE', uses, ARGV[1], '+inf')
+for _, id in ipairs(exhausted) do
+    drop(id)
+end
+local capacity = 0
+while redis.call('ZCARD', uses) >= tonumber(ARGV[2]) do
+    drop(redis.call('ZRANGE', uses, -1, -1)[1])
+    capacity = capacity + 1
+end
+local id = tostring(redis.call('INCR', KEYS[1] .. ':next'))
+redis.call('HSET', KEYS[1] .. ':text', id, ARGV[6])
+redis.call('ZADD', uses, 1, id)
+if ARGV[4] ~= '' then
+    redis.call('SADD', KEYS[1] .. ':areas:' .. id, ARGV[4])
+end
+redis.call('SADD', KEYS[1] .. ':locations:' .. id, ARGV[5])
+local ttl = tonumber(ARGV[3])
+for _, key in ipairs({':text', ':uses', ':next'}) do
+    redis.call('EXPIRE', KEYS[1] .. key, ttl)
+end
+for _, variant in ipairs(redis.call('ZRANGE', uses, 0, -1)) do
+    redis.call('EXPIRE', KEYS[1] .. ':areas:' .. variant, ttl)
+    redis.call('EXPIRE', KEYS[1] .. ':locations:' .. variant, ttl)
+end
+return {#exhausted, capacity}
+"""
+
+
+def location_area(address: Optional[str]) -> str:
+    """Neighbourhood key for a location: its address without the street line"""
+    parts = [part.strip().lower() for part in (address or "").split(",") if part.strip()]
+    if len(parts) > 1:
+        parts = parts[1:]
+    return re.sub(r"\s+", " ", ", ".join(parts))
+
+
+def _pool_key(location, post_type: str, topic: Optional[str]) -> str:
+    scope = f"user:{location.user_id}" if settings.POST_CACHE_SCOPE == "account" else "global"
+    category = (location.category or "business").strip().lower()
+    normalized_topic = re.sub(r"\s+", " ", (topic or "").strip().lower())
+    digest = hashlib.sha1(f"{scope}|{category}|{post_type}|{normalized_topic}".encode()).hexdigest()
+    return f"{KEY_PREFIX}{digest}"
+
+
+def take_cached_post(location, post_type: str, topic: Optional[str]) -> Optional[str]:
+    """A cached post for this location with its business name filled in, or None on a miss"""
+    if not settings.POST_CACHE_ENABLED:
+        return None
+    try:
+        template = get_redis().eval(
+            _TAKE_SCRIPT, 1, _pool_key(location, post_type, topic),
+            settings.POST_CACHE_MAX_USES, location_area(location.address), location.id
+        )
+    except Exception as e:
+        print(f"Error reading post cache: {e}")
+        POST_CACHE_REQUESTS.labels("error").inc()
+        return None
+
+    if template is None:
+        POST_CACHE_REQUESTS.labels("miss").inc()
+        return None
+    POST_CACHE_REQUESTS.labels("hit").inc()
+    return template.decode().replace(BUSINESS_NAME_PLACEHOLDER, location.name)
+
+
+def store_generated_post(location, post_type: str, topic: Optional[str], content: str):
+    """Add freshly generated content to the pool as a variant other locations can reuse"""
+    if not settings.POST_CACHE_ENABLED or not content:
+        return
+    template = content
+    if location.name and len(location.name) >= 3:
+        template = content.replace(location.name, BUSINESS_NAME_PLACEHOLDER)
+    try:
+        exhausted, capacity = get_redis().eval(
+            _STORE_SCRIPT, 1, _pool_key(location, post_type, topic),
+            settings.POST_CACHE_MAX_USES, settings.POST_CACHE_MAX_VARIANTS, settings.POST_CACHE_TTL_SECONDS,
+            location_area(location.address), location.id, template
+        )
+    except Exception as e:
+        print(f"Error writing post cache: {e}")
+        return
+    if exhausted:
+        POST_CACHE_EVICTIONS.labels("exhausted").inc(exhausted)
+    if capacity:
+        POST_CACHE_EVICTIONS.labels("capacity").inc(capacity)
+
+
+def cached_post_content(ai_service, location, topic: Optional[str] = None, post_type: str = "UPDATE") -> str:
+    """Post content for a location, reusing a cached variant when the policy allows"""
+    content = take_cached_post(location, post_type, topic)
+    if content:
+        return content
+    content = ai_service.generate_post_content(
+        business_name=location.name,
+        business_category=location.category or "business",
+        topic=topic,
+        post_type=post_type
+    )
+    store_generated_post(location, post_type, topic, content)
+    return content
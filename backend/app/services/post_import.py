@@ -0,0 +1,174 @@
+import csv
+import io
+import shutil
+import tempfile
+from collections import defaultdict
+from typing import BinaryIO, Dict, List, Optional
+from pydantic import ValidationError
+from sqlalchemy import insert
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.http_cache import invalidate_responses
+from app.models import Location, Post
+from app.models.post import PostStatus
+from app.models.stats import apply_stats_deltas, post_status_column
+from app.schemas.post import PostImportRow
+
+IMPORT_FIELDS = ("location_id", "google_location_id", "title", "content", "post_type", "media_url", "scheduled_at", "status")
+
+
+def insert_posts(rows: List[dict], user_ids):
+    """Bulk insert posts and update the stats rollup the ORM hook would have maintained"""
+    if not rows:
+        return
+    deltas = defaultdict(lambda: defaultdict(float))
+    for row in rows:
+        deltas[row["location_id"]][post_status_column(row["status"])] += 1
+
+    db = SessionLocal()
+    try:
+        connection = db.connection()
+        connection.execute(insert(Post.__table__), rows)
+        apply_stats_deltas(connection, deltas)
+        db.commit()
+    finally:
+        db.close()
+    for user_id in user_ids:
+        invalidate_responses(user_id, "posts")
+
+
+def _row_errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+def _validate_row(row: Dict[Optional[str], str], locations: Dict[str, int], location_ids: set):
+    """(post columns, None) for a valid row, (None, errors) otherwise"""
+    fields = {field: row[field].strip() for field in IMPORT_FIELDS if row.get(field) and row[field].strip()}
+    google_location_id = fields.pop("google_location_id", None)
+    if "location_id" not in fields and google_location_id:
+        if google_location_id not in locations:
+            return None, [f"google_location_id: unknown location {google_location_id}"]
+        fields["location_id"] = locations[google_location_id]
+
+    try:
+        post = PostImportRow.model_validate(fields)
+    except ValidationError as e:
+        return None, _row_errors(e)
+    if post.location_id not in location_ids:
+        return None, [f"location_id: location {post.location_id} not found"]
+
+    status = post.status or (PostStatus.SCHEDULED if post.scheduled_at else PostStatus.DRAFT)
+    return {
+        "location_id": post.location_id,
+        "title": post.title,
+        "content": post.content,
+        "post_type": post.post_type,
+        "media_url": post.media_url,
+        "scheduled_at": post.scheduled_at,
+        "status": status,
+        "ai_generated": False
+    }, None
+
+
+def _spooled(file: BinaryIO) -> BinaryIO:
+    """`file` itself if it can be rewound, else a copy that can (in memory up to 1 MiB, then on disk)"""
+    if file.seekable():
+        return file
+    copy = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    shutil.copyfileobj(file, copy)
+    return copy
+
+
+def _read_rows(file: BinaryIO):
+    """Yield the rows of a UTF-8 CSV file, leaving `file` open"""
+    file.seek(0)
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.DictReader(text)
+    finally:
+        # Closing the wrapper would close the upload too
+        text.detach()
+
+
+def _check_file(file: BinaryIO) -> int:
+    """Decode and parse the whole file before anything is inserted; returns the number of rows.
+    
+    Raises ValueError for files that are not UTF-8 CSV, lack the required
+    columns or have more than POST_IMPORT_MAX_ROWS rows, so an upload is
+    either rejected as a whole or imported.
+    """
+    rows = 0
+    file.seek(0)
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        columns = set(reader.fieldnames or ())
+        if "content" not in columns or not columns & {"location_id", "google_location_id"}:
+            raise ValueError("CSV needs a content column and a location_id or google_location_id column")
+        for _ in reader:
+            rows += 1
+            if rows > settings.POST_IMPORT_MAX_ROWS:
+                raise ValueError(f"CSV has more than {settings.POST_IMPORT_MAX_ROWS} rows, nothing was imported")
+    except UnicodeDecodeError:
+        raise ValueError("File must be UTF-8 encoded CSV")
+    except csv.Error as e:
+        raise ValueError(f"Could not read CSV row {rows + 2}: {e}")
+    finally:
+        text.detach()
+    return rows
+
+
+def import_posts_csv(file: BinaryIO, user_id: int, dry_run: bool = False) -> dict:
+    """Validate and insert posts from an uploaded CSV file, streaming it in batches.
+
+    Columns are `content` plus `location_id` or `google_location_id`, and
+    optionally title, post_type, media_url, scheduled_at and status. Rows
+    with a scheduled_at become SCHEDULED unless a status is given. The file
+    is checked in full first (`_check_file`); then valid rows are inserted
+    POST_IMPORT_BATCH_SIZE at a time and invalid rows are reported by
+    spreadsheet row number (the header is row 1).
+    Raises ValueError when the file itself cannot be imported.
+    """
+    file = _spooled(file)
+    _check_file(file)
+
+    db = SessionLocal()
+    try:
+        locations = dict(
+            db.query(Location.google_location_id, Location.id).filter(Location.user_id == user_id).all()
+        )
+    finally:
+        db.close()
+    location_ids = set(locations.values())
+
+    result = {"rows": 0, "valid": 0, "imported": 0, "failed": 0, "errors": [], "errors_truncated": False, "dry_run": dry_run}
+    batch = []
+
+    def flush():
+        if not dry_run:
+            insert_posts(batch, [user_id])
+            result["imported"] += len(batch)
+        batch.clear()
+
+    for row_number, row in enumerate(_read_rows(file), start=2):
+        result["rows"] += 1
+
+        post, errors = _validate_row(row, locations, location_ids)
+        if errors:
+            result["failed"] += 1
+            if len(result["errors"]) < settings.POST_IMPORT_MAX_ERRORS:
+                result["errors"].append({"row": row_number, "errors": errors})
+            else:
+                result["errors_truncated"] = True
+            continue
+
+        result["valid"] += 1
+        batch.append(post)
+        if len(batch) >= settings.POST_IMPORT_BATCH_SIZE:
+            flush()
+
+    flush()
+    return result
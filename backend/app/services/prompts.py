@@ -0,0 +1,141 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+from app.core.config import settings
+
+# Static instructions live in the system message and per-request fields in the
+# user message. The system prompts are ~130 tokens, well under the 1024-token
+# minimum for OpenAI prompt caching, so they aren't cached; the split only keeps
+# the templates readable and the per-request part small.
+POST_SYSTEM_PROMPT = """You are a professional social media manager specializing in Google Business Profile posts.
+
+Write a post for the business described by the user. The post must be:
+- Engaging and professional
+- Between 100-300 characters
+- Include a call to action
+- Suitable for Google Business Profile
+- About the given topic, or relevant to the business type when no topic is given
+- Written in the style of the given post type (UPDATE, EVENT or OFFER)
+
+Reply with only the post content, no additional text."""
+
+POST_USER_PROMPT = """Post type: {post_type}
+Business: {business_name}
+Category: {business_category}
+Topic: {topic}"""
+
+REVIEW_REPLY_SYSTEM_PROMPT = """You are a professional customer service representative responding to online reviews on behalf of a business.
+
+Write a reply to the review described by the user. The reply must:
+- Use the requested tone and stay warm
+- Thank the customer by name
+- Address their feedback appropriately
+- Be between 50-150 words
+- Acknowledge and apologize for any issues when the sentiment is negative; otherwise express gratitude
+- Never invent facts about the business or promise compensation
+
+Reply with only the reply text, no additional formatting."""
+
+REVIEW_REPLY_USER_PROMPT = """Business: {business_name}
+Tone: {tone}
+Sentiment: {sentiment}
+Reviewer: {reviewer_name}
+Rating: {rating}/5 stars
+Review: {review_comment}"""
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A chat prompt with the model and sampling settings it should run with"""
+    name: str
+    model: str
+    system_prompt: str
+    user_prompt: str
+    max_tokens: int
+    temperature: float = 0.7
+
+    def request(self, **fields) -> Dict:
+        """Keyword arguments for chat.completions.create"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": self.user_prompt.format(**fields)}
+            ],
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature
+        }
+
+
+TEMPLATES: Dict[str, PromptTemplate] = {
+    "post": PromptTemplate(
+        name="post",
+        model=settings.OPENAI_FAST_MODEL,
+        system_prompt=POST_SYSTEM_PROMPT,
+        user_prompt=POST_USER_PROMPT,
+        max_tokens=120
+    ),
+    "review_reply": PromptTemplate(
+        name="review_reply",
+        model=settings.OPENAI_FAST_MODEL,
+        system_prompt=REVIEW_REPLY_SYSTEM_PROMPT,
+        user_prompt=REVIEW_REPLY_USER_PROMPT,
+        max_tokens=220
+    ),
+    # Same prompt on the stronger model for complaints and long reviews
+    "review_reply_sensitive": PromptTemplate(
+        name="review_reply_sensitive",
+        model=settings.OPENAI_QUALITY_MODEL,
+        system_prompt=REVIEW_REPLY_SYSTEM_PROMPT,
+        user_prompt=REVIEW_REPLY_USER_PROMPT,
+        max_tokens=220
+    ),
+}
+
+
+def get_template(name: str) -> PromptTemplate:
+    """Look up a registered prompt template"""
+    return TEMPLATES[name]
+
+
+def select_review_reply_template(rating: float, comment_tokens: int) -> PromptTemplate:
+    """Route easy replies to the fast model and complaints or long reviews to the strong one"""
+    if rating <= 2 or comment_tokens > settings.REVIEW_REPLY_SENSITIVE_TOKENS:
+        return TEMPLATES["review_reply_sensitive"]
+    return TEMPLATES["review_reply"]
+
+
+@lru_cache
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The BPE file is downloaded on first use; fall back to an estimate when offline
+        print(f"Token encoding unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Number of tokens in a string (about 4 characters per token when tiktoken is unavailable)"""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text))
+
+
+def truncate_to_tokens(text: Optional[str], budget: int) -> Optional[str]:
+    """Cut text to at most `budget` tokens, marking the cut with an ellipsis"""
+    if not text or count_tokens(text) <= budget:
+        return text
+    encoding = _encoding()
+    if encoding is None:
+        return text[:budget * 4].rstrip() + "..."
+    return encoding.decode(encoding.encode(text)[:budget]).rstrip() + "..."
+
+
+def message_tokens(messages: List[Dict]) -> int:
+    """Approximate prompt tokens for a chat request, including per-message overhead"""
+    return sum(count_tokens(message["content"]) + 4 for message in messages) + 2
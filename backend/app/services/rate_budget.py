@@ -0,0 +1,88 @@
+import threading
+import time
+
+KEY_PREFIX = "rate_budget:"
+
+# Refills both buckets for the time since the last call, then takes one
+# request and ARGV[4] tokens if both cover it. Returns the seconds to wait
+# before trying again, 0 when the call may go ahead (as a string: Redis
+# truncates Lua numbers to integers).
+_ACQUIRE_SCRIPT = """
+local rpm = tonumber(ARGV[1])
+local tpm = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'updated')
+local requests = tonumber(state[1]) or rpm
+local tokens = tonumber(state[2]) or tpm
+local elapsed = math.max(now - (tonumber(state[3]) or now), 0)
+requests = math.min(rpm, requests + elapsed * rpm / 60)
+tokens = math.min(tpm, tokens + elapsed * tpm / 60)
+local wait = 0
+if requests >= 1 and tokens >= cost then
+    requests = requests - 1
+    tokens = tokens - cost
+else
+    wait = math.max((1 - requests) * 60 / rpm, (cost - tokens) * 60 / tpm, 0.01)
+end
+redis.call('HSET', KEYS[1], 'requests', tostring(requests), 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], 120)
+return tostring(wait)
+"""
+
+
+class RateBudget:
+    """Token buckets for requests and tokens per minute, shared in Redis by everything using the same name.
+
+    `acquire` blocks until both buckets can cover the call, so all
+    campaigns on all workers together stay within the configured OpenAI
+    rate limits. While Redis is unavailable, each process falls back to
+    buckets of its own, which only limit that process.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, name: str = "openai"):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.key = f"{KEY_PREFIX}{name}"
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take_shared(self, tokens: int) -> float:
+        from app.core.redis_client import get_redis
+
+        return float(get_redis().eval(
+            _ACQUIRE_SCRIPT, 1, self.key,
+            self.requests_per_minute, self.tokens_per_minute, time.time(), tokens
+        ))
+
+    def _take_local(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                return 0.0
+            return max(
+                (1 - self._requests) * 60 / self.requests_per_minute,
+                (tokens - self._tokens) * 60 / self.tokens_per_minute,
+                0.01
+            )
+
+    def acquire(self, tokens: int = 0):
+        """Wait until one request using about `tokens` tokens fits in the budget"""
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            try:
+                wait = self._take_shared(tokens)
+            except Exception as e:
+                print(f"Error reading shared rate budget: {e}")
+                wait = self._take_local(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
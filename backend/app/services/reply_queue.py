@@ -0,0 +1,167 @@
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+LOCATIONS_KEY = "reply_queue:locations"
+LOCATION_KEY_PREFIX = "reply_queue:location:"
+# Dispatched reviews awaiting their reply task: review id -> time they become visible again,
+# plus each one's location, deadline and dispatch count
+PENDING_KEY = "reply_queue:pending"
+PENDING_ITEMS_KEY = "reply_queue:pending_items"
+ATTEMPTS_KEY = "reply_queue:attempts"
+
+# Reply deadlines relative to when the review was written; earliest deadline is served first
+RATING_DELAYS = ((2, 0), (3, 4 * 3600), (5, 24 * 3600))
+URGENCY_DELAYS = {"high": -3600, "medium": 0, "low": 0}
+RATING_ONLY_DELAY = 24 * 3600
+
+# Pops up to ARGV[2] reviews from each of the ARGV[1] locations with the earliest
+# head deadline into the pending set until ARGV[4], then re-scores or drops each
+# location in the location index.
+_POP_SCRIPT = """
+local locations = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+local popped = {}
+for _, location in ipairs(locations) do
+    local key = ARGV[3] .. location
+    local items = redis.call('ZPOPMIN', key, ARGV[2])
+    for i = 1, #items, 2 do
+        table.insert(popped, location)
+        table.insert(popped, items[i])
+        redis.call('ZADD', KEYS[2], ARGV[4], items[i])
+        redis.call('HSET', KEYS[3], items[i], location .. ' ' .. items[i + 1])
+        redis.call('HINCRBY', KEYS[4], items[i], 1)
+    end
+    local head = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    if #head == 0 then
+        redis.call('ZREM', KEYS[1], location)
+    else
+        redis.call('ZADD', KEYS[1], head[2], location)
+    end
+end
+return popped
+"""
+
+# Puts pending reviews back in their location queues at their old deadlines: all
+# whose visibility ran out by ARGV[1], dropping those dispatched ARGV[2] times
+# already, or just ARGV[4..], whose dispatch then doesn't count. Returns the
+# number requeued.
+_REQUEUE_SCRIPT = """
+local ids = {}
+local explicit = #ARGV > 3
+if explicit then
+    for i = 4, #ARGV do table.insert(ids, ARGV[i]) end
+else
+    ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+end
+local requeued = 0
+for _, id in ipairs(ids) do
+    local item = redis.call('HGET', KEYS[2], id)
+    redis.call('ZREM', KEYS[1], id)
+    redis.call('HDEL', KEYS[2], id)
+    if item then
+        local attempts = tonumber(redis.call('HGET', KEYS[3], id) or '0')
+        if explicit then
+            redis.call('HINCRBY', KEYS[3], id, -1)
+        end
+        if not explicit and attempts >= tonumber(ARGV[2]) then
+            redis.call('HDEL', KEYS[3], id)
+        else
+            local location, deadline = string.match(item, '(%S+) (%S+)')
+            redis.call('ZADD', ARGV[3] .. location, deadline, id)
+            redis.call('ZADD', KEYS[4], 'LT', deadline, location)
+            requeued = requeued + 1
+        end
+    end
+end
+return requeued
+"""
+
+
+def reply_deadline(rating: float, urgency: Optional[str], has_comment: bool, review_created_at: Optional[datetime]) -> float:
+    """Unix time by which a review should be answered, from rating, urgency and age"""
+    if review_created_at is None:
+        created = datetime.now(timezone.utc).timestamp()
+    elif review_created_at.tzinfo is None:
+        created = review_created_at.replace(tzinfo=timezone.utc).timestamp()
+    else:
+        created = review_created_at.timestamp()
+    
+    delay = next(delay for max_rating, delay in RATING_DELAYS if (rating or 0) <= max_rating)
+    delay += URGENCY_DELAYS.get(urgency or "low", 0)
+    if not has_comment and (rating or 0) >= 4:
+        delay += RATING_ONLY_DELAY
+    return created + delay
+
+
+def enqueue_review_reply(review) -> float:
+    """Add a review to its location's reply queue"""
+    deadline = reply_deadline(review.rating, review.urgency, bool(review.comment), review.review_created_at)
+    pipe = get_redis().pipeline()
+    pipe.zadd(f"{LOCATION_KEY_PREFIX}{review.location_id}", {review.id: deadline})
+    # Only ever move a location's position earlier
+    pipe.zadd(LOCATIONS_KEY, {review.location_id: deadline}, lt=True)
+    pipe.execute()
+    return deadline
+
+
+def pop_reply_batch(max_locations: int, per_location: int) -> List[Tuple[int, int]]:
+    """Atomically take the most urgent reviews, at most `per_location` from each location.
+    
+    Returns (location_id, review_id) pairs. Capping each location per batch keeps
+    one location's backlog from starving the others. Taken reviews stay pending
+    until `ack_review_reply`; ones not acknowledged within
+    REPLY_VISIBILITY_TIMEOUT_SECONDS go back in the queue (`requeue_expired_replies`).
+    """
+    visible_at = time.time() + settings.REPLY_VISIBILITY_TIMEOUT_SECONDS
+    popped = get_redis().eval(
+        _POP_SCRIPT, 4, LOCATIONS_KEY, PENDING_KEY, PENDING_ITEMS_KEY, ATTEMPTS_KEY,
+        max_locations, per_location, LOCATION_KEY_PREFIX, visible_at
+    )
+    return [(int(popped[i]), int(popped[i + 1])) for i in range(0, len(popped), 2)]
+
+
+def _requeue(now: float, review_ids=()) -> int:
+    return get_redis().eval(
+        _REQUEUE_SCRIPT, 4, PENDING_KEY, PENDING_ITEMS_KEY, ATTEMPTS_KEY, LOCATIONS_KEY,
+        now, settings.REPLY_MAX_ATTEMPTS, LOCATION_KEY_PREFIX, *review_ids
+    )
+
+
+def requeue_review_reply(review_id: int) -> int:
+    """Put a dispatched review back in its queue right away (its reply task could not be sent)"""
+    return _requeue(time.time(), [review_id])
+
+
+def requeue_expired_replies(now: Optional[float] = None) -> int:
+    """Put dispatched reviews whose reply task never acknowledged them back in their queues.
+    
+    A review dispatched REPLY_MAX_ATTEMPTS times is dropped instead, so one
+    that always fails doesn't cycle forever.
+    """
+    return _requeue(time.time() if now is None else now)
+
+
+def ack_review_reply(review_id: int):
+    """Mark a dispatched review as handled so it isn't queued again; best effort"""
+    try:
+        pipe = get_redis().pipeline()
+        pipe.zrem(PENDING_KEY, review_id)
+        pipe.hdel(PENDING_ITEMS_KEY, review_id)
+        pipe.hdel(ATTEMPTS_KEY, review_id)
+        pipe.execute()
+    except Exception as e:
+        print(f"Error acknowledging reply for review {review_id}: {e}")
+
+
+def queue_depth() -> int:
+    """Total number of reviews waiting across all locations"""
+    client = get_redis()
+    location_ids = client.zrange(LOCATIONS_KEY, 0, -1)
+    if not location_ids:
+        return 0
+    pipe = client.pipeline()
+    for location_id in location_ids:
+        pipe.zcard(f"{LOCATION_KEY_PREFIX}{location_id.decode()}")
+    return sum(pipe.execute())
@@ -0,0 +1,138 @@
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import delete, false, insert, select, text, true, union_all
+from app.core.config import settings
+
+
+def _month_start(value: datetime) -> datetime:
+    from app.models.stats import as_naive_utc
+
+    value = as_naive_utc(value)
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def ensure_archive_partitions(connection, months: Iterable[datetime]):
+    """Create the monthly reviews_archive partitions for the given months (Postgres only)"""
+    if connection.dialect.name != "postgresql":
+        return
+    tablespace = f' TABLESPACE "{settings.REVIEW_ARCHIVE_TABLESPACE}"' if settings.REVIEW_ARCHIVE_TABLESPACE else ""
+    for month in sorted({_month_start(value) for value in months}):
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS reviews_archive_{month:%Y_%m} PARTITION OF reviews_archive "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') TO ('{_next_month(month):%Y-%m-%d} 00:00:00+00')"
+            f"{tablespace}"
+        ))
+
+
+def archive_cutoff(now: Optional[datetime] = None) -> datetime:
+    return (now or datetime.utcnow()) - timedelta(days=settings.REVIEW_RETENTION_DAYS)
+
+
+def archive_reviews(cutoff: datetime, batch_size: int, max_batches: Optional[int] = None) -> dict:
+    """Move reviews created before `cutoff` into reviews_archive, one batch per transaction.
+
+    Rows are copied with INSERT ... SELECT and deleted from `reviews` in the
+    same transaction, so a review is always in exactly one of the tables.
+    Core deletes skip the ORM stats hook: archived reviews still count in
+    location_stats and the daily buckets. Returns the number of reviews
+    moved and the ids of the users they belong to.
+    """
+    from app.core.database import SessionLocal
+    from app.models import ArchivedReview, Location, Review
+
+    reviews = Review.__table__
+    archive = ArchivedReview.__table__
+    names = [column.name for column in archive.columns]
+    moved = 0
+    user_ids: Set[int] = set()
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        db = SessionLocal()
+        try:
+            connection = db.connection()
+            rows = connection.execute(
+                select(reviews.c.id, reviews.c.review_created_at, Location.user_id)
+                .join(Location, reviews.c.location_id == Location.id)
+                .where(reviews.c.review_created_at < cutoff)
+                .order_by(reviews.c.review_created_at)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            ids = [row.id for row in rows]
+            ensure_archive_partitions(connection, [row.review_created_at for row in rows])
+            connection.execute(insert(archive).from_select(
+                names, select(*[reviews.c[name] for name in names]).where(reviews.c.id.in_(ids))
+            ))
+            connection.execute(delete(reviews).where(reviews.c.id.in_(ids)))
+            db.commit()
+        finally:
+            db.close()
+        moved += len(ids)
+        user_ids.update(row.user_id for row in rows)
+        batches += 1
+    return {"archived": moved, "user_ids": user_ids}
+
+
+def archived_review_ids(db, google_review_ids: Iterable[str]) -> Set[str]:
+    """The given GBP review ids that are in the archive"""
+    from app.models import ArchivedReview
+
+    google_review_ids = list(google_review_ids)
+    if not google_review_ids:
+        return set()
+    return {
+        google_review_id
+        for (google_review_id,) in db.query(ArchivedReview.google_review_id).filter(
+            ArchivedReview.google_review_id.in_(google_review_ids)
+        )
+    }
+
+
+def review_history_source(name: str = "review_history"):
+    """Subquery over live and archived reviews with the review columns plus `archived`.
+
+    Filters applied to it are pushed into both branches of the UNION ALL, so
+    each side uses its own indexes and, on Postgres, archive partitions
+    outside a date range are pruned.
+    """
+    from app.models import ArchivedReview, Review
+
+    names = [column.name for column in ArchivedReview.__table__.columns]
+    return union_all(
+        select(*[Review.__table__.c[column] for column in names], false().label("archived")),
+        select(*[ArchivedReview.__table__.c[column] for column in names], true().label("archived"))
+    ).subquery(name)
+
+
+def review_history(
+    db,
+    user_id: int,
+    location_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List:
+    """A user's live and archived reviews, newest first, as rows with an `archived` flag"""
+    from app.models import Location
+    from app.services.export import date_bounds
+
+    history = review_history_source()
+    query = select(history).join(Location, history.c.location_id == Location.id).where(
+        Location.user_id == user_id
+    )
+    if location_id:
+        query = query.where(history.c.location_id == location_id)
+    lower, upper = date_bounds(start, end)
+    if lower:
+        query = query.where(history.c.review_created_at >= lower)
+    if upper:
+        query = query.where(history.c.review_created_at <= upper)
+    return db.execute(
+        query.order_by(history.c.review_created_at.desc(), history.c.id.desc()).offset(skip).limit(limit)
+    ).all()
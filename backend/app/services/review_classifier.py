@@ -0,0 +1,181 @@
+import os
+import re
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from app.core.config import settings
+
+N_FEATURES = 2 ** 18
+TOKEN_RE = re.compile(r"[a-z']+")
+NEGATIONS = {"not", "no", "never", "don't", "didn't", "isn't", "wasn't", "won't", "can't", "couldn't", "hardly"}
+NEGATION_SCOPE = 3
+
+# Seed weights for the linear model; training on stored reviews refines them
+LEXICON = {
+    "great": 1.0, "excellent": 1.2, "amazing": 1.2, "awesome": 1.1, "perfect": 1.1,
+    "love": 1.0, "loved": 1.0, "best": 1.0, "delicious": 1.0, "friendly": 0.8,
+    "helpful": 0.8, "recommend": 0.9, "professional": 0.7, "clean": 0.6, "good": 0.6,
+    "nice": 0.5, "fast": 0.5, "quick": 0.5, "fresh": 0.5, "welcoming": 0.7,
+    "bad": -0.8, "poor": -0.9, "terrible": -1.3, "awful": -1.3, "horrible": -1.3,
+    "worst": -1.4, "rude": -1.2, "unprofessional": -1.1, "dirty": -1.0, "disgusting": -1.3,
+    "disappointed": -1.0, "disappointing": -1.0, "overpriced": -0.9, "slow": -0.6, "cold": -0.4,
+    "broken": -0.7, "ignored": -0.9, "refund": -0.6, "sick": -1.2,
+    "waited": -0.4, "wrong": -0.6, "mess": -0.8, "scam": -1.4, "unacceptable": -1.2,
+}
+NEGATED_WEIGHT = -0.7
+
+TOPICS = {
+    "service": {"service", "served", "server", "waiter", "waitress", "customer"},
+    "staff": {"staff", "employee", "employees", "manager", "rude", "friendly", "helpful", "team"},
+    "price": {"price", "prices", "expensive", "cheap", "overpriced", "value", "cost", "refund"},
+    "cleanliness": {"clean", "dirty", "filthy", "messy", "bathroom", "restroom", "smell"},
+    "food": {"food", "meal", "delicious", "taste", "tasty", "fresh", "cold", "menu", "coffee"},
+    "wait_time": {"wait", "waited", "waiting", "slow", "quick", "fast", "line", "minutes", "hour"},
+    "parking": {"parking", "park", "parked", "lot", "garage"},
+    "location": {"location", "located", "area", "neighborhood", "find", "directions"},
+    "quality": {"quality", "broken", "defective", "fresh", "stale", "cheap"},
+}
+
+# Terms that warrant a fast human look at a negative review
+URGENT_TERMS = {
+    "sick", "poisoning", "food poisoning", "allergic", "allergy", "injured", "injury", "unsafe",
+    "dangerous", "lawyer", "lawsuit", "police", "health department", "discrimination",
+    "harassed", "harassment", "stolen", "scam", "fraud", "refund", "manager",
+}
+
+RATING_WEIGHT = 2.0
+SENTIMENT_THRESHOLD = 0.25
+
+
+def _hash(feature: str) -> int:
+    return zlib.crc32(feature.encode()) & (N_FEATURES - 1)
+
+
+def _features(words: List[str]) -> List[str]:
+    """Unigrams with negation marking, plus bigrams"""
+    features = []
+    negate = 0
+    for word in words:
+        if word in NEGATIONS:
+            negate = NEGATION_SCOPE
+            continue
+        features.append(f"NOT_{word}" if negate else word)
+        negate = max(negate - 1, 0)
+    features.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return features
+
+
+def _lexicon_weights() -> np.ndarray:
+    weights = np.zeros(N_FEATURES, dtype=np.float32)
+    for word, weight in LEXICON.items():
+        weights[_hash(word)] += weight
+        weights[_hash(f"NOT_{word}")] += NEGATED_WEIGHT * weight
+    return weights
+
+
+class ReviewClassifier:
+    """CPU-only sentiment, topic and urgency classifier for review text.
+
+    Text is scored by a linear model over hashed unigram/bigram features,
+    seeded from a sentiment lexicon, and combined with the star rating.
+    """
+
+    def __init__(self, weights: Optional[np.ndarray] = None, bias: float = 0.0):
+        self.weights = weights if weights is not None else _lexicon_weights()
+        self.bias = bias
+
+    @classmethod
+    def load(cls, path: str) -> "ReviewClassifier":
+        """Load weights saved by `save`"""
+        data = np.load(path)
+        return cls(weights=data["weights"], bias=float(data["bias"]))
+
+    def save(self, path: str):
+        """Persist weights to an .npz file"""
+        with open(path, "wb") as f:
+            np.savez_compressed(f, weights=self.weights, bias=np.float32(self.bias))
+
+    def _vectorize(self, texts: Sequence[Optional[str]]):
+        """Flatten hashed features of all texts into (indices, document ids)"""
+        tokenized = [TOKEN_RE.findall((text or "").lower()) for text in texts]
+        indices = []
+        doc_ids = []
+        for doc_id, words in enumerate(tokenized):
+            hashed = [_hash(feature) for feature in _features(words)]
+            indices.extend(hashed)
+            doc_ids.extend([doc_id] * len(hashed))
+        return tokenized, np.array(indices, dtype=np.int64), np.array(doc_ids, dtype=np.int64)
+
+    def _text_scores(self, indices: np.ndarray, doc_ids: np.ndarray, n_docs: int) -> np.ndarray:
+        return np.bincount(doc_ids, weights=self.weights[indices], minlength=n_docs) + self.bias
+
+    def classify(self, texts: Sequence[Optional[str]], ratings: Optional[Sequence[float]] = None) -> List[Dict]:
+        """Classify a batch of reviews"""
+        n_docs = len(texts)
+        if n_docs == 0:
+            return []
+
+        tokenized, indices, doc_ids = self._vectorize(texts)
+        scores = self._text_scores(indices, doc_ids, n_docs)
+        if ratings is not None:
+            stars = np.array([rating or 3 for rating in ratings], dtype=np.float64)
+            scores = scores + RATING_WEIGHT * (stars - 3) / 2
+        # tanh(z / 2) == 2 * sigmoid(z) - 1, matching the logistic loss used by `fit`
+        sentiment_scores = np.tanh(scores / 2)
+
+        results = []
+        for i, words in enumerate(tokenized):
+            score = float(sentiment_scores[i])
+            if score >= SENTIMENT_THRESHOLD:
+                sentiment = "positive"
+            elif score <= -SENTIMENT_THRESHOLD:
+                sentiment = "negative"
+            else:
+                sentiment = "neutral"
+
+            terms = set(words)
+            terms.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+            topics = [topic for topic, keywords in TOPICS.items() if keywords & terms]
+
+            if sentiment == "negative" and (terms & URGENT_TERMS or (ratings is not None and (ratings[i] or 3) <= 1 and words)):
+                urgency = "high"
+            elif sentiment == "negative":
+                urgency = "medium"
+            else:
+                urgency = "low"
+
+            results.append({
+                "sentiment": sentiment,
+                "sentiment_score": round(score, 4),
+                "topics": topics,
+                "urgency": urgency
+            })
+        return results
+
+    def fit(self, texts: Sequence[str], labels: Sequence[int], epochs: int = 20, learning_rate: float = 0.5, l2: float = 1e-4):
+        """Refine the text weights by logistic regression (labels: 1 positive, 0 negative)"""
+        n_docs = len(texts)
+        if n_docs == 0:
+            return self
+
+        _, indices, doc_ids = self._vectorize(texts)
+        y = np.asarray(labels, dtype=np.float64)
+        weights = self.weights.astype(np.float64)
+        for _ in range(epochs):
+            z = np.bincount(doc_ids, weights=weights[indices], minlength=n_docs) + self.bias
+            error = 1 / (1 + np.exp(-z)) - y
+            gradient = np.bincount(indices, weights=error[doc_ids], minlength=N_FEATURES) / n_docs
+            weights -= learning_rate * (gradient + l2 * weights)
+            self.bias -= learning_rate * float(error.mean())
+        self.weights = weights.astype(np.float32)
+        return self
+
+
+@lru_cache
+def get_review_classifier() -> ReviewClassifier:
+    """Shared classifier, using trained weights when REVIEW_CLASSIFIER_MODEL_PATH exists"""
+    path = settings.REVIEW_CLASSIFIER_MODEL_PATH
+    if path and os.path.exists(path):
+        return ReviewClassifier.load(path)
+    return ReviewClassifier()
@@ -0,0 +1,113 @@
+import base64
+import json
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import Float, and_, bindparam, cast, column, func, literal_column, or_, table, text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+FTS_TABLE = "reviews_fts"
+PHRASE_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+WORD_RE = re.compile(r"\w+")
+
+
+def search_vector_sql(language: str, table_name: Optional[str] = "reviews") -> str:
+    """The tsvector reviews are matched on; migration 0004 indexes exactly this expression"""
+    prefix = f"{table_name}." if table_name else ""
+    return (
+        f"to_tsvector('{language}'::regconfig, "
+        f"coalesce({prefix}comment, '') || ' ' || coalesce({prefix}reply_text, ''))"
+    )
+
+
+def fts5_query(q: str) -> str:
+    """Translate web-search style input (words, "phrases", or, -exclusions) to an FTS5 query"""
+    positive, negative = [], []
+    for match in PHRASE_RE.finditer(q):
+        excluded, phrase, word = match.groups()
+        if word is not None and word.lower() == "or":
+            if positive and positive[-1] != "OR":
+                positive.append("OR")
+            continue
+        if word is not None and word.startswith("-"):
+            excluded, word = "-", word[1:]
+        tokens = WORD_RE.findall((phrase if phrase is not None else word).lower())
+        if not tokens:
+            continue
+        term = '"' + " ".join(tokens) + '"'
+        (negative if excluded else positive).append(term)
+
+    while positive and positive[-1] == "OR":
+        positive.pop()
+    if not positive:
+        return ""
+    query = " ".join(positive)
+    for term in negative:
+        query = f"({query}) NOT {term}"
+    return query
+
+
+def encode_cursor(rank: float, review_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([rank, review_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Inverse of `encode_cursor`; raises ValueError on malformed cursors"""
+    try:
+        rank, review_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), int(review_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def search_reviews(
+    db: Session,
+    user_id: int,
+    q: str,
+    location_id: Optional[int] = None,
+    min_rating: Optional[float] = None,
+    max_rating: Optional[float] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> Tuple[List[Tuple[object, float]], Optional[str]]:
+    """Rank a user's reviews against a text query, best match first.
+
+    Returns (review, rank) pairs and the cursor for the next page, or None
+    on the last page. Pages are keyed on (rank, id), so they stay stable
+    while new reviews arrive.
+    """
+    from app.models import Location, Review
+
+    after = decode_cursor(cursor) if cursor else None
+
+    if db.get_bind().dialect.name == "postgresql":
+        ts_query = func.websearch_to_tsquery(settings.REVIEW_SEARCH_LANGUAGE, q)
+        search_vector = literal_column(search_vector_sql(settings.REVIEW_SEARCH_LANGUAGE))
+        # ts_rank_cd is a float4; as float8 it round-trips exactly through the cursor
+        rank = cast(func.ts_rank_cd(search_vector, ts_query), Float(53))
+        query = db.query(Review, rank.label("rank")).filter(search_vector.op("@@")(ts_query))
+    else:
+        match = fts5_query(q)
+        if not match:
+            return [], None
+        fts = table(FTS_TABLE, column("rowid"))
+        # bm25 is lower for better matches; negate so both backends sort descending
+        rank = -func.bm25(literal_column(FTS_TABLE))
+        query = db.query(Review, rank.label("rank")).join(fts, fts.c.rowid == Review.id).filter(
+            text(f"{FTS_TABLE} MATCH :match").bindparams(bindparam("match", match))
+        )
+
+    query = query.join(Location, Review.location_id == Location.id).filter(Location.user_id == user_id)
+    if location_id:
+        query = query.filter(Review.location_id == location_id)
+    if min_rating is not None:
+        query = query.filter(Review.rating >= min_rating)
+    if max_rating is not None:
+        query = query.filter(Review.rating <= max_rating)
+    if after:
+        query = query.filter(or_(rank < after[0], and_(rank == after[0], Review.id < after[1])))
+
+    rows = query.order_by(rank.desc(), Review.id.desc()).limit(limit + 1).all()
+    hits = [(review, float(score)) for review, score in rows[:limit]]
+    next_cursor = encode_cursor(hits[-1][1], hits[-1][0].id) if len(rows) > limit else None
+    return hits, next_cursor
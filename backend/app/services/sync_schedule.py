@@ -0,0 +1,126 @@
+import math
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import func, insert, or_, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+# How far back a location's first rate estimate looks
+BOOTSTRAP_DAYS = 30
+
+
+def sync_interval(rate_per_day: float, rng=random) -> float:
+    """Seconds until a location's next sync, for REVIEW_SYNC_TARGET_REVIEWS new reviews at `rate_per_day`.
+    
+    Clamped to REVIEW_SYNC_MIN_INTERVAL_SECONDS..REVIEW_RECONCILE_INTERVAL_SECONDS
+    and jittered by ±REVIEW_SYNC_JITTER, so locations synced together drift
+    apart instead of coming due in the same scheduler run every time.
+    """
+    if rate_per_day > 0:
+        interval = settings.REVIEW_SYNC_TARGET_REVIEWS / rate_per_day * 86400
+    else:
+        interval = settings.REVIEW_RECONCILE_INTERVAL_SECONDS
+    interval = min(max(interval, settings.REVIEW_SYNC_MIN_INTERVAL_SECONDS), settings.REVIEW_RECONCILE_INTERVAL_SECONDS)
+    return interval * rng.uniform(1 - settings.REVIEW_SYNC_JITTER, 1 + settings.REVIEW_SYNC_JITTER)
+
+
+def updated_rate(rate_per_day: float, arrivals: int, elapsed_days: float) -> float:
+    """EWMA of reviews per day, weighting the new observation by the time it covers"""
+    alpha = 1 - math.exp(-math.log(2) * elapsed_days / settings.REVIEW_SYNC_RATE_HALF_LIFE_DAYS)
+    return rate_per_day + alpha * (arrivals / elapsed_days - rate_per_day)
+
+
+def reviews_updated_since(db: Session, location_id: int, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Cutoff for fetching only the reviews changed since the location's last sync, or None for a full walk.
+    
+    Every REVIEW_RECONCILE_INTERVAL_SECONDS (and on the first sync) all
+    reviews are fetched, to pick up changes the newest-first listing misses,
+    such as replies posted outside the app.
+    """
+    from app.models import LocationSyncSchedule
+    from app.models.stats import as_naive_utc
+    
+    now = now or datetime.utcnow()
+    schedule = db.query(LocationSyncSchedule).filter(LocationSyncSchedule.location_id == location_id).first()
+    if schedule is None or schedule.last_synced_at is None or schedule.last_reconciled_at is None:
+        return None
+    if now - as_naive_utc(schedule.last_reconciled_at) >= timedelta(seconds=settings.REVIEW_RECONCILE_INTERVAL_SECONDS):
+        return None
+    return as_naive_utc(schedule.last_synced_at)
+
+
+def record_sync(db: Session, location_id: int, now: Optional[datetime] = None, reconciled: bool = False):
+    """Fold the reviews written since a location's last sync into its rate and schedule the next sync.
+    
+    Arrivals are counted on review_created_at (ix_reviews_location_created),
+    so reviews ingested from push notifications count too. The first sync
+    estimates the rate from the last BOOTSTRAP_DAYS. `now` is when the sync
+    started fetching, the cutoff of the next incremental fetch; `reconciled`
+    marks a sync that fetched every review. The caller commits.
+    """
+    from app.models import LocationSyncSchedule, Review
+    from app.models.stats import as_naive_utc
+    
+    now = now or datetime.utcnow()
+    schedule = db.query(LocationSyncSchedule).filter(LocationSyncSchedule.location_id == location_id).first()
+    if schedule is None:
+        schedule = LocationSyncSchedule(location_id=location_id, review_rate_per_day=0.0)
+        db.add(schedule)
+    
+    since = as_naive_utc(schedule.last_synced_at) if schedule.last_synced_at else now - timedelta(days=BOOTSTRAP_DAYS)
+    arrivals = db.query(func.count(Review.id)).filter(
+        Review.location_id == location_id,
+        Review.review_created_at > since,
+        Review.review_created_at <= now
+    ).scalar()
+    if schedule.last_synced_at is None:
+        rate = arrivals / BOOTSTRAP_DAYS
+    else:
+        elapsed_days = max((now - since).total_seconds(), 1.0) / 86400
+        rate = updated_rate(schedule.review_rate_per_day or 0.0, arrivals, elapsed_days)
+    
+    schedule.review_rate_per_day = rate
+    schedule.last_synced_at = now
+    if reconciled:
+        schedule.last_reconciled_at = now
+    schedule.next_sync_at = now + timedelta(seconds=sync_interval(rate))
+    return schedule
+
+
+def claim_due_locations(db: Session, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[int]:
+    """Ids of auto-reply locations whose next sync is due, oldest first; unscheduled ones lead.
+    
+    At most REVIEW_SYNC_MAX_LOCATIONS_PER_RUN are claimed, so a backlog
+    (say, right after deploying) drains over several runs instead of at
+    once. Claimed locations are pushed REVIEW_SYNC_MIN_INTERVAL_SECONDS out
+    until `record_sync` reschedules them, so a queued or failed sync is not
+    claimed again on every run. The caller commits.
+    """
+    from app.models import Location, LocationSyncSchedule
+    
+    now = now or datetime.utcnow()
+    rows = db.query(Location.id, LocationSyncSchedule.location_id).outerjoin(
+        LocationSyncSchedule, LocationSyncSchedule.location_id == Location.id
+    ).filter(
+        Location.auto_reply_enabled == True,
+        or_(LocationSyncSchedule.location_id.is_(None), LocationSyncSchedule.next_sync_at <= now)
+    ).order_by(LocationSyncSchedule.next_sync_at.asc().nulls_first(), Location.id).limit(
+        limit or settings.REVIEW_SYNC_MAX_LOCATIONS_PER_RUN
+    ).all()
+    
+    lease = now + timedelta(seconds=settings.REVIEW_SYNC_MIN_INTERVAL_SECONDS)
+    scheduled = [location_id for location_id, schedule_id in rows if schedule_id is not None]
+    unscheduled = [location_id for location_id, schedule_id in rows if schedule_id is None]
+    if scheduled:
+        db.execute(
+            update(LocationSyncSchedule)
+            .where(LocationSyncSchedule.location_id.in_(scheduled))
+            .values(next_sync_at=lease)
+        )
+    if unscheduled:
+        db.execute(insert(LocationSyncSchedule), [
+            {"location_id": location_id, "review_rate_per_day": 0.0, "next_sync_at": lease}
+            for location_id in unscheduled
+        ])
+    return [location_id for location_id, _ in rows]
@@ -1,13 +1,25 @@
 from .celery_app import celery_app
-from .post_tasks import publish_scheduled_posts, publish_post, generate_ai_post
-from .review_tasks import sync_reviews, sync_location_reviews, generate_and_reply_to_review
+from .post_tasks import publish_scheduled_posts, publish_post, generate_ai_post, generate_post_campaign
+from .review_tasks import sync_reviews, sync_location_reviews, generate_and_reply_to_review, train_review_classifier, dispatch_review_replies, sign_stored_reviews, ingest_review_notification, queue_review_replies
+from .stats_tasks import rebuild_location_stats
+from .location_tasks import sync_user_locations
+from .outbox_tasks import relay_task_outbox
 
 __all__ = [
     "celery_app",
     "publish_scheduled_posts",
     "publish_post",
     "generate_ai_post",
+    "generate_post_campaign",
     "sync_reviews",
     "sync_location_reviews",
-    "generate_and_reply_to_review"
+    "generate_and_reply_to_review",
+    "train_review_classifier",
+    "dispatch_review_replies",
+    "sign_stored_reviews",
+    "ingest_review_notification",
+    "queue_review_replies",
+    "rebuild_location_stats",
+    "sync_user_locations",
+    "relay_task_outbox"
 ]
@@ -1,11 +1,15 @@
 from celery import Celery
+from celery.signals import task_postrun, task_prerun, worker_process_init
 from app.core.config import settings
+from app.core.metrics import instrument_celery
+from app.core.task_events import on_task_postrun, on_task_prerun
+from app.core.tracing import configure_tracing
 
 celery_app = Celery(
     "gmb_automation",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=['app.tasks.post_tasks', 'app.tasks.review_tasks']
+    include=['app.tasks.post_tasks', 'app.tasks.review_tasks', 'app.tasks.stats_tasks', 'app.tasks.location_tasks', 'app.tasks.outbox_tasks']
 )
 
 celery_app.conf.update(
@@ -14,4 +18,35 @@ celery_app.conf.update(
     result_serializer='json',
     timezone='UTC',
     enable_utc=True,
+    beat_schedule={
+        'dispatch-review-replies': {
+            'task': 'app.tasks.review_tasks.dispatch_review_replies',
+            'schedule': settings.REPLY_DISPATCH_INTERVAL_SECONDS,
+        },
+        # Push notifications deliver new reviews; polling syncs each location when its schedule is due
+        'reconcile-reviews': {
+            'task': 'app.tasks.review_tasks.sync_reviews',
+            'schedule': settings.REVIEW_SYNC_SCHEDULER_INTERVAL_SECONDS,
+        },
+        'archive-reviews': {
+            'task': 'app.tasks.review_tasks.archive_old_reviews',
+            'schedule': settings.REVIEW_ARCHIVE_INTERVAL_SECONDS,
+        },
+        'relay-task-outbox': {
+            'task': 'app.tasks.outbox_tasks.relay_task_outbox',
+            'schedule': settings.OUTBOX_RELAY_INTERVAL_SECONDS,
+        },
+    },
 )
+
+instrument_celery(settings.CELERY_METRICS_PORT)
+
+# Push lifecycle events of user-initiated tasks to the user's live event stream
+task_prerun.connect(on_task_prerun, weak=False)
+task_postrun.connect(on_task_postrun, weak=False)
+
+
+@worker_process_init.connect
+def init_worker_tracing(**kwargs):
+    """Set up tracing in each worker process (span exporters don't survive fork)"""
+    configure_tracing("gmb-worker")
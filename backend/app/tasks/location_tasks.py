@@ -0,0 +1,190 @@
+from .celery_app import celery_app
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.http_cache import invalidate_responses
+from app.core.task_events import report_progress
+from app.models import Location, LocationStats, User
+from app.models.stats import upsert_insert
+from app.services import GoogleBusinessService
+from app.services.content_hash import content_hash
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy import insert
+from typing import Dict, List, Optional
+import threading
+import time
+
+# Fields refreshed from Google on every sync
+SYNCED_FIELDS = ("name", "address", "phone", "website", "category")
+
+_thread_state = threading.local()
+
+
+def location_fields(g_location: Dict, account_name: Optional[str] = None) -> Dict:
+    """Map a GBP location resource, listed under account `account_name`, to Location columns"""
+    address = g_location.get('storefrontAddress', {})
+    address_parts = list(address.get('addressLines', [])) + [
+        address.get('locality', ''),
+        " ".join(part for part in (address.get('administrativeArea', ''), address.get('postalCode', '')) if part)
+    ]
+    fields = {
+        "google_location_id": g_location.get('name', ''),
+        "google_account_id": account_name,
+        "name": g_location.get('title', ''),
+        "address": ", ".join(part for part in address_parts if part),
+        "phone": g_location.get('phoneNumbers', {}).get('primaryPhone', ''),
+        "website": g_location.get('websiteUri', ''),
+        "category": g_location.get('categories', {}).get('primaryCategory', {}).get('displayName', '')
+    }
+    fields["content_hash"] = content_hash({field: fields[field] for field in SYNCED_FIELDS})
+    return fields
+
+
+def _diff_locations(db, user_id: int, rows: Dict[str, Dict], counts: Dict[str, int]):
+    """Split `rows` into new location rows and update mappings, counting the rest"""
+    existing = {
+        location.google_location_id: location
+        for location in db.query(
+            Location.id, Location.user_id, Location.google_location_id, Location.google_account_id, Location.content_hash
+        ).filter(Location.google_location_id.in_(list(rows)))
+    }
+    
+    new_rows = []
+    changed = []
+    for google_location_id, fields in rows.items():
+        location = existing.get(google_location_id)
+        if location is None:
+            new_rows.append({"user_id": user_id, **fields})
+        elif location.user_id != user_id:
+            # Connected to another user of the app; leave it alone
+            counts["skipped"] += 1
+        elif location.content_hash == fields["content_hash"] and location.google_account_id == fields["google_account_id"]:
+            counts["unchanged"] += 1
+        else:
+            changed.append({
+                "id": location.id,
+                **{field: fields[field] for field in SYNCED_FIELDS + ("content_hash", "google_account_id")}
+            })
+    return new_rows, changed
+
+
+def _insert_locations(db, new_rows: List[Dict]) -> Dict[str, int]:
+    """Insert `new_rows`, skipping ones another transaction inserted first; returns the new ids by google_location_id"""
+    table = Location.__table__
+    dialect_insert = upsert_insert(db.connection())
+    if dialect_insert is None:
+        statement = insert(table)
+    else:
+        statement = dialect_insert(table).on_conflict_do_nothing(index_elements=["google_location_id"])
+    inserted = dict(
+        db.execute(statement.returning(table.c.google_location_id, table.c.id), new_rows).all()
+    )
+    if inserted:
+        # Core inserts bypass the stats hook, so create the rollup rows here
+        db.execute(insert(LocationStats.__table__), [{"location_id": location_id} for location_id in inserted.values()])
+    return inserted
+
+
+def upsert_locations(user_id: int, g_locations: List[Dict], account_name: Optional[str] = None) -> Dict[str, int]:
+    """Insert new locations and update ones whose upstream fields or account changed, in bulk and in one transaction"""
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+    rows = {}
+    for g_location in g_locations:
+        fields = location_fields(g_location, account_name)
+        if fields["google_location_id"]:
+            rows[fields["google_location_id"]] = fields
+    if not rows:
+        return counts
+    
+    db = SessionLocal()
+    try:
+        new_rows, changed = _diff_locations(db, user_id, rows, counts)
+        inserted = _insert_locations(db, new_rows) if new_rows else {}
+        # Rows a concurrent sync of the same account inserted first are compared against its version
+        raced = {
+            row["google_location_id"]: rows[row["google_location_id"]]
+            for row in new_rows if row["google_location_id"] not in inserted
+        }
+        if raced:
+            changed.extend(_diff_locations(db, user_id, raced, counts)[1])
+        if changed:
+            db.bulk_update_mappings(Location, changed)
+        db.commit()
+        if inserted or changed:
+            invalidate_responses(user_id, "locations")
+        
+        counts["created"] = len(inserted)
+        counts["updated"] = len(changed)
+        return counts
+    finally:
+        db.close()
+
+
+def _init_thread_service(access_token: str, refresh_token: str):
+    # googleapiclient services are not thread-safe, so each pool thread builds its own
+    _thread_state.gb_service = GoogleBusinessService(access_token=access_token, refresh_token=refresh_token)
+
+
+def _fetch_account_locations(account_id: str) -> List[Dict]:
+    locations = []
+    for page in _thread_state.gb_service.iter_location_pages(account_id):
+        locations.extend(page)
+    return locations
+
+
+@celery_app.task(bind=True)
+def sync_user_locations(self, user_id: int):
+    """Import and refresh all GBP locations of a user, fetching accounts in parallel"""
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user or not user.google_access_token:
+            return f"User credentials not found for user {user_id}"
+        access_token, refresh_token = user.google_access_token, user.google_refresh_token
+    finally:
+        db.close()
+    
+    gb_service = GoogleBusinessService(access_token=access_token, refresh_token=refresh_token)
+    accounts = gb_service.get_accounts()
+    account_ids = [account.get('name', '').split('/')[-1] for account in accounts]
+    
+    progress = {
+        "accounts_total": len(account_ids),
+        "accounts_done": 0,
+        "accounts_failed": 0,
+        "locations_seen": 0,
+        "created": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "skipped": 0
+    }
+    report_progress(self, progress)
+    last_report = time.monotonic()
+    
+    with ThreadPoolExecutor(
+        max_workers=settings.LOCATION_SYNC_CONCURRENCY,
+        initializer=_init_thread_service,
+        initargs=(access_token, refresh_token)
+    ) as executor:
+        futures = {executor.submit(_fetch_account_locations, account_id): account_id for account_id in account_ids}
+        for future in as_completed(futures):
+            try:
+                g_locations = future.result()
+            except Exception as e:
+                print(f"Error getting locations for account {futures[future]}: {e}")
+                progress["accounts_failed"] += 1
+                continue
+            
+            for key, value in upsert_locations(user_id, g_locations, f"accounts/{futures[future]}").items():
+                progress[key] += value
+            progress["locations_seen"] += len(g_locations)
+            progress["accounts_done"] += 1
+            
+            now = time.monotonic()
+            if now - last_report >= 1.0:
+                report_progress(self, progress)
+                last_report = now
+    
+    return (
+        f"Synced {progress['locations_seen']} locations from {progress['accounts_done']} accounts: "
+        f"{progress['created']} new, {progress['updated']} updated, {progress['unchanged']} unchanged"
+    )
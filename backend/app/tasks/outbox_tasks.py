@@ -0,0 +1,9 @@
+from .celery_app import celery_app
+from app.services.outbox import relay_outbox
+
+
+@celery_app.task
+def relay_task_outbox():
+    """Publish outbox rows the relay after each commit left behind (broker outage, crashed process)"""
+    relayed = relay_outbox()
+    return f"Relayed {relayed} outbox tasks"
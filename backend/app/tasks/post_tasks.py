@@ -1,9 +1,22 @@
 from .celery_app import celery_app
+from app.core.config import settings
 from app.core.database import SessionLocal
-from app.models import Post, Location, User
+from app.core.http_cache import invalidate_responses
+from app.core.task_events import report_progress
+from app.models import Post, Location, TaskOutbox, User
 from app.models.post import PostStatus
 from app.services import GoogleBusinessService, AIResponseService
-from datetime import datetime
+from app.services.google_business import v4_location_name
+from app.services.post_cache import cached_post_content, store_generated_post, take_cached_post
+from app.services.outbox import enqueue_many
+from app.services.post_import import insert_posts
+from app.services.prompts import get_template, message_tokens
+from app.services.rate_budget import RateBudget
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import or_, update
+from typing import List, Optional
+import time as time_module
 
 
 @celery_app.task
@@ -12,27 +25,46 @@ def publish_scheduled_posts():
     db = SessionLocal()
     try:
         now = datetime.utcnow()
-        scheduled_posts = db.query(Post).filter(
-            Post.status == PostStatus.SCHEDULED,
-            Post.scheduled_at <= now
-        ).all()
-        
-        for post in scheduled_posts:
-            publish_post.delay(post.id)
+        # Posts whose publish task is still waiting in the outbox, or being run
+        # (claims of runs that died have expired and are picked up again)
+        queued = {
+            args[0] for (args,) in db.query(TaskOutbox.args).filter(TaskOutbox.task_name == publish_post.name)
+            if args
+        }
+        post_ids = [
+            (post_id,) for (post_id,) in db.query(Post.id).filter(
+                Post.status == PostStatus.SCHEDULED,
+                Post.scheduled_at <= now,
+                or_(Post.claimed_until.is_(None), Post.claimed_until < time_module.time())
+            )
+            if post_id not in queued
+        ]
         
-        return f"Queued {len(scheduled_posts)} posts for publishing"
+        enqueue_many(db, publish_post, post_ids)
+        db.commit()
+        return f"Queued {len(post_ids)} posts for publishing"
     finally:
         db.close()
 
 
 @celery_app.task
 def publish_post(post_id: int):
-    """Publish a single post to Google Business Profile"""
+    """Publish a single post to Google Business Profile.
+    
+    The post is claimed for POST_PUBLISH_CLAIM_SECONDS with a conditional
+    UPDATE before Google is called, so a task delivered twice, or queued
+    again while the first run is in flight, publishes it once. It only
+    becomes PUBLISHED once Google accepted it; if the run dies in between,
+    the claim runs out and the scheduler queues the post again.
+    """
     db = SessionLocal()
+    post = None
     try:
         post = db.query(Post).filter(Post.id == post_id).first()
         if not post:
             return f"Post {post_id} not found"
+        if post.status == PostStatus.PUBLISHED:
+            return f"Post {post_id} already published"
         
         location = db.query(Location).filter(Location.id == post.location_id).first()
         if not location:
@@ -42,8 +74,16 @@ def publish_post(post_id: int):
         if not user or not user.google_access_token:
             post.status = PostStatus.FAILED
             db.commit()
+            invalidate_responses(location.user_id, "posts")
             return f"User credentials not found for post {post_id}"
         
+        location_name = v4_location_name(location.google_account_id, location.google_location_id)
+        if not location_name:
+            post.status = PostStatus.FAILED
+            db.commit()
+            invalidate_responses(location.user_id, "posts")
+            return f"Google account of location {location.id} unknown for post {post_id}, sync locations first"
+        
         # Initialize Google Business service
         gb_service = GoogleBusinessService(
             access_token=user.google_access_token,
@@ -59,29 +99,58 @@ def publish_post(post_id: int):
         if post.media_url:
             post_data["media"] = [{"mediaFormat": "PHOTO", "sourceUrl": post.media_url}]
         
+        if not claim_post(db, post):
+            return f"Post {post_id} is already being published"
+        
         # Publish to Google
-        result = gb_service.create_post(location.google_location_id, post_data)
+        result = gb_service.create_post(location_name, post_data)
         
         if result:
             post.status = PostStatus.PUBLISHED
             post.published_at = datetime.utcnow()
             post.google_post_id = result.get('name', '')
+            post.claimed_until = None
             db.commit()
+            invalidate_responses(location.user_id, "posts")
             return f"Post {post_id} published successfully"
         else:
             post.status = PostStatus.FAILED
+            post.claimed_until = None
             db.commit()
+            invalidate_responses(location.user_id, "posts")
             return f"Failed to publish post {post_id}"
             
     except Exception as e:
         if post:
+            db.rollback()
+            db.refresh(post)
             post.status = PostStatus.FAILED
+            post.claimed_until = None
             db.commit()
         return f"Error publishing post {post_id}: {str(e)}"
     finally:
         db.close()
 
 
+def claim_post(db, post: Post) -> bool:
+    """Claim `post` for one publish run and commit; False if it changed or another run holds a live claim"""
+    now = time_module.time()
+    claimed = db.execute(
+        update(Post)
+        .where(
+            Post.id == post.id,
+            Post.status == post.status,
+            or_(Post.claimed_until.is_(None), Post.claimed_until < now)
+        )
+        .values(claimed_until=now + settings.POST_PUBLISH_CLAIM_SECONDS)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    # Loaded again so the rollup hook sees the status the post leaves
+    db.refresh(post)
+    return bool(claimed)
+
+
 @celery_app.task
 def generate_ai_post(location_id: int, topic: str = None, post_type: str = "UPDATE"):
     """Generate a post using AI"""
@@ -92,12 +161,7 @@ def generate_ai_post(location_id: int, topic: str = None, post_type: str = "UPDA
             return f"Location {location_id} not found"
         
         ai_service = AIResponseService()
-        content = ai_service.generate_post_content(
-            business_name=location.name,
-            business_category=location.category or "business",
-            topic=topic,
-            post_type=post_type
-        )
+        content = cached_post_content(ai_service, location, topic=topic, post_type=post_type)
         
         if content:
             new_post = Post(
@@ -109,6 +173,7 @@ def generate_ai_post(location_id: int, topic: str = None, post_type: str = "UPDA
             )
             db.add(new_post)
             db.commit()
+            invalidate_responses(location.user_id, "posts")
             return f"AI post generated for location {location_id}"
         else:
             return f"Failed to generate AI post for location {location_id}"
@@ -117,3 +182,130 @@ def generate_ai_post(location_id: int, topic: str = None, post_type: str = "UPDA
         return f"Error generating AI post: {str(e)}"
     finally:
         db.close()
+
+
+def campaign_schedule(start_date: date, end_date: date, cadence_days: int, post_time: time) -> List[datetime]:
+    """Publish times from start_date to end_date (inclusive), every cadence_days"""
+    slots = []
+    day = start_date
+    while day <= end_date:
+        slots.append(datetime.combine(day, post_time))
+        day += timedelta(days=cadence_days)
+    return slots
+
+
+def campaign_topic(topics: List[str], slot_index: int, location_index: int) -> Optional[str]:
+    """Rotate topics over time, offset per location so neighbours post about different things"""
+    if not topics:
+        return None
+    return topics[(slot_index + location_index) % len(topics)]
+
+
+@celery_app.task(bind=True)
+def generate_post_campaign(
+    self,
+    location_ids: List[int],
+    start_date: str,
+    end_date: str,
+    cadence_days: int = 7,
+    post_time: str = "10:00",
+    topics: List[str] = None,
+    post_type: str = "UPDATE",
+    status: str = "DRAFT"
+):
+    """Generate a calendar of AI posts for many locations, reporting progress as it goes"""
+    topics = topics or []
+    slots = campaign_schedule(
+        date.fromisoformat(start_date),
+        date.fromisoformat(end_date),
+        cadence_days,
+        time.fromisoformat(post_time)
+    )
+    
+    db = SessionLocal()
+    try:
+        locations = db.query(
+            Location.id, Location.user_id, Location.name, Location.category, Location.address
+        ).filter(
+            Location.id.in_(location_ids)
+        ).order_by(Location.id).all()
+    finally:
+        db.close()
+    
+    user_ids = {location.user_id for location in locations}
+    jobs = [
+        (location, scheduled_at, campaign_topic(topics, slot_index, location_index))
+        for location_index, location in enumerate(locations)
+        for slot_index, scheduled_at in enumerate(slots)
+    ]
+    
+    template = get_template("post")
+    budget = RateBudget(settings.OPENAI_REQUESTS_PER_MINUTE, settings.OPENAI_TOKENS_PER_MINUTE)
+    ai_service = AIResponseService()
+    
+    def generate(location, topic):
+        cached = take_cached_post(location, post_type, topic)
+        if cached:
+            return cached
+        fields = {
+            "post_type": post_type,
+            "business_name": location.name,
+            "business_category": location.category or "business",
+            "topic": topic or "none given"
+        }
+        budget.acquire(message_tokens(template.request(**fields)["messages"]) + template.max_tokens)
+        content = ai_service.generate_post_content(
+            business_name=location.name,
+            business_category=location.category or "business",
+            topic=topic,
+            post_type=post_type
+        )
+        store_generated_post(location, post_type, topic, content)
+        return content
+    
+    progress = {"total": len(jobs), "generated": 0, "failed": 0, "inserted": 0}
+    pending_rows = []
+    last_report = 0.0
+    
+    with ThreadPoolExecutor(max_workers=settings.CAMPAIGN_CONCURRENCY) as executor:
+        futures = {
+            executor.submit(generate, location, topic): (location, scheduled_at, topic)
+            for location, scheduled_at, topic in jobs
+        }
+        for future in as_completed(futures):
+            location, scheduled_at, topic = futures[future]
+            try:
+                content = future.result()
+            except Exception as e:
+                # One slot's Redis or OpenAI error doesn't stop the rest of the campaign
+                print(f"Error generating campaign post for location {location.id}: {e}")
+                content = None
+            if content:
+                progress["generated"] += 1
+                pending_rows.append({
+                    "location_id": location.id,
+                    "title": topic,
+                    "content": content,
+                    "post_type": post_type,
+                    "status": status,
+                    "scheduled_at": scheduled_at,
+                    "ai_generated": True
+                })
+            else:
+                progress["failed"] += 1
+            
+            if len(pending_rows) >= settings.CAMPAIGN_INSERT_BATCH_SIZE:
+                insert_posts(pending_rows, user_ids)
+                progress["inserted"] += len(pending_rows)
+                pending_rows = []
+            
+            now = time_module.monotonic()
+            if now - last_report >= 1.0:
+                report_progress(self, progress)
+                last_report = now
+    
+    insert_posts(pending_rows, user_ids)
+    progress["inserted"] += len(pending_rows)
+    report_progress(self, progress)
+    
+    return f"Campaign created {progress['inserted']} posts for {len(locations)} locations ({progress['failed']} failed)"
@@ -1,21 +1,179 @@
 from .celery_app import celery_app
 from app.core.database import SessionLocal
+from app.core.db_routing import read_session
 from app.models import Review, Location, User
 from app.services import GoogleBusinessService, AIResponseService
+from app.services.google_business import v4_location_name
+from app.services.review_classifier import get_review_classifier
+from app.services.reply_queue import (
+    ack_review_reply, enqueue_review_reply, pop_reply_batch, queue_depth, requeue_expired_replies, requeue_review_reply
+)
+from app.services.content_hash import content_hash
+from app.services.dedup import find_duplicates, reset_account_index
+from app.services.outbox import enqueue_after_commit, enqueue_many
+from app.services.review_archive import archive_cutoff, archive_reviews, archived_review_ids
+from app.services.sync_schedule import claim_due_locations, record_sync, reviews_updated_since
+from app.core.config import settings
+from app.core.http_cache import invalidate_responses
+from app.core.metrics import REVIEW_TIME_TO_REPLY, REPLY_QUEUE_DEPTH
+from app.models.stats import as_naive_utc
 from datetime import datetime
+from sqlalchemy import and_, or_
+from typing import Dict, List
+
+# GBP returns star ratings as enum names
+STAR_RATINGS = {"ONE": 1, "TWO": 2, "THREE": 3, "FOUR": 4, "FIVE": 5}
+
+
+def parse_star_rating(value) -> float:
+    """Convert a GBP starRating (enum name or number) to a number"""
+    if isinstance(value, str):
+        return float(STAR_RATINGS.get(value.upper(), 0))
+    return float(value or 0)
+
+
+def review_fields(g_review: dict) -> dict:
+    """Map a GBP review resource to Review columns, with a hash of the upstream content"""
+    reviewer = g_review.get('reviewer', {})
+    reply = g_review.get('reviewReply') or {}
+    fields = {
+        "google_review_id": g_review.get('reviewId'),
+        "reviewer_name": reviewer.get('displayName', 'Anonymous'),
+        "reviewer_profile_photo": reviewer.get('profilePhotoUrl'),
+        "rating": parse_star_rating(g_review.get('starRating')),
+        "comment": g_review.get('comment'),
+        "review_created_at": datetime.fromisoformat(g_review.get('createTime', datetime.utcnow().isoformat())),
+        "reply_text": reply.get('comment'),
+        "reply_at": datetime.fromisoformat(reply['updateTime']) if reply.get('updateTime') else None
+    }
+    fields["content_hash"] = content_hash({
+        "reviewer": reviewer,
+        "starRating": g_review.get('starRating'),
+        "comment": g_review.get('comment'),
+        "createTime": g_review.get('createTime'),
+        "reviewReply": reply
+    })
+    return fields
+
+
+def upsert_location_reviews(db, location: Location, user: User, google_reviews: List[dict]) -> Dict[str, int]:
+    """Insert new reviews, update reviews whose upstream content changed and queue auto-replies"""
+    # Load the stored copies of all fetched reviews in one query
+    review_ids = [g_review.get('reviewId') for g_review in google_reviews if g_review.get('reviewId')]
+    existing = {
+        review.google_review_id: review
+        for review in db.query(Review).filter(Review.google_review_id.in_(review_ids))
+    } if review_ids else {}
+    # Reviews past the retention window live in reviews_archive and are not synced again
+    archived = archived_review_ids(db, set(review_ids) - set(existing))
+    
+    new_g_reviews = []
+    changed = []
+    unchanged = 0
+    for g_review in google_reviews:
+        if not g_review.get('reviewId'):
+            continue
+        if g_review.get('reviewId') in archived:
+            unchanged += 1
+            continue
+        fields = review_fields(g_review)
+        review = existing.get(g_review.get('reviewId'))
+        if review is None:
+            new_g_reviews.append((g_review, fields))
+        elif review.content_hash == fields["content_hash"]:
+            unchanged += 1
+        else:
+            changed.append((review, fields))
+    
+    # Triage new and edited reviews locally in one batch
+    to_classify = [fields for _, fields in new_g_reviews] + [
+        fields for review, fields in changed
+        if review.comment != fields["comment"] or review.rating != fields["rating"]
+    ]
+    analyses = get_review_classifier().classify(
+        [fields["comment"] for fields in to_classify],
+        [fields["rating"] for fields in to_classify]
+    )
+    for fields, analysis in zip(to_classify, analyses):
+        fields.update(analysis)
+    
+    new_reviews = []
+    for g_review, fields in new_g_reviews:
+        # Create new review
+        new_review = Review(location_id=location.id, **fields)
+        db.add(new_review)
+        new_reviews.append((new_review, g_review))
+    
+    for review, fields in changed:
+        # Only rows whose upstream content changed are written
+        for field, value in fields.items():
+            if field in ("reply_text", "reply_at") and value is None:
+                continue
+            if getattr(review, field) != value:
+                setattr(review, field, value)
+    
+    # Group copy-paste and spam-wave reviews across the account's locations
+    duplicates = 0
+    if new_reviews:
+        db.flush()
+        try:
+            duplicates = find_duplicates(db, user.id, [new_review for new_review, _ in new_reviews])
+        except Exception:
+            reset_account_index(user.id)
+            raise
+    
+    # Auto-reply if enabled, most urgent first via the triage queue.
+    # A cluster gets one generated reply: duplicates wait for the head's reply,
+    # and duplicates of reviews at other locations are left for moderation.
+    # Queued through the outbox, so only committed reviews reach the queue.
+    if location.auto_reply_enabled:
+        reply_ids = []
+        for new_review, g_review in new_reviews:
+            if g_review.get('reviewReply'):
+                continue
+            if new_review.duplicate_of_id:
+                head = db.query(Review).filter(Review.id == new_review.duplicate_of_id).first()
+                if not head or head.location_id != location.id or not head.reply_text:
+                    continue
+            reply_ids.append(new_review.id)
+        if reply_ids:
+            enqueue_after_commit(db, queue_review_replies, reply_ids)
+    
+    try:
+        db.commit()
+    except Exception:
+        reset_account_index(user.id)
+        raise
+    if new_reviews or changed:
+        invalidate_responses(user.id, "reviews")
+    
+    return {
+        "created": len(new_reviews),
+        "duplicates": duplicates,
+        "updated": len(changed),
+        "unchanged": unchanged
+    }
 
 
 @celery_app.task
-def sync_reviews():
-    """Sync reviews from Google Business Profile for all locations"""
+def sync_reviews(user_id: int = None):
+    """Queue review syncs for locations that are due (see services/sync_schedule.py), or all of one user's"""
     db = SessionLocal()
     try:
-        locations = db.query(Location).filter(Location.auto_reply_enabled == True).all()
-        
-        for location in locations:
-            sync_location_reviews.delay(location.id)
-        
-        return f"Queued {len(locations)} locations for review sync"
+        if user_id is None:
+            location_ids = claim_due_locations(db)
+        else:
+            # Asked for by the user: sync now, whatever the schedule says
+            location_ids = [
+                location_id for (location_id,) in db.query(Location.id).filter(
+                    Location.user_id == user_id,
+                    Location.auto_reply_enabled == True
+                )
+            ]
+        # Claims and queued syncs commit together
+        enqueue_many(db, sync_location_reviews, [(location_id,) for location_id in location_ids])
+        db.commit()
+        return f"Queued {len(location_ids)} locations for review sync"
     finally:
         db.close()
 
@@ -33,42 +191,32 @@ def sync_location_reviews(location_id: int):
         if not user or not user.google_access_token:
             return f"User credentials not found for location {location_id}"
         
+        location_name = v4_location_name(location.google_account_id, location.google_location_id)
+        if not location_name:
+            return f"Google account of location {location_id} unknown, sync locations first"
+        
         # Initialize Google Business service
         gb_service = GoogleBusinessService(
             access_token=user.google_access_token,
             refresh_token=user.google_refresh_token
         )
         
-        # Get reviews from Google
-        google_reviews = gb_service.get_reviews(location.google_location_id)
-        
-        new_reviews_count = 0
-        for g_review in google_reviews:
-            # Check if review already exists
-            existing_review = db.query(Review).filter(
-                Review.google_review_id == g_review.get('reviewId')
-            ).first()
-            
-            if not existing_review:
-                # Create new review
-                new_review = Review(
-                    location_id=location_id,
-                    google_review_id=g_review.get('reviewId'),
-                    reviewer_name=g_review.get('reviewer', {}).get('displayName', 'Anonymous'),
-                    reviewer_profile_photo=g_review.get('reviewer', {}).get('profilePhotoUrl'),
-                    rating=g_review.get('starRating', 0),
-                    comment=g_review.get('comment'),
-                    review_created_at=datetime.fromisoformat(g_review.get('createTime', datetime.utcnow().isoformat()))
-                )
-                db.add(new_review)
-                new_reviews_count += 1
-                
-                # Auto-reply if enabled
-                if location.auto_reply_enabled and not g_review.get('reviewReply'):
-                    generate_and_reply_to_review.delay(new_review.id)
+        # Get the reviews changed since the last sync, or all of them on a reconcile
+        started = datetime.utcnow()
+        updated_since = reviews_updated_since(db, location_id, started)
+        google_reviews = gb_service.get_reviews(location_name, updated_since=updated_since)
+        if google_reviews is None:
+            # Not rescheduled: the claim lease brings the location back after
+            # REVIEW_SYNC_MIN_INTERVAL_SECONDS
+            return f"Failed to fetch reviews for location {location_id}"
         
+        counts = upsert_location_reviews(db, location, user, google_reviews)
+        record_sync(db, location_id, now=started, reconciled=updated_since is None)
         db.commit()
-        return f"Synced {new_reviews_count} new reviews for location {location_id}"
+        return (
+            f"Synced {counts['created']} new reviews ({counts['duplicates']} near-duplicates), "
+            f"{counts['updated']} updated, {counts['unchanged']} unchanged for location {location_id}"
+        )
         
     except Exception as e:
         return f"Error syncing reviews for location {location_id}: {str(e)}"
@@ -76,32 +224,118 @@ def sync_location_reviews(location_id: int):
         db.close()
 
 
+@celery_app.task
+def ingest_review_notification(location_id: int, review_name: str):
+    """Fetch and upsert one review announced by a GBP push notification"""
+    db = SessionLocal()
+    try:
+        location = db.query(Location).filter(Location.id == location_id).first()
+        if not location:
+            return f"Location {location_id} not found"
+        
+        user = db.query(User).filter(User.id == location.user_id).first()
+        if not user or not user.google_access_token:
+            return f"User credentials not found for location {location_id}"
+        
+        gb_service = GoogleBusinessService(
+            access_token=user.google_access_token,
+            refresh_token=user.google_refresh_token
+        )
+        
+        g_review = gb_service.get_review(review_name)
+        if not g_review:
+            return f"Review {review_name} not found"
+        
+        counts = upsert_location_reviews(db, location, user, [g_review])
+        return f"Ingested review {review_name}: {counts['created']} new, {counts['updated']} updated"
+        
+    except Exception as e:
+        return f"Error ingesting review {review_name}: {str(e)}"
+    finally:
+        db.close()
+
+
+@celery_app.task
+def queue_review_replies(review_ids: List[int]):
+    """Add committed, unanswered reviews to their locations' reply queues"""
+    db = SessionLocal()
+    try:
+        reviews = db.query(Review).filter(Review.id.in_(review_ids), Review.reply_text.is_(None)).all()
+        for review in reviews:
+            enqueue_review_reply(review)
+        return f"Queued {len(reviews)} reviews for reply"
+    finally:
+        db.close()
+
+
+@celery_app.task
+def dispatch_review_replies():
+    """Hand the most urgent queued reviews to reply workers, a few per location at a time"""
+    requeue_expired_replies()
+    batch = pop_reply_batch(settings.REPLY_DISPATCH_MAX_LOCATIONS, settings.REPLY_DISPATCH_PER_LOCATION)
+    for _, review_id in batch:
+        try:
+            generate_and_reply_to_review.delay(review_id)
+        except Exception as e:
+            print(f"Error dispatching reply for review {review_id}: {e}")
+            requeue_review_reply(review_id)
+    
+    REPLY_QUEUE_DEPTH.set(queue_depth())
+    return f"Dispatched {len(batch)} review replies"
+
+
 @celery_app.task
 def generate_and_reply_to_review(review_id: int, tone: str = "professional"):
-    """Generate AI reply and post it to Google Business Profile"""
+    """Generate AI reply and post it to Google Business Profile.
+    
+    Reviews dispatched from the reply queue are acknowledged once settled;
+    on a failure they stay pending and are queued again after
+    REPLY_VISIBILITY_TIMEOUT_SECONDS.
+    """
     db = SessionLocal()
     try:
         review = db.query(Review).filter(Review.id == review_id).first()
         if not review:
+            ack_review_reply(review_id)
             return f"Review {review_id} not found"
         
+        if review.reply_text:
+            ack_review_reply(review_id)
+            return f"Review {review_id} already has a reply"
+        
         location = db.query(Location).filter(Location.id == review.location_id).first()
         if not location:
+            ack_review_reply(review_id)
             return f"Location not found for review {review_id}"
         
         user = db.query(User).filter(User.id == location.user_id).first()
         if not user or not user.google_access_token:
             return f"User credentials not found for review {review_id}"
         
-        # Generate AI reply
-        ai_service = AIResponseService()
-        reply_text = ai_service.generate_review_reply(
-            business_name=location.name,
-            reviewer_name=review.reviewer_name,
-            rating=review.rating,
-            review_comment=review.comment,
-            tone=tone
-        )
+        location_name = v4_location_name(location.google_account_id, location.google_location_id)
+        if not location_name:
+            return f"Google account of location {location.id} unknown, sync locations first"
+        
+        if review.duplicate_of_id:
+            # Near-duplicates reuse the reply posted to the head of their cluster
+            head = db.query(Review).filter(Review.id == review.duplicate_of_id).first()
+            if not head or head.location_id != review.location_id:
+                ack_review_reply(review_id)
+                return f"Review {review_id} duplicates a review at another location, left for moderation"
+            if not head.reply_text:
+                ack_review_reply(review_id)
+                return f"Review {review_id} waits for the reply to review {head.id}"
+            reply_text = head.reply_text
+        else:
+            # Generate AI reply
+            ai_service = AIResponseService()
+            reply_text = ai_service.generate_review_reply(
+                business_name=location.name,
+                reviewer_name=review.reviewer_name,
+                rating=review.rating,
+                review_comment=review.comment,
+                tone=tone
+            )
         
         if not reply_text:
             return f"Failed to generate reply for review {review_id}"
@@ -112,13 +346,29 @@ def generate_and_reply_to_review(review_id: int, tone: str = "professional"):
             refresh_token=user.google_refresh_token
         )
         
-        result = gb_service.reply_to_review(review.google_review_id, reply_text)
+        result = gb_service.reply_to_review(f"{location_name}/reviews/{review.google_review_id}", reply_text)
         
         if result:
             review.reply_text = reply_text
             review.reply_at = datetime.utcnow()
             review.ai_generated_reply = True
+            
+            # Cover the rest of the cluster at this location with the same reply,
+            # once the head's reply is committed for them to copy
+            duplicates = db.query(Review.id).filter(
+                Review.duplicate_of_id == review.id,
+                Review.location_id == review.location_id,
+                Review.reply_text.is_(None)
+            ).all()
+            enqueue_many(db, generate_and_reply_to_review, duplicates)
             db.commit()
+            ack_review_reply(review_id)
+            invalidate_responses(user.id, "reviews")
+            
+            if review.review_created_at:
+                REVIEW_TIME_TO_REPLY.labels(review.sentiment or "unknown").observe(
+                    (as_naive_utc(review.reply_at) - as_naive_utc(review.review_created_at)).total_seconds()
+                )
             return f"Reply posted for review {review_id}"
         else:
             return f"Failed to post reply for review {review_id}"
@@ -127,3 +377,87 @@ def generate_and_reply_to_review(review_id: int, tone: str = "professional"):
         return f"Error replying to review {review_id}: {str(e)}"
     finally:
         db.close()
+
+
+@celery_app.task
+def archive_old_reviews(max_batches: int = None):
+    """Move reviews older than REVIEW_RETENTION_DAYS into reviews_archive"""
+    if settings.REVIEW_RETENTION_DAYS <= 0:
+        return "Review archival is disabled"
+    
+    result = archive_reviews(archive_cutoff(), settings.REVIEW_ARCHIVE_BATCH_SIZE, max_batches)
+    for user_id in result["user_ids"]:
+        invalidate_responses(user_id, "reviews")
+    return f"Archived {result['archived']} reviews for {len(result['user_ids'])} accounts"
+
+
+@celery_app.task
+def train_review_classifier(min_reviews: int = 200):
+    """Fit the review sentiment model on recent stored reviews, using star ratings as labels"""
+    from app.services.review_classifier import ReviewClassifier
+    
+    if not settings.REVIEW_CLASSIFIER_MODEL_PATH:
+        return "REVIEW_CLASSIFIER_MODEL_PATH is not set"
+    
+    db = read_session()
+    try:
+        rows = db.query(Review.comment, Review.rating).filter(
+            Review.comment.isnot(None),
+            Review.rating != 3
+        ).order_by(Review.id.desc()).limit(settings.REVIEW_CLASSIFIER_MAX_TRAINING_REVIEWS).all()
+        
+        if len(rows) < min_reviews:
+            return f"Only {len(rows)} labelled reviews, need {min_reviews}"
+        
+        classifier = ReviewClassifier().fit(
+            [comment for comment, _ in rows],
+            [1 if rating >= 4 else 0 for _, rating in rows]
+        )
+        classifier.save(settings.REVIEW_CLASSIFIER_MODEL_PATH)
+        get_review_classifier.cache_clear()
+        return f"Trained review classifier on {len(rows)} reviews"
+    finally:
+        db.close()
+
+
+@celery_app.task
+def sign_stored_reviews(batch_size: int = 1000):
+    """Triage and MinHash-sign reviews stored before the local classifier and near-duplicate detection"""
+    from app.services.dedup import minhash, signature_to_bytes
+    
+    classifier = get_review_classifier()
+    db = SessionLocal()
+    try:
+        classified = 0
+        signed = 0
+        last_id = 0
+        while True:
+            rows = db.query(Review.id, Review.comment, Review.rating, Review.sentiment, Review.content_signature).filter(
+                Review.id > last_id,
+                or_(
+                    Review.sentiment.is_(None),
+                    and_(Review.content_signature.is_(None), Review.comment.isnot(None))
+                )
+            ).order_by(Review.id).limit(batch_size).all()
+            if not rows:
+                break
+            
+            mappings = {row.id: {"id": row.id} for row in rows}
+            untriaged = [row for row in rows if row.sentiment is None]
+            analyses = classifier.classify([row.comment for row in untriaged], [row.rating for row in untriaged])
+            for row, analysis in zip(untriaged, analyses):
+                mappings[row.id].update(analysis)
+            classified += len(untriaged)
+            for row in rows:
+                if row.content_signature is None and row.comment is not None:
+                    signature = minhash(row.comment, settings.DEDUP_MIN_TOKENS)
+                    if signature is not None:
+                        mappings[row.id]["content_signature"] = signature_to_bytes(signature)
+                        signed += 1
+            db.bulk_update_mappings(Review, [mapping for mapping in mappings.values() if len(mapping) > 1])
+            db.commit()
+            last_id = rows[-1].id
+        
+        return f"Classified {classified} and signed {signed} stored reviews"
+    finally:
+        db.close()
@@ -0,0 +1,54 @@
+from .celery_app import celery_app
+from app.core.database import SessionLocal
+from app.models import Location, LocationStats, Post, ReviewDailyBucket
+from app.models.stats import COUNTER_COLUMNS, post_status_column, review_bucket_delta, review_stats_delta
+from collections import defaultdict
+from app.services.review_archive import review_history_source
+from sqlalchemy import func, select
+
+
+@celery_app.task
+def rebuild_location_stats(location_id: int = None):
+    """Recompute location_stats and review_daily_buckets from reviews and posts (backfill or drift repair)"""
+    db = SessionLocal()
+    try:
+        if location_id:
+            location_ids = [location_id]
+        else:
+            location_ids = [loc_id for (loc_id,) in db.query(Location.id).all()]
+        
+        for loc_id in location_ids:
+            counters = dict.fromkeys(COUNTER_COLUMNS, 0)
+            buckets = defaultdict(lambda: defaultdict(float))
+            
+            # Archived reviews still count
+            history = review_history_source()
+            reviews = db.execute(
+                select(history.c.rating, history.c.reply_at, history.c.review_created_at)
+                .where(history.c.location_id == loc_id)
+                .execution_options(yield_per=1000)
+            )
+            for rating, reply_at, review_created_at in reviews:
+                for column, value in review_stats_delta(rating, reply_at, review_created_at).items():
+                    counters[column] += value
+                bucket = review_bucket_delta(rating, review_created_at)
+                if bucket is not None:
+                    for column, value in bucket[1].items():
+                        buckets[bucket[0]][column] += value
+            
+            post_counts = db.query(Post.status, func.count(Post.id)).filter(
+                Post.location_id == loc_id
+            ).group_by(Post.status).all()
+            for status, count in post_counts:
+                counters[post_status_column(status)] += count
+            
+            db.merge(LocationStats(location_id=loc_id, **counters))
+            db.query(ReviewDailyBucket).filter(ReviewDailyBucket.location_id == loc_id).delete()
+            db.bulk_insert_mappings(ReviewDailyBucket, [
+                {"location_id": loc_id, "day": day, **bucket} for day, bucket in buckets.items()
+            ])
+            db.commit()
+        
+        return f"Rebuilt stats for {len(location_ids)} locations"
+    finally:
+        db.close()
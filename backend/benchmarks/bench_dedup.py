@@ -0,0 +1,99 @@
+"""Benchmark near-duplicate review detection on synthetic data.
+
+Builds a MinHash/LSH index over N synthetic stored reviews, then queries a
+batch of incoming reviews of which a share are lightly edited copies of
+stored ones. Reports signing and index build throughput, index memory,
+query latency, recall on the injected copies and false positives on the
+fresh reviews.
+
+    cd backend
+    python -m benchmarks.bench_dedup --stored 1000000 --incoming 5000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+import numpy as np
+from app.services.dedup import NUM_HASHES, MinHashIndex, minhash
+
+WORDS = (
+    "coffee staff friendly service slow fast parking table order waited minutes manager rude great "
+    "terrible clean dirty price value menu fresh cold delicious bathroom line lunch dinner breakfast "
+    "pizza burger salad music loud quiet booked appointment helpful recommend again never always "
+    "location downtown weekend morning evening sandwich dessert cake tea latte croissant waiter "
+    "cashier receipt refund card cash wifi seat outside inside window view owner family kids dog"
+).split()
+
+
+def synthetic_review(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 60)))
+
+
+def near_copy(text: str, rng: random.Random) -> str:
+    """A copy with small edits, as in spam waves and copy-paste reviews"""
+    words = text.split()
+    for _ in range(max(1, len(words) // 30)):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    text = " ".join(words)
+    return rng.choice([text, text.upper(), text + "!!", text.replace(" ", "  ")])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stored", type=int, default=200000, help="Reviews already in the index")
+    parser.add_argument("--incoming", type=int, default=2000, help="Reviews queried against the index")
+    parser.add_argument("--duplicate-share", type=float, default=0.3)
+    parser.add_argument("--sample-texts", type=int, default=20000, help="Stored reviews generated as real text")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    # Signing every stored review is linear, so time a sample and fill the rest with random signatures
+    sample = [synthetic_review(rng) for _ in range(min(args.sample_texts, args.stored))]
+    start = time.perf_counter()
+    sample_signatures = np.stack([minhash(text) for text in sample])
+    sign_seconds = time.perf_counter() - start
+
+    filler = np.random.default_rng(args.seed).integers(0, 2 ** 16, size=(args.stored - len(sample), NUM_HASHES), dtype=np.uint16)
+    start = time.perf_counter()
+    index = MinHashIndex(np.arange(1, args.stored + 1), np.concatenate([sample_signatures, filler]))
+    build_seconds = time.perf_counter() - start
+
+    incoming = []
+    for _ in range(args.incoming):
+        if rng.random() < args.duplicate_share:
+            source = rng.randrange(len(sample))
+            incoming.append((near_copy(sample[source], rng), source + 1))
+        else:
+            incoming.append((synthetic_review(rng), None))
+
+    latencies = []
+    found = missed = false_positives = 0
+    for text, source_id in incoming:
+        start = time.perf_counter()
+        match = index.query(minhash(text))
+        latencies.append(time.perf_counter() - start)
+        if source_id is not None:
+            found += match == source_id
+            missed += match != source_id
+        elif match is not None:
+            false_positives += 1
+
+    duplicates = found + missed
+    latencies.sort()
+    print(json.dumps({
+        "stored": args.stored,
+        "incoming": args.incoming,
+        "signatures_per_second": round(len(sample) / sign_seconds),
+        "index_build_seconds": round(build_seconds, 3),
+        "index_megabytes": round(index.nbytes / 2 ** 20, 1),
+        "query_ms_median": round(statistics.median(latencies) * 1000, 4),
+        "query_ms_p99": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 4),
+        "duplicate_recall": round(found / duplicates, 4) if duplicates else None,
+        "false_positive_rate": round(false_positives / (args.incoming - duplicates), 4) if args.incoming > duplicates else None
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+"""End-to-end benchmark of the API routes and the Celery pipelines.
+
+Seeds N users with M locations each, K reviews and P posts per location
+into the database at DATABASE_URL, then measures:
+
+- latency percentiles, throughput and SQL statements per request for
+  /auth/login, /locations/, /posts/ and /reviews/, served in-process
+  through the ASGI app (no network, so the numbers are the app's own);
+- wall time, SQL statements and upstream calls of sync_reviews (first
+  sync, then a re-sync where nothing changed) and publish_scheduled_posts,
+  run eagerly against scripts/fake_upstream_server.py.
+
+Needs Redis at REDIS_URL like the app itself. Use a scratch database: seed
+rows are not removed and the pipeline locations use fixed GBP ids. The
+report is JSON with the git commit, so runs can be kept and compared;
+--baseline adds the change of every metric against an earlier report.
+
+    cd backend
+    DATABASE_URL=sqlite:////tmp/gmb_bench.db python -m benchmarks.bench_e2e --output bench-main.json
+    DATABASE_URL=sqlite:////tmp/gmb_bench2.db python -m benchmarks.bench_e2e --baseline bench-main.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+import httpx
+from sqlalchemy import event, insert
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.core.migrations import upgrade_database
+from app.core.security import get_password_hash
+from app.models import Location, LocationStats, Post, Review, User
+from app.models.post import PostStatus
+from app.models.stats import apply_bucket_deltas, apply_stats_deltas, review_bucket_delta, review_stats_delta
+from app.services.post_import import insert_posts
+from benchmarks.bench_dedup import synthetic_review
+
+PASSWORD = "bench-password"
+ROUTES = ("/locations/", "/posts/", "/reviews/")
+
+
+class QueryCounter:
+    """Counts SQL statements run on an engine from any thread"""
+
+    def __init__(self, engine):
+        self.count = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+
+    def _before_cursor_execute(self, *args):
+        with self._lock:
+            self.count += 1
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+async def timed_async(awaitable):
+    start = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - start
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def seed_users(users: int, locations: int, reviews: int, posts: int, rng: random.Random) -> list:
+    """Insert the route dataset, returning (user id, email) pairs.
+
+    Rows go in through Core inserts with the stats rollup applied by hand,
+    the same way the bulk paths in the app write them.
+    """
+    hashed_password = get_password_hash(PASSWORD)
+    nonce = time.time_ns()
+    started = datetime.utcnow() - timedelta(days=365)
+    seeded = []
+    db = SessionLocal()
+    try:
+        for u in range(users):
+            user = User(email=f"bench-{nonce}-{u}@example.com", hashed_password=hashed_password, full_name=f"Bench {u}")
+            db.add(user)
+            db.commit()
+            seeded.append((user.id, user.email))
+
+            location_ids = db.execute(
+                insert(Location.__table__).returning(Location.__table__.c.id),
+                [
+                    {"user_id": user.id, "google_location_id": f"bench/{nonce}/{u}/{i}", "name": f"Bench {u}-{i}"}
+                    for i in range(locations)
+                ]
+            ).scalars().all()
+            db.execute(insert(LocationStats.__table__), [{"location_id": location_id} for location_id in location_ids])
+
+            rows = []
+            deltas = defaultdict(lambda: defaultdict(float))
+            buckets = defaultdict(lambda: defaultdict(float))
+            for location_id in location_ids:
+                for i in range(reviews):
+                    rating = float(rng.randint(1, 5))
+                    created_at = started + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+                    reply_at = created_at + timedelta(hours=rng.randint(1, 72)) if rng.random() < 0.5 else None
+                    rows.append({
+                        "location_id": location_id,
+                        "google_review_id": f"bench/{nonce}/{location_id}/{i}",
+                        "reviewer_name": "Bench",
+                        "rating": rating,
+                        "comment": synthetic_review(rng),
+                        "reply_text": "Thank you!" if reply_at else None,
+                        "reply_at": reply_at,
+                        "review_created_at": created_at
+                    })
+                    for column, value in review_stats_delta(rating, reply_at, created_at).items():
+                        deltas[location_id][column] += value
+                    bucket = review_bucket_delta(rating, created_at)
+                    if bucket is not None:
+                        for column, value in bucket[1].items():
+                            buckets[(location_id, bucket[0])][column] += value
+            if rows:
+                connection = db.connection()
+                connection.execute(insert(Review.__table__), rows)
+                apply_stats_deltas(connection, deltas)
+                apply_bucket_deltas(connection, buckets)
+            db.commit()
+
+            insert_posts([
+                {
+                    "location_id": location_id,
+                    "title": None,
+                    "content": synthetic_review(rng),
+                    "post_type": "UPDATE",
+                    "media_url": None,
+                    "scheduled_at": None,
+                    "status": PostStatus.DRAFT,
+                    "ai_generated": False
+                }
+                for location_id in location_ids
+                for _ in range(posts)
+            ], [user.id])
+        return seeded
+    finally:
+        db.close()
+
+
+def latency_summary(samples: list, seconds: float, queries: int) -> dict:
+    samples = sorted(samples)
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    return {
+        "requests": len(samples),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+        "requests_per_second": round(len(samples) / seconds, 1),
+        "queries_per_request": round(queries / len(samples), 2)
+    }
+
+
+async def run_requests(client: httpx.AsyncClient, make_request, count: int, concurrency: int) -> list:
+    """Latencies of `count` requests, `concurrency` in flight at a time"""
+    samples = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await make_request(i)
+            samples.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                raise RuntimeError(f"{response.request.url.path} returned {response.status_code}: {response.text[:200]}")
+
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return samples
+
+
+async def bench_routes(users: list, requests: int, concurrency: int, page_size: int, queries: QueryCounter) -> dict:
+    from app.main import app
+
+    report = {}
+    prefix = settings.API_V1_STR
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        def login(i):
+            return client.post(f"{prefix}/auth/login", data={"username": users[i % len(users)][1], "password": PASSWORD})
+
+        # Logins are bcrypt-bound, so they get a smaller share of the requests
+        login_requests = max(len(users), requests // 10)
+        before = queries.count
+        samples, seconds = await timed_async(run_requests(client, login, login_requests, concurrency))
+        report["/auth/login"] = latency_summary(samples, seconds, queries.count - before)
+
+        tokens = []
+        for _, email in users:
+            response = await client.post(f"{prefix}/auth/login", data={"username": email, "password": PASSWORD})
+            tokens.append({"Authorization": f"Bearer {response.json()['access_token']}"})
+
+        for route in ROUTES:
+            def get(i, route=route):
+                return client.get(f"{prefix}{route}", params={"limit": page_size}, headers=tokens[i % len(tokens)])
+
+            await run_requests(client, get, min(requests, 10), concurrency)
+            before = queries.count
+            samples, seconds = await timed_async(run_requests(client, get, requests, concurrency))
+            report[route] = latency_summary(samples, seconds, queries.count - before)
+    return report
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_upstream(config) -> str:
+    """Serve scripts/fake_upstream_server.py from a thread, returning its base URL"""
+    import uvicorn
+    from scripts.fake_upstream_server import create_app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(create_app(config), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+def upstream_calls(base_url: str) -> int:
+    return sum(httpx.get(f"{base_url}/_stats").json()["statuses"].values())
+
+
+def bench_pipelines(args, queries: QueryCounter) -> dict:
+    from app.tasks.celery_app import celery_app
+    from app.tasks.post_tasks import publish_scheduled_posts
+    from app.tasks.review_tasks import sync_reviews
+    from scripts.fake_upstream_server import FakeConfig
+
+    config = FakeConfig(
+        accounts=1,
+        locations=args.pipeline_locations,
+        reviews=args.pipeline_reviews,
+        gbp_latency_ms=args.gbp_latency_ms,
+        openai_latency_ms=args.openai_latency_ms
+    )
+    base_url = start_fake_upstream(config)
+    settings.GBP_API_BASE_URL = base_url
+    settings.OPENAI_BASE_URL = f"{base_url}/v1"
+    # Run queued subtasks inline so each pipeline is timed end to end
+    celery_app.conf.task_always_eager = True
+
+    db = SessionLocal()
+    try:
+        if db.query(Location.id).filter(Location.google_location_id == "locations/1").first():
+            raise SystemExit("Pipeline locations already exist; run against a fresh scratch database")
+        user = User(
+            email=f"bench-pipeline-{time.time_ns()}@example.com",
+            hashed_password="x",
+            full_name="Pipeline bench",
+            google_access_token="bench-token",
+            google_refresh_token="bench-refresh"
+        )
+        db.add(user)
+        db.commit()
+        locations = [
+            Location(
+                user_id=user.id, google_location_id=f"locations/{i}", google_account_id="accounts/1",
+                name=f"Pipeline {i}", auto_reply_enabled=True
+            )
+            for i in range(1, args.pipeline_locations + 1)
+        ]
+        db.add_all(locations)
+        db.commit()
+        location_ids = [location.id for location in locations]
+        user_id = user.id
+    finally:
+        db.close()
+
+    def run(task, count_rows, **kwargs):
+        calls_before, queries_before = upstream_calls(base_url), queries.count
+        message, seconds = timed(lambda: task.apply(kwargs=kwargs).get())
+        return {
+            "wall_seconds": round(seconds, 3),
+            "queries": queries.count - queries_before,
+            "upstream_calls": upstream_calls(base_url) - calls_before,
+            "rows": count_rows(),
+            "result": message
+        }
+
+    def stored_reviews():
+        db = SessionLocal()
+        try:
+            return db.query(Review.id).filter(Review.location_id.in_(location_ids)).count()
+        finally:
+            db.close()
+
+    def published_posts():
+        db = SessionLocal()
+        try:
+            return db.query(Post.id).filter(
+                Post.location_id.in_(location_ids),
+                Post.status == PostStatus.PUBLISHED
+            ).count()
+        finally:
+            db.close()
+
+    report = {
+        "sync_reviews_first": run(sync_reviews, stored_reviews),
+        # Not due again yet, so sync on request as the API does
+        "sync_reviews_unchanged": run(sync_reviews, stored_reviews, user_id=user_id)
+    }
+
+    due = datetime.utcnow() - timedelta(minutes=1)
+    insert_posts([
+        {
+            "location_id": location_id,
+            "title": None,
+            "content": f"Pipeline post {i}",
+            "post_type": "UPDATE",
+            "media_url": None,
+            "scheduled_at": due,
+            "status": PostStatus.SCHEDULED,
+            "ai_generated": False
+        }
+        for location_id in location_ids
+        for i in range(args.pipeline_posts)
+    ], [])
+    report["publish_scheduled_posts"] = run(publish_scheduled_posts, published_posts)
+    return report
+
+
+def flatten(report: dict, prefix: str = "") -> dict:
+    values = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[f"{prefix}{key}"] = value
+    return values
+
+
+def compare(baseline: dict, report: dict) -> dict:
+    """Relative change of every numeric result shared with a baseline report"""
+    before = flatten(baseline.get("routes", {}), "routes.")
+    before.update(flatten(baseline.get("pipelines", {}), "pipelines."))
+    after = flatten(report["routes"], "routes.")
+    after.update(flatten(report["pipelines"], "pipelines."))
+    return {
+        metric: {
+            "baseline": before[metric],
+            "current": value,
+            "change_percent": round((value - before[metric]) / before[metric] * 100, 1) if before[metric] else None
+        }
+        for metric, value in after.items()
+        if metric in before
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--locations", type=int, default=20, help="Locations per user")
+    parser.add_argument("--reviews", type=int, default=200, help="Reviews per location")
+    parser.add_argument("--posts", type=int, default=20, help="Posts per location")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--page-size", type=int, default=100, help="limit= on list routes")
+    parser.add_argument("--pipeline-locations", type=int, default=20)
+    parser.add_argument("--pipeline-reviews", type=int, default=100, help="Upstream reviews per location")
+    parser.add_argument("--pipeline-posts", type=int, default=2, help="Scheduled posts per location")
+    parser.add_argument("--gbp-latency-ms", type=float, default=20.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=200.0)
+    parser.add_argument("--skip-routes", action="store_true")
+    parser.add_argument("--skip-pipelines", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    upgrade_database()
+
+    queries = QueryCounter(engine)
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "dialect": engine.dialect.name,
+        "python": platform.python_version(),
+        "parameters": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+        "routes": {},
+        "pipelines": {}
+    }
+
+    if not args.skip_routes:
+        users, seconds = timed(lambda: seed_users(args.users, args.locations, args.reviews, args.posts, rng))
+        report["seed_seconds"] = round(seconds, 3)
+        report["routes"] = asyncio.run(bench_routes(users, args.requests, args.concurrency, args.page_size, queries))
+    if not args.skip_pipelines:
+        report["pipelines"] = bench_pipelines(args, queries)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["comparison"] = compare(json.load(f), report)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
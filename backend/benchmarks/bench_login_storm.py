@@ -0,0 +1,148 @@
+"""Latency of other routes during a login storm, with and without the password hashing pool.
+
+Seeds users into the database at DATABASE_URL, then for each mode runs a
+storm of concurrent /auth/login requests for --duration seconds while a
+few probe clients keep requesting /locations/. Probe latency is reported
+for a quiet period and during the storm, next to login outcomes:
+
+- inline: bcrypt runs in the request threadpool (PASSWORD_HASH_WORKERS=0,
+  the behaviour before the pool), so logins hold threads for their whole
+  hash and probes queue behind them;
+- pool: bcrypt runs in PASSWORD_HASH_WORKERS processes, and logins beyond
+  PASSWORD_HASH_MAX_PENDING are turned away with 503 instead of queueing.
+
+Login throttling and the verification cache are switched off so every
+login reaches bcrypt. Needs Redis at REDIS_URL; use a scratch database.
+
+    cd backend
+    DATABASE_URL=sqlite:////tmp/gmb_bench.db python -m benchmarks.bench_login_storm --storm-concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter
+import httpx
+from app.core.config import settings
+from app.core.migrations import upgrade_database
+from app.core.password_hashing import hash_password, shutdown_password_pool
+from benchmarks.bench_e2e import PASSWORD, seed_users
+
+
+def summary(samples: list) -> dict:
+    samples = sorted(samples)
+    if not samples:
+        return {"requests": 0}
+    quantiles = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    return {
+        "requests": len(samples),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2)
+    }
+
+
+async def probe(client: httpx.AsyncClient, headers: dict, until: float, samples: list):
+    while time.perf_counter() < until:
+        start = time.perf_counter()
+        response = await client.get(f"{settings.API_V1_STR}/locations/", headers=headers)
+        samples.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f"/locations/ returned {response.status_code}: {response.text[:200]}")
+
+
+async def storm(client: httpx.AsyncClient, emails: list, until: float, statuses: Counter, samples: list):
+    while time.perf_counter() < until:
+        start = time.perf_counter()
+        response = await client.post(
+            f"{settings.API_V1_STR}/auth/login",
+            data={"username": random.choice(emails), "password": PASSWORD}
+        )
+        statuses[response.status_code] += 1
+        if response.status_code == 200:
+            samples.append(time.perf_counter() - start)
+        elif response.status_code == 503:
+            # Honour Retry-After loosely, like a client with backoff would
+            await asyncio.sleep(0.05)
+
+
+async def run_mode(emails: list, args) -> dict:
+    from app.main import app
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        response = await client.post(f"{settings.API_V1_STR}/auth/login", data={"username": emails[0], "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        quiet = []
+        until = time.perf_counter() + args.quiet_seconds
+        await asyncio.gather(*(probe(client, headers, until, quiet) for _ in range(args.probe_concurrency)))
+
+        during, logins, statuses = [], [], Counter()
+        started = time.perf_counter()
+        until = started + args.duration
+        await asyncio.gather(
+            *(probe(client, headers, until, during) for _ in range(args.probe_concurrency)),
+            *(storm(client, emails, until, statuses, logins) for _ in range(args.storm_concurrency))
+        )
+        elapsed = time.perf_counter() - started
+
+    return {
+        "probe_quiet": summary(quiet),
+        "probe_during_storm": summary(during),
+        "logins": {
+            **summary(logins),
+            "successful_per_second": round(statuses[200] / elapsed, 1),
+            "statuses": {str(code): count for code, count in sorted(statuses.items())}
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--storm-concurrency", type=int, default=64, help="Clients logging in back to back")
+    parser.add_argument("--probe-concurrency", type=int, default=4, help="Clients requesting /locations/")
+    parser.add_argument("--duration", type=float, default=15.0, help="Storm length in seconds")
+    parser.add_argument("--quiet-seconds", type=float, default=3.0)
+    parser.add_argument("--modes", default="inline,pool")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    settings.LOGIN_MAX_ATTEMPTS_PER_IP = 0
+    settings.LOGIN_MAX_FAILURES_PER_EMAIL = 0
+    settings.PASSWORD_VERIFY_CACHE_SECONDS = 0
+
+    upgrade_database()
+    users = seed_users(args.users, 2, 5, 2, random.Random(args.seed))
+    emails = [email for _, email in users]
+
+    report = {
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "pool_workers": settings.PASSWORD_HASH_WORKERS,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+        "modes": {}
+    }
+    workers = settings.PASSWORD_HASH_WORKERS
+    for mode in args.modes.split(","):
+        settings.PASSWORD_HASH_WORKERS = 0 if mode == "inline" else max(workers, 1)
+        shutdown_password_pool()
+        # Start the worker processes before timing anything
+        hash_password(PASSWORD)
+        report["modes"][mode] = asyncio.run(run_mode(emails, args))
+    shutdown_password_pool()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Compare review-reply prompts before and after the template registry.
+
+Reports prompt tokens per reply (total, and the per-request user message),
+the model each reply is routed to and prompt build time.
+With --live it also sends the replies to OpenAI and reports latency and
+the token usage the API returns.
+
+    cd backend
+    python -m benchmarks.bench_prompts --reviews 500
+    python -m benchmarks.bench_prompts --reviews 20 --live
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from app.core.config import settings
+from app.services.prompts import count_tokens, message_tokens, select_review_reply_template, truncate_to_tokens
+
+PHRASES = [
+    "Great coffee and friendly staff.",
+    "The wait was way too long and nobody apologized.",
+    "Parking is impossible around here on weekends.",
+    "Loved the new seasonal menu, will be back!",
+    "The bathroom was dirty and the manager was rude when I mentioned it.",
+    "Decent prices, average food.",
+]
+
+
+def legacy_request(business_name, reviewer_name, rating, review_comment, tone="professional"):
+    """The prompt generate_review_reply built before the template registry"""
+    sentiment = "positive" if rating >= 4 else "negative" if rating <= 2 else "neutral"
+    prompt = f"""Generate a {tone} reply to a {sentiment} review for {business_name}.
+
+Reviewer: {reviewer_name}
+Rating: {rating}/5 stars
+Review: {review_comment if review_comment else "No comment provided"}
+
+The reply should:
+- Be warm and {tone}
+- Thank the customer
+- Address their feedback appropriately
+- Be between 50-150 words
+- {"Acknowledge and apologize for any issues" if sentiment == "negative" else "Express gratitude"}
+
+Generate only the reply text, no additional formatting."""
+    return {
+        "model": "gpt-4",
+        "messages": [
+            {"role": "system", "content": "You are a professional customer service representative responding to online reviews."},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 250,
+        "temperature": 0.7
+    }
+
+
+def templated_request(business_name, reviewer_name, rating, review_comment, tone="professional"):
+    """The prompt generate_review_reply builds now"""
+    sentiment = "positive" if rating >= 4 else "negative" if rating <= 2 else "neutral"
+    comment = truncate_to_tokens(review_comment, settings.REVIEW_COMMENT_TOKEN_BUDGET)
+    template = select_review_reply_template(rating, count_tokens(comment))
+    return template.request(
+        business_name=business_name,
+        tone=tone,
+        sentiment=sentiment,
+        reviewer_name=reviewer_name,
+        rating=rating,
+        review_comment=comment or "No comment provided"
+    )
+
+
+def synthetic_reviews(n, seed=42):
+    rng = random.Random(seed)
+    reviews = []
+    for i in range(n):
+        rating = rng.choice([1, 2, 3, 4, 5, 5, 5, 4])
+        length = rng.choice([0, 1, 2, 4, 8, 60])
+        comment = " ".join(rng.choice(PHRASES) for _ in range(length)) or None
+        reviews.append(("Corner Coffee", f"Customer {i}", rating, comment))
+    return reviews
+
+
+def measure(build, reviews):
+    tokens, dynamic_tokens, build_times, models = [], [], [], {}
+    for review in reviews:
+        start = time.perf_counter()
+        request = build(*review)
+        build_times.append(time.perf_counter() - start)
+        tokens.append(message_tokens(request["messages"]))
+        dynamic_tokens.append(message_tokens(request["messages"][1:]))
+        models[request["model"]] = models.get(request["model"], 0) + 1
+    return {
+        "prompt_tokens_mean": statistics.mean(tokens),
+        "prompt_tokens_max": max(tokens),
+        "user_message_tokens_mean": statistics.mean(dynamic_tokens),
+        "max_completion_tokens": request["max_tokens"],
+        "build_us_mean": statistics.mean(build_times) * 1e6,
+        "models": models,
+    }
+
+
+def measure_live(build, reviews):
+    from app.services import AIResponseService
+
+    client = AIResponseService().client
+    latencies, prompt_tokens, cached_tokens, completion_tokens = [], [], [], []
+    for review in reviews:
+        start = time.perf_counter()
+        response = client.chat.completions.create(**build(*review))
+        latencies.append(time.perf_counter() - start)
+        usage = response.usage
+        prompt_tokens.append(usage.prompt_tokens)
+        completion_tokens.append(usage.completion_tokens)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens.append(getattr(details, "cached_tokens", 0) or 0 if details else 0)
+    return {
+        "latency_s_mean": statistics.mean(latencies),
+        "latency_s_p95": sorted(latencies)[int(len(latencies) * 0.95) - 1],
+        "prompt_tokens_mean": statistics.mean(prompt_tokens),
+        "cached_prompt_tokens_mean": statistics.mean(cached_tokens),
+        "completion_tokens_mean": statistics.mean(completion_tokens),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=500)
+    parser.add_argument("--live", action="store_true", help="call the OpenAI API")
+    args = parser.parse_args()
+
+    reviews = synthetic_reviews(args.reviews)
+    results = {"before": measure(legacy_request, reviews), "after": measure(templated_request, reviews)}
+    if args.live:
+        results["before_live"] = measure_live(legacy_request, reviews)
+        results["after_live"] = measure_live(templated_request, reviews)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
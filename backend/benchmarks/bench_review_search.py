@@ -0,0 +1,135 @@
+"""Benchmark review full-text search on synthetic data.
+
+Seeds N synthetic reviews for one account into the database at
+DATABASE_URL after migrating it (the migrations create the search index:
+tsvector GIN on Postgres, FTS5 on SQLite) and times ranked searches with and without location/rating
+filters, plus deep pagination through cursors. Use a scratch database:
+the seed rows are not removed.
+
+    cd backend
+    DATABASE_URL=postgresql://.../gmb_bench python -m benchmarks.bench_review_search --reviews 1000000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.core.database import SessionLocal, engine
+from app.core.migrations import upgrade_database
+from app.models import Location, LocationStats, Review, User
+from app.services.review_search import search_reviews
+from benchmarks.bench_dedup import WORDS, synthetic_review
+
+QUERIES = [
+    "parking",
+    "rude manager",
+    "coffee or latte",
+    '"friendly staff"',
+    "slow service -pizza",
+    "croissant dessert fresh",
+]
+
+
+def seed(reviews: int, locations: int, batch_size: int, rng: random.Random) -> int:
+    """Insert one user with `locations` locations and `reviews` reviews, returning the user id"""
+    db = SessionLocal()
+    try:
+        user = User(email=f"bench-{time.time_ns()}@example.com", hashed_password="x", full_name="Search bench")
+        db.add(user)
+        db.commit()
+        location_ids = db.execute(
+            insert(Location.__table__).returning(Location.__table__.c.id),
+            [
+                {"user_id": user.id, "google_location_id": f"bench/{user.id}/{i}", "name": f"Bench {i}"}
+                for i in range(locations)
+            ]
+        ).scalars().all()
+        db.execute(insert(LocationStats.__table__), [{"location_id": location_id} for location_id in location_ids])
+        db.commit()
+
+        started = datetime.utcnow() - timedelta(days=365)
+        for offset in range(0, reviews, batch_size):
+            rows = []
+            for i in range(offset, min(offset + batch_size, reviews)):
+                replied = rng.random() < 0.4
+                rows.append({
+                    "location_id": rng.choice(location_ids),
+                    "google_review_id": f"bench/{user.id}/{i}",
+                    "reviewer_name": "Bench",
+                    "rating": float(rng.randint(1, 5)),
+                    "comment": synthetic_review(rng),
+                    "reply_text": " ".join(rng.choice(WORDS) for _ in range(12)) if replied else None,
+                    "ai_generated_reply": replied,
+                    "review_created_at": started + timedelta(seconds=i * 30)
+                })
+            db.execute(insert(Review.__table__), rows)
+            db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=100000)
+    parser.add_argument("--locations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query")
+    parser.add_argument("--pages", type=int, default=10, help="Cursor pages walked per query")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    # Create the index first so seeding measures the write cost of keeping it current
+    _, migrate_seconds = timed(upgrade_database)
+    user_id, seed_seconds = timed(lambda: seed(args.reviews, args.locations, args.batch_size, rng))
+
+    db = SessionLocal()
+    try:
+        location_id = db.query(Location.id).filter(Location.user_id == user_id).first()[0]
+        report = {
+            "dialect": engine.dialect.name,
+            "reviews": args.reviews,
+            "seed_reviews_per_second": round(args.reviews / seed_seconds),
+            "migrate_seconds": round(migrate_seconds, 3),
+            "queries": {}
+        }
+        for q in QUERIES:
+            first_page, filtered, deep = [], [], []
+            for _ in range(args.repeat):
+                (hits, cursor), seconds = timed(lambda: search_reviews(db, user_id, q, limit=args.limit))
+                first_page.append(seconds)
+                _, seconds = timed(lambda: search_reviews(
+                    db, user_id, q, location_id=location_id, min_rating=1, max_rating=2, limit=args.limit
+                ))
+                filtered.append(seconds)
+
+            pages = 1
+            start = time.perf_counter()
+            while cursor and pages < args.pages:
+                hits, cursor = search_reviews(db, user_id, q, cursor=cursor, limit=args.limit)
+                pages += 1
+            deep.append((time.perf_counter() - start) / max(pages - 1, 1))
+
+            report["queries"][q] = {
+                "first_page_ms_median": round(statistics.median(first_page) * 1000, 2),
+                "filtered_ms_median": round(statistics.median(filtered) * 1000, 2),
+                "next_page_ms_mean": round(deep[0] * 1000, 2),
+                "pages_walked": pages
+            }
+        print(json.dumps(report, indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
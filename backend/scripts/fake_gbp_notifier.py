@@ -0,0 +1,64 @@
+"""Post fake GBP review notifications to the push endpoint, the way Pub/Sub does.
+
+Each notification is a Pub/Sub push envelope whose base64 data holds a GBP
+notification for a review of the given location. Use --redeliver to send
+every message twice and check that duplicates are dropped.
+
+    cd backend
+    PUBSUB_VERIFICATION_TOKEN=dev-token uvicorn app.main:app
+    python -m scripts.fake_gbp_notifier --location accounts/1/locations/2 --token dev-token --count 5
+"""
+import argparse
+import base64
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+import httpx
+
+
+def push_envelope(notification_type: str, location: str, review_id: str, subscription: str) -> dict:
+    """A Pub/Sub push request body carrying one GBP notification"""
+    data = {
+        "type": notification_type,
+        "location": location,
+        "review": f"{location}/reviews/{review_id}"
+    }
+    return {
+        "message": {
+            "data": base64.b64encode(json.dumps(data).encode()).decode(),
+            "messageId": uuid.uuid4().hex,
+            "publishTime": datetime.now(timezone.utc).isoformat(),
+            "attributes": {}
+        },
+        "subscription": subscription
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/api/v1/notifications/gbp")
+    parser.add_argument("--token", help="PUBSUB_VERIFICATION_TOKEN of the API")
+    parser.add_argument("--location", required=True, help="accounts/{account}/locations/{location}")
+    parser.add_argument("--review-id", action="append", help="Review ids to announce (default: random)")
+    parser.add_argument("--count", type=int, default=1, help="Random reviews to announce without --review-id")
+    parser.add_argument("--type", default="NEW_REVIEW", choices=["NEW_REVIEW", "UPDATED_REVIEW"])
+    parser.add_argument("--interval", type=float, default=0.0, help="Seconds between notifications")
+    parser.add_argument("--redeliver", action="store_true", help="Send each message twice")
+    parser.add_argument("--subscription", default="projects/local/subscriptions/gbp-notifications")
+    args = parser.parse_args()
+
+    review_ids = args.review_id or [uuid.uuid4().hex[:16] for _ in range(args.count)]
+    params = {"token": args.token} if args.token else {}
+    with httpx.Client(timeout=10) as client:
+        for review_id in review_ids:
+            envelope = push_envelope(args.type, args.location, review_id, args.subscription)
+            for _ in range(2 if args.redeliver else 1):
+                response = client.post(args.url, params=params, json=envelope)
+                print(f"{envelope['message']['messageId']} {review_id}: {response.status_code} {response.text}")
+            if args.interval:
+                time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Stand-in for the Google Business Profile and OpenAI APIs, for local load tests.
+
+Serves the GBP endpoints GoogleBusinessService uses (accounts, locations,
+paginated reviews, review replies, local posts) and OpenAI chat
+completions from one process. Accounts, locations and reviews are derived
+from --seed on demand, so large datasets cost no memory and every run sees
+the same data; replies and posts written by the app are kept in memory.
+Latency, 5xx errors and 429s are injected per request.
+
+    cd backend
+    python -m scripts.fake_upstream_server --port 8090 --locations 50 --reviews 500 --error-rate 0.01
+    GBP_API_BASE_URL=http://localhost:8090 OPENAI_BASE_URL=http://localhost:8090/v1 uvicorn app.main:app
+
+GET /_stats reports requests per route and status; POST /_reset clears
+written state and counters.
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+STAR_RATINGS = ["ONE", "TWO", "THREE", "FOUR", "FIVE"]
+CATEGORIES = ["Coffee shop", "Restaurant", "Hair salon", "Dentist", "Bakery", "Gym", "Pharmacy", "Bookstore"]
+CITIES = [("Springfield", "IL", "62701"), ("Riverside", "CA", "92501"), ("Franklin", "TN", "37064"), ("Madison", "WI", "53703")]
+WORDS = (
+    "great friendly staff service slow fast parking clean dirty price value fresh cold delicious "
+    "waited manager rude helpful recommend again never always busy quiet lovely terrible coffee "
+    "appointment booking quality team visit experience order wrong perfect late early"
+).split()
+REVIEW_PAGE_MAX = 50
+
+
+@dataclass
+class FakeConfig:
+    accounts: int = 1
+    locations: int = 20
+    reviews: int = 100
+    review_growth_per_hour: float = 0.0
+    replied_share: float = 0.3
+    gbp_latency_ms: float = 50.0
+    openai_latency_ms: float = 400.0
+    latency_jitter: float = 0.3
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: int = 1
+
+
+def _iso(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _error(service: str, status_code: int, message: str) -> JSONResponse:
+    if service == "openai":
+        body = {"error": {"message": message, "type": "rate_limit_error" if status_code == 429 else "server_error"}}
+    else:
+        body = {"error": {"code": status_code, "message": message, "status": "RESOURCE_EXHAUSTED" if status_code == 429 else "UNAVAILABLE"}}
+    headers = {"Retry-After": "1"} if status_code == 429 else None
+    return JSONResponse(body, status_code=status_code, headers=headers)
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI(title="Fake GBP and OpenAI")
+    started = datetime.now(timezone.utc)
+    fault_rng = random.Random(config.seed)
+    replies: Dict[str, dict] = {}
+    posts: Dict[str, dict] = {}
+    stats = {"routes": Counter(), "statuses": Counter()}
+
+    def account_ids():
+        return range(1, config.accounts + 1)
+
+    def location_exists(location_id: int) -> bool:
+        return 1 <= location_id <= config.accounts * config.locations
+
+    def location_resource(location_id: int) -> dict:
+        rng = random.Random(f"{config.seed}:location:{location_id}")
+        city, state, postal_code = rng.choice(CITIES)
+        category = rng.choice(CATEGORIES)
+        return {
+            "name": f"locations/{location_id}",
+            "title": f"{category} {location_id}",
+            "storefrontAddress": {
+                "addressLines": [f"{rng.randint(1, 9999)} Main St"],
+                "locality": city,
+                "administrativeArea": state,
+                "postalCode": postal_code
+            },
+            "phoneNumbers": {"primaryPhone": f"+1 555 {location_id:07d}"},
+            "websiteUri": f"https://example.com/{location_id}",
+            "categories": {"primaryCategory": {"displayName": category}}
+        }
+
+    def review_count() -> int:
+        hours = (datetime.now(timezone.utc) - started).total_seconds() / 3600
+        return config.reviews + int(config.review_growth_per_hour * hours)
+
+    def review_resource(parent: str, location_id: int, index: int) -> dict:
+        """Review `index` (1 = oldest) of a location"""
+        rng = random.Random(f"{config.seed}:review:{location_id}:{index}")
+        if index <= config.reviews:
+            created = started - timedelta(hours=3 * (config.reviews - index + 1))
+        else:
+            created = started + timedelta(hours=(index - config.reviews) / config.review_growth_per_hour)
+        review_id = f"{location_id}-{index}"
+        review = {
+            "name": f"{parent}/reviews/{review_id}",
+            "reviewId": review_id,
+            "reviewer": {
+                "displayName": f"Reviewer {rng.randint(1, 100000)}",
+                "profilePhotoUrl": f"https://example.com/photos/{rng.randint(1, 1000)}.jpg"
+            },
+            "starRating": STAR_RATINGS[min(4, max(0, int(rng.triangular(0, 5, 4))))],
+            "comment": " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 40))).capitalize() + ".",
+            "createTime": _iso(created),
+            "updateTime": _iso(created)
+        }
+        reply = replies.get(review_id)
+        if reply is None and rng.random() < config.replied_share:
+            reply = {"comment": "Thank you for your feedback!", "updateTime": _iso(created + timedelta(hours=2))}
+        if reply is not None:
+            review["reviewReply"] = reply
+        return review
+
+    def parse_location(parent: str) -> int:
+        # v4 names locations under their account, accounts/{account}/locations/{id}, like the real API
+        parts = parent.split("/")
+        if len(parts) != 4 or parts[0] != "accounts" or parts[2] != "locations":
+            raise HTTPException(status_code=404, detail=f"Unknown location {parent}")
+        try:
+            account_id, location_id = int(parts[1]), int(parts[3])
+        except ValueError:
+            raise HTTPException(status_code=404, detail=f"Unknown location {parent}")
+        if not location_exists(location_id) or (location_id - 1) // config.locations + 1 != account_id:
+            raise HTTPException(status_code=404, detail=f"Unknown location {parent}")
+        return location_id
+
+    def parse_review(name: str):
+        parent, _, review_id = name.partition("/reviews/")
+        location_id = parse_location(parent)
+        try:
+            review_location, index = (int(part) for part in review_id.split("-"))
+        except ValueError:
+            raise HTTPException(status_code=404, detail=f"Unknown review {name}")
+        if review_location != location_id or not 1 <= index <= review_count():
+            raise HTTPException(status_code=404, detail=f"Unknown review {name}")
+        return parent, location_id, index
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if request.url.path.startswith("/_"):
+            return await call_next(request)
+        service = "openai" if request.url.path.startswith("/v1/chat") else "gbp"
+        mean = config.openai_latency_ms if service == "openai" else config.gbp_latency_ms
+        delay = max(0.0, fault_rng.gauss(mean, mean * config.latency_jitter)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = fault_rng.random()
+        if roll < config.rate_limit_rate:
+            response = _error(service, 429, "Quota exceeded")
+        elif roll < config.rate_limit_rate + config.error_rate:
+            response = _error(service, 500 if service == "openai" else 503, "Injected failure")
+        else:
+            response = await call_next(request)
+        route = request.scope.get("route")
+        stats["routes"][f"{request.method} {route.path if route is not None else request.url.path}"] += 1
+        stats["statuses"][str(response.status_code)] += 1
+        return response
+
+    @app.get("/v1/accounts")
+    def list_accounts(pageSize: int = 20, pageToken: Optional[str] = None):
+        start = int(pageToken or 0)
+        ids = list(account_ids())[start:start + pageSize]
+        body = {"accounts": [
+            {"name": f"accounts/{account_id}", "accountName": f"Fake account {account_id}", "type": "PERSONAL"}
+            for account_id in ids
+        ]}
+        if start + pageSize < config.accounts:
+            body["nextPageToken"] = str(start + pageSize)
+        return body
+
+    @app.get("/v1/accounts/{account_id}/locations")
+    def list_locations(account_id: int, pageSize: int = 100, pageToken: Optional[str] = None, readMask: str = ""):
+        if account_id not in account_ids():
+            raise HTTPException(status_code=404, detail=f"Unknown account {account_id}")
+        start = int(pageToken or 0)
+        first = (account_id - 1) * config.locations + 1
+        ids = range(first + start, first + min(start + pageSize, config.locations))
+        body = {"locations": [location_resource(location_id) for location_id in ids]}
+        if start + pageSize < config.locations:
+            body["nextPageToken"] = str(start + pageSize)
+        return body
+
+    @app.get("/v1/locations/{location_id}")
+    def get_location(location_id: int):
+        if not location_exists(location_id):
+            raise HTTPException(status_code=404, detail=f"Unknown location {location_id}")
+        return location_resource(location_id)
+
+    @app.get("/v4/{parent:path}/reviews")
+    def list_reviews(parent: str, pageSize: int = REVIEW_PAGE_MAX, pageToken: Optional[str] = None):
+        location_id = parse_location(parent)
+        total = review_count()
+        start = int(pageToken or 0)
+        page_size = min(pageSize, REVIEW_PAGE_MAX)
+        # Newest first, like the real API
+        indexes = range(total - start, max(total - start - page_size, 0), -1)
+        body = {
+            "reviews": [review_resource(parent, location_id, index) for index in indexes],
+            "totalReviewCount": total
+        }
+        if start + page_size < total:
+            body["nextPageToken"] = str(start + page_size)
+        return body
+
+    @app.get("/v4/{name:path}/reviews/{review_id}")
+    def get_review(name: str, review_id: str):
+        parent, location_id, index = parse_review(f"{name}/reviews/{review_id}")
+        return review_resource(parent, location_id, index)
+
+    @app.put("/v4/{name:path}/reviews/{review_id}/reply")
+    async def update_reply(name: str, review_id: str, request: Request):
+        parse_review(f"{name}/reviews/{review_id}")
+        body = await request.json()
+        reply = {"comment": body.get("comment", ""), "updateTime": _iso(datetime.now(timezone.utc))}
+        replies[review_id] = reply
+        return reply
+
+    @app.post("/v4/{parent:path}/localPosts")
+    async def create_local_post(parent: str, request: Request):
+        parse_location(parent)
+        body = await request.json()
+        name = f"{parent}/localPosts/{len(posts) + 1}"
+        post = {**body, "name": name, "state": "LIVE", "createTime": _iso(datetime.now(timezone.utc))}
+        posts[name] = post
+        return post
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        digest = hashlib.sha1(prompt.encode()).hexdigest()
+        rng = random.Random(digest)
+        max_words = max(5, min(int((body.get("max_tokens") or 200) * 0.7), 120))
+        content = " ".join(rng.choice(WORDS) for _ in range(rng.randint(max_words // 3, max_words))).capitalize() + "."
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        return {
+            "id": f"chatcmpl-{digest[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    @app.get("/_stats")
+    def get_stats():
+        return {
+            "routes": dict(stats["routes"]),
+            "statuses": dict(stats["statuses"]),
+            "replies": len(replies),
+            "posts": len(posts),
+            "reviews_per_location": review_count()
+        }
+
+    @app.post("/_reset")
+    def reset():
+        replies.clear()
+        posts.clear()
+        stats["routes"].clear()
+        stats["statuses"].clear()
+        return {"status": "reset"}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--accounts", type=int, default=1)
+    parser.add_argument("--locations", type=int, default=20, help="Locations per account")
+    parser.add_argument("--reviews", type=int, default=100, help="Reviews per location at startup")
+    parser.add_argument("--review-growth-per-hour", type=float, default=0.0, help="New reviews per location per hour")
+    parser.add_argument("--replied-share", type=float, default=0.3, help="Share of seeded reviews that already have a reply")
+    parser.add_argument("--gbp-latency-ms", type=float, default=50.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=400.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.3, help="Standard deviation as a share of the mean")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests failing with 5xx")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    import uvicorn
+    config = FakeConfig(**{key: value for key, value in vars(args).items() if key not in ("host", "port")})
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.google_business import GoogleBusinessService
+
+
+def _review(review_id, update_time):
+    return {"reviewId": review_id, "updateTime": update_time}
+
+
+PAGES = {
+    None: {"reviews": [_review("5", "2026-10-05T00:00:00Z"), _review("4", "2026-10-04T00:00:00.123456789Z")], "nextPageToken": "2"},
+    "2": {"reviews": [_review("3", "2026-10-03T00:00:00Z"), _review("2", "2026-10-02T00:00:00Z")], "nextPageToken": "4"},
+    "4": {"reviews": [_review("1", "2026-10-01T00:00:00Z")]},
+}
+
+
+@pytest.fixture
+def service():
+    # No credentials or discovery documents needed: v4 calls are answered from PAGES
+    service = GoogleBusinessService.__new__(GoogleBusinessService)
+    service.requested = []
+    
+    def v4(method, http_method, path, params=None, body=None):
+        service.requested.append(params["pageToken"])
+        return PAGES[params["pageToken"]]
+    
+    service._v4 = v4
+    return service
+
+
+def _ids(reviews):
+    return [review["reviewId"] for review in reviews]
+
+
+def test_full_walk_follows_every_page(service):
+    assert _ids(service.get_reviews("accounts/1/locations/1")) == ["5", "4", "3", "2", "1"]
+    assert service.requested == [None, "2", "4"]
+
+
+def test_paging_stops_at_the_page_reaching_the_cutoff(service):
+    reviews = service.get_reviews("accounts/1/locations/1", updated_since=datetime(2026, 10, 2, 12))
+    
+    assert _ids(reviews) == ["5", "4", "3", "2"]
+    assert service.requested == [None, "2"]
+
+
+def test_cutoff_on_the_last_review_of_a_page_stops(service):
+    reviews = service.get_reviews("accounts/1/locations/1", updated_since=datetime(2026, 10, 4, 0, 0, 0, 123456))
+    
+    assert _ids(reviews) == ["5", "4"]
+
+
+def test_failed_fetch_is_none(service):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("GBP unavailable")
+    
+    service._v4 = unavailable
+    
+    assert service.get_reviews("accounts/1/locations/1") is None
@@ -0,0 +1,43 @@
+import fakeredis
+import pytest
+from kombu import Connection
+from kombu.transport import redis as redis_transport
+
+from app.core import health
+from app.tasks.celery_app import celery_app
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    """Celery on the kombu Redis transport, backed by fakeredis, with one worker answering pings"""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis_transport.Channel, "_create_client", lambda self, asynchronous=False: fakeredis.FakeRedis(server=server)
+    )
+    monkeypatch.setattr(celery_app, "connection_for_read", lambda: Connection("redis://localhost:6379/0"))
+    monkeypatch.setattr(celery_app.control, "ping", lambda timeout=None: [{"worker@host": {"ok": "pong"}}])
+    return fakeredis.FakeRedis(server=server)
+
+
+def test_empty_queue_is_healthy(broker):
+    result = health.check_workers()
+    
+    assert result["status"] == health.OK
+    assert result["queue_depth"] == 0
+
+
+def test_queue_depth_is_reported(broker, monkeypatch):
+    monkeypatch.setattr(health.settings, "HEALTH_MAX_QUEUE_DEPTH", 2)
+    queue = celery_app.conf.task_default_queue
+    broker.lpush(queue, "a", "b", "c")
+    
+    result = health.check_workers()
+    
+    assert result["status"] == health.DEGRADED
+    assert result["queue_depth"] == 3
+
+
+def test_no_workers_is_down(broker, monkeypatch):
+    monkeypatch.setattr(celery_app.control, "ping", lambda timeout=None: [])
+    
+    assert health.check_workers()["status"] == health.DOWN
@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import List
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.http_cache import conditional_response, invalidate_responses
+
+CHANGED_AT = datetime(2026, 10, 1, 12, 30, 15, 250000)
+
+
+def _request(path="/api/v1/posts/", query="", **headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def _respond(request, count=2, changed_at=CHANGED_AT, load=None, not_found_detail=None):
+    return conditional_response(
+        request, 1, "posts",
+        validators=lambda: (count, changed_at),
+        load=load or (lambda: [{"id": 1}, {"id": 2}]),
+        response_type=List[dict],
+        not_found_detail=not_found_detail
+    )
+
+
+def test_full_response_carries_validators():
+    response = _respond(_request())
+    
+    assert response.status_code == 200
+    assert response.body == b'[{"id":1},{"id":2}]'
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["last-modified"] == "Thu, 01 Oct 2026 12:30:15 GMT"
+    assert response.headers["cache-control"] == "private, no-cache"
+
+
+def test_matching_etag_is_not_modified():
+    etag = _respond(_request()).headers["etag"]
+    
+    for if_none_match in (etag, etag[2:], f'"other", {etag}', "*"):
+        response = _respond(_request(if_none_match=if_none_match), load=pytest.fail)
+        assert response.status_code == 304
+        assert response.body == b""
+        assert response.headers["etag"] == etag
+
+
+def test_changed_rows_invalidate_the_etag():
+    etag = _respond(_request()).headers["etag"]
+    
+    assert _respond(_request(if_none_match=etag), count=3).status_code == 200
+    assert _respond(_request(if_none_match=etag), changed_at=datetime(2026, 10, 1, 12, 30, 15, 900000)).status_code == 200
+    assert _respond(_request(query="page=2", if_none_match=etag)).status_code == 200
+
+
+def test_if_modified_since():
+    assert _respond(_request(if_modified_since="Thu, 01 Oct 2026 12:30:15 GMT")).status_code == 304
+    assert _respond(_request(if_modified_since="Thu, 01 Oct 2026 12:30:14 GMT")).status_code == 200
+    assert _respond(_request(if_modified_since="not a date")).status_code == 200
+
+
+def test_if_none_match_takes_precedence():
+    response = _respond(_request(if_none_match='"other"', if_modified_since="Thu, 01 Oct 2026 12:30:15 GMT"))
+    
+    assert response.status_code == 200
+
+
+def test_empty_detail_is_not_found():
+    with pytest.raises(HTTPException) as error:
+        _respond(_request(path="/api/v1/posts/9"), count=0, changed_at=None, not_found_detail="Post not found")
+    
+    assert error.value.status_code == 404
+
+
+def test_cached_response_skips_the_database(redis_client, monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    etag = _respond(_request()).headers["etag"]
+    
+    def unreachable():
+        raise AssertionError("database read on a cache hit")
+    
+    cached = conditional_response(_request(), 1, "posts", unreachable, unreachable, List[dict])
+    assert cached.status_code == 200
+    assert cached.body == b'[{"id":1},{"id":2}]'
+    assert conditional_response(_request(if_none_match=etag), 1, "posts", unreachable, unreachable, List[dict]).status_code == 304
+    
+    invalidate_responses(1, "posts")
+    
+    assert _respond(_request(), load=lambda: [{"id": 3}]).body == b'[{"id":3}]'
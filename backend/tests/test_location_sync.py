@@ -0,0 +1,36 @@
+from app.core.database import SessionLocal
+from app.models import Location, LocationStats
+from app.tasks import location_tasks
+
+
+def _g_location(name, title):
+    return {"name": name, "title": title, "categories": {"primaryCategory": {"displayName": "Cafe"}}}
+
+
+def test_locations_inserted_by_a_concurrent_sync_are_updated(db, location, monkeypatch):
+    diff_locations = location_tasks._diff_locations
+    
+    def diff_then_race(session, user_id, rows, counts):
+        planned = diff_locations(session, user_id, rows, counts)
+        if not session.info.get("raced"):
+            session.info["raced"] = True
+            # Another worker syncing the same account gets there first
+            other = SessionLocal()
+            other.add(Location(user_id=location.user_id, google_location_id="locations/2", name="Old name"))
+            other.commit()
+            other.close()
+        return planned
+    
+    monkeypatch.setattr(location_tasks, "_diff_locations", diff_then_race)
+    
+    counts = location_tasks.upsert_locations(
+        location.user_id,
+        [_g_location("locations/2", "Bakery"), _g_location("locations/3", "Deli")],
+        "accounts/1"
+    )
+    
+    assert counts == {"created": 1, "updated": 1, "unchanged": 0, "skipped": 0}
+    names = dict(db.query(Location.google_location_id, Location.name))
+    assert names["locations/2"] == "Bakery"
+    assert names["locations/3"] == "Deli"
+    assert db.query(LocationStats).count() == 3
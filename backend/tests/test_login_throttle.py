@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import login_throttle
+from app.core.config import settings
+from app.core.login_throttle import (
+    LoginThrottled, check_login_allowed, clear_login_failures, record_login_failure
+)
+
+
+@pytest.fixture
+def clock(monkeypatch, redis_client):
+    monkeypatch.setattr(settings, "LOGIN_THROTTLE_WINDOW_SECONDS", 300)
+    monkeypatch.setattr(settings, "LOGIN_MAX_ATTEMPTS_PER_IP", 3)
+    monkeypatch.setattr(settings, "LOGIN_MAX_FAILURES_PER_EMAIL", 2)
+    clock = SimpleNamespace(now=3000.0)
+    monkeypatch.setattr(login_throttle, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_ip_is_throttled_within_a_window(clock):
+    for _ in range(3):
+        check_login_allowed("10.0.0.1")
+    
+    clock.now += 100
+    with pytest.raises(LoginThrottled) as error:
+        check_login_allowed("10.0.0.1")
+    assert error.value.retry_after == 200
+    
+    check_login_allowed("10.0.0.2")
+
+
+def test_ip_attempts_reset_in_the_next_window(clock):
+    for _ in range(3):
+        check_login_allowed("10.0.0.1")
+    
+    clock.now += 300
+    check_login_allowed("10.0.0.1")
+
+
+def test_failures_block_the_email_from_that_ip_only(clock):
+    record_login_failure("Owner@Example.com", "10.0.0.1")
+    check_login_allowed("10.0.0.1", "owner@example.com")
+    record_login_failure("owner@example.com ", "10.0.0.1")
+    
+    with pytest.raises(LoginThrottled):
+        check_login_allowed("10.0.0.1", "owner@example.com")
+    check_login_allowed("10.0.0.2", "owner@example.com")
+    
+    clock.now += 300
+    check_login_allowed("10.0.0.1", "owner@example.com")
+
+
+def test_successful_login_clears_failures(clock):
+    record_login_failure("owner@example.com", "10.0.0.1")
+    record_login_failure("owner@example.com", "10.0.0.1")
+    
+    clear_login_failures("owner@example.com", "10.0.0.1")
+    
+    check_login_allowed("10.0.0.1", "owner@example.com")
+
+
+def test_limits_of_zero_disable_throttling(clock, monkeypatch):
+    monkeypatch.setattr(settings, "LOGIN_MAX_ATTEMPTS_PER_IP", 0)
+    monkeypatch.setattr(settings, "LOGIN_MAX_FAILURES_PER_EMAIL", 0)
+    
+    for _ in range(5):
+        record_login_failure("owner@example.com", "10.0.0.1")
+        check_login_allowed("10.0.0.1", "owner@example.com")
+
+
+def test_fails_open_without_redis(monkeypatch):
+    from app.core import redis_client
+    
+    def unavailable():
+        raise ConnectionError("redis down")
+    
+    monkeypatch.setattr(redis_client, "get_redis", unavailable)
+    monkeypatch.setattr(settings, "LOGIN_MAX_ATTEMPTS_PER_IP", 1)
+    for _ in range(3):
+        record_login_failure("owner@example.com", "10.0.0.1")
+        check_login_allowed("10.0.0.1", "owner@example.com")
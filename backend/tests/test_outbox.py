@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from app.models import TaskOutbox
+from app.services import outbox
+
+TASK_NAME = "tests.record"
+
+
+class RecordingTask:
+    name = TASK_NAME
+    
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+    
+    def apply_async(self, args, kwargs, producer=None):
+        if args == self.fail_on:
+            raise ConnectionError("broker unavailable")
+        self.calls.append((args, kwargs))
+
+
+@pytest.fixture
+def task(monkeypatch):
+    from app.tasks import celery_app
+    
+    task = RecordingTask()
+    monkeypatch.setitem(celery_app.tasks, TASK_NAME, task)
+    return task
+
+
+def _add_rows(db, *arg_lists, claimed_until=None):
+    # Added directly, so committing doesn't trigger the inline relay
+    db.add_all([
+        TaskOutbox(task_name=TASK_NAME, args=list(args), kwargs={}, claimed_until=claimed_until)
+        for args in arg_lists
+    ])
+    db.commit()
+
+
+def test_relay_publishes_in_id_order_and_deletes(db, task):
+    _add_rows(db, [3], [1], [2], [5], [4])
+    
+    assert outbox.relay_outbox(batch_size=2) == 5
+    
+    assert [args for args, _ in task.calls] == [[3], [1], [2], [5], [4]]
+    assert db.query(TaskOutbox).count() == 0
+
+
+def test_relay_stops_after_max_batches(db, task):
+    _add_rows(db, [1], [2], [3])
+    
+    assert outbox.relay_outbox(batch_size=2, max_batches=1) == 2
+    
+    assert [args for args, _ in task.calls] == [[1], [2]]
+    assert [row.args for row in db.query(TaskOutbox)] == [[3]]
+
+
+def test_enqueue_is_relayed_after_commit(db, task):
+    outbox.enqueue_many(db, task, [[1], [2]])
+    assert task.calls == []
+    
+    db.commit()
+    
+    assert [args for args, _ in task.calls] == [[1], [2]]
+    assert db.query(TaskOutbox).count() == 0
+
+
+def test_enqueue_is_dropped_on_rollback(db, task):
+    outbox.enqueue_many(db, task, [[1]])
+    db.rollback()
+    
+    assert outbox.relay_outbox() == 0
+    assert task.calls == []
+
+
+def test_relay_skips_claimed_rows_until_the_claim_runs_out(db, task):
+    _add_rows(db, [1], claimed_until=time.time() + 60)
+    _add_rows(db, [2], claimed_until=time.time() - 1)
+    
+    assert outbox.relay_outbox() == 1
+    
+    assert [args for args, _ in task.calls] == [[2]]
+    assert [row.args for row in db.query(TaskOutbox)] == [[1]]
+
+
+def test_failed_publish_keeps_unsent_rows_unclaimed(db, monkeypatch):
+    from app.tasks import celery_app
+    
+    task = RecordingTask(fail_on=[2])
+    monkeypatch.setitem(celery_app.tasks, TASK_NAME, task)
+    _add_rows(db, [1], [2], [3])
+    
+    with pytest.raises(ConnectionError):
+        outbox.relay_outbox()
+    
+    assert [args for args, _ in task.calls] == [[1]]
+    assert [(row.args, row.claimed_until) for row in db.query(TaskOutbox).order_by(TaskOutbox.id)] == [
+        ([2], None), ([3], None)
+    ]
+
+
+def test_unknown_task_rows_are_dropped(db, task):
+    db.add(TaskOutbox(task_name="tests.removed", args=[], kwargs={}))
+    db.commit()
+    
+    assert outbox.relay_outbox() == 1
+    assert db.query(TaskOutbox).count() == 0
@@ -0,0 +1,23 @@
+from app.core.config import settings
+from app.models import Post
+from app.tasks import post_tasks
+
+
+class FakeAIResponseService:
+    def generate_post_content(self, business_name, business_category, topic=None, post_type="UPDATE"):
+        if topic == "broken":
+            raise ConnectionError("OpenAI unavailable")
+        return f"{business_name}: {topic}"
+
+
+def test_failed_slots_are_counted_and_the_rest_inserted(db, location, monkeypatch):
+    monkeypatch.setattr(post_tasks, "AIResponseService", FakeAIResponseService)
+    monkeypatch.setattr(settings, "POST_CACHE_ENABLED", False)
+    
+    result = post_tasks.generate_post_campaign.apply(
+        args=[[location.id], "2026-11-02", "2026-11-16"],
+        kwargs={"topics": ["coffee", "broken"]}
+    )
+    
+    assert result.get() == "Campaign created 2 posts for 1 locations (1 failed)"
+    assert sorted(content for (content,) in db.query(Post.content)) == ["Cafe: coffee", "Cafe: coffee"]
@@ -0,0 +1,71 @@
+from app.models.post import PostStatus, PostType
+from app.services.post_import import _validate_row
+
+LOCATIONS = {"locations/1": 1}
+LOCATION_IDS = {1, 2}
+
+
+def test_valid_row_defaults_to_draft():
+    post, errors = _validate_row({"location_id": "2", "content": " Hello "}, LOCATIONS, LOCATION_IDS)
+    
+    assert errors is None
+    assert post["location_id"] == 2
+    assert post["content"] == "Hello"
+    assert post["post_type"] == PostType.UPDATE
+    assert post["status"] == PostStatus.DRAFT
+    assert post["ai_generated"] is False
+
+
+def test_scheduled_at_makes_the_post_scheduled():
+    post, errors = _validate_row(
+        {"location_id": "1", "content": "Hello", "scheduled_at": "2026-11-01T10:00:00"},
+        LOCATIONS, LOCATION_IDS
+    )
+    
+    assert errors is None
+    assert post["status"] == PostStatus.SCHEDULED
+    assert post["scheduled_at"].isoformat() == "2026-11-01T10:00:00"
+
+
+def test_google_location_id_is_resolved():
+    post, errors = _validate_row({"google_location_id": "locations/1", "content": "Hello"}, LOCATIONS, LOCATION_IDS)
+    
+    assert errors is None
+    assert post["location_id"] == 1
+
+
+def test_unknown_google_location_id():
+    post, errors = _validate_row({"google_location_id": "locations/9", "content": "Hello"}, LOCATIONS, LOCATION_IDS)
+    
+    assert post is None
+    assert errors == ["google_location_id: unknown location locations/9"]
+
+
+def test_location_of_another_user():
+    post, errors = _validate_row({"location_id": "3", "content": "Hello"}, LOCATIONS, LOCATION_IDS)
+    
+    assert post is None
+    assert errors == ["location_id: location 3 not found"]
+
+
+def test_field_errors_are_reported_per_field():
+    post, errors = _validate_row(
+        {"location_id": "1", "content": "  ", "post_type": "BOGUS"}, LOCATIONS, LOCATION_IDS
+    )
+    
+    assert post is None
+    assert [error.split(":")[0] for error in errors] == ["content", "post_type"]
+
+
+def test_scheduled_status_needs_a_time():
+    post, errors = _validate_row({"location_id": "1", "content": "Hello", "status": "SCHEDULED"}, LOCATIONS, LOCATION_IDS)
+    
+    assert post is None
+    assert len(errors) == 1 and "scheduled_at is required" in errors[0]
+
+
+def test_published_status_is_rejected():
+    post, errors = _validate_row({"location_id": "1", "content": "Hello", "status": "PUBLISHED"}, LOCATIONS, LOCATION_IDS)
+    
+    assert post is None
+    assert "status must be DRAFT or SCHEDULED" in errors[0]
@@ -0,0 +1,98 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import LocationStats, Post, TaskOutbox
+from app.models.post import PostStatus
+from app.tasks import post_tasks
+
+
+def _scheduled_post(db, location, content="Hello"):
+    post = Post(
+        location_id=location.id,
+        content=content,
+        status=PostStatus.SCHEDULED,
+        scheduled_at=datetime.utcnow() - timedelta(minutes=1)
+    )
+    db.add(post)
+    db.commit()
+    return post
+
+
+def test_repeated_publish_task_posts_once(db, location, google):
+    post = _scheduled_post(db, location)
+    
+    assert post_tasks.publish_post(post.id) == f"Post {post.id} published successfully"
+    assert post_tasks.publish_post(post.id) == f"Post {post.id} already published"
+    
+    assert google.calls == [("create_post", "accounts/1/locations/1", "Hello")]
+    db.expire_all()
+    assert post.status == PostStatus.PUBLISHED
+    assert post.claimed_until is None
+    stats = db.query(LocationStats).filter(LocationStats.location_id == location.id).one()
+    assert (stats.posts_scheduled, stats.posts_published) == (0, 1)
+
+
+def test_claim_is_taken_once(db, location):
+    post = _scheduled_post(db, location)
+    other = post_tasks.SessionLocal()
+    try:
+        competing = other.get(Post, post.id)
+        assert post_tasks.claim_post(db, post)
+        assert not post_tasks.claim_post(other, competing)
+        assert competing.status == PostStatus.SCHEDULED
+    finally:
+        other.close()
+
+
+def test_scheduler_skips_posts_already_in_outbox(db, location, monkeypatch):
+    queued = _scheduled_post(db, location, "queued")
+    due = _scheduled_post(db, location, "due")
+    db.add(TaskOutbox(task_name=post_tasks.publish_post.name, args=[queued.id], kwargs={}))
+    db.commit()
+    enqueued = []
+    monkeypatch.setattr(post_tasks, "enqueue_many", lambda session, task, arg_lists: enqueued.extend(arg_lists))
+    
+    assert post_tasks.publish_scheduled_posts() == "Queued 1 posts for publishing"
+    assert enqueued == [(due.id,)]
+
+
+def test_post_stays_scheduled_when_the_run_dies(db, location, google):
+    post = _scheduled_post(db, location)
+    google.post_error = KeyboardInterrupt()
+    
+    with pytest.raises(KeyboardInterrupt):
+        post_tasks.publish_post(post.id)
+    
+    db.expire_all()
+    assert post.status == PostStatus.SCHEDULED
+    assert post.published_at is None
+    assert post.claimed_until > time.time()
+
+
+def test_scheduler_queues_posts_again_once_their_claim_runs_out(db, location, monkeypatch):
+    live = _scheduled_post(db, location, "live")
+    expired = _scheduled_post(db, location, "expired")
+    live.claimed_until = time.time() + 60
+    expired.claimed_until = time.time() - 1
+    db.commit()
+    enqueued = []
+    monkeypatch.setattr(post_tasks, "enqueue_many", lambda session, task, arg_lists: enqueued.extend(arg_lists))
+    
+    post_tasks.publish_scheduled_posts()
+    
+    assert enqueued == [(expired.id,)]
+
+
+def test_failed_publish_releases_the_claim(db, location, google):
+    post = _scheduled_post(db, location)
+    google.post_result = None
+    
+    assert post_tasks.publish_post(post.id) == f"Failed to publish post {post.id}"
+    
+    db.expire_all()
+    assert post.status == PostStatus.FAILED
+    assert post.claimed_until is None
+    stats = db.query(LocationStats).filter(LocationStats.location_id == location.id).one()
+    assert (stats.posts_scheduled, stats.posts_failed) == (0, 1)
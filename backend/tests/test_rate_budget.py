@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import rate_budget
+from app.services.rate_budget import RateBudget
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time for rate_budget; sleeping advances it"""
+    clock = SimpleNamespace(now=1000.0, slept=[])
+    
+    def sleep(seconds):
+        clock.slept.append(seconds)
+        clock.now += seconds
+    
+    monkeypatch.setattr(rate_budget, "time", SimpleNamespace(time=lambda: clock.now, monotonic=lambda: clock.now, sleep=sleep))
+    return clock
+
+
+def test_budget_is_shared_between_instances(redis_client, clock):
+    first = RateBudget(requests_per_minute=2, tokens_per_minute=1000)
+    second = RateBudget(requests_per_minute=2, tokens_per_minute=1000)
+    
+    first.acquire(10)
+    second.acquire(10)
+    assert clock.slept == []
+    
+    first.acquire(10)
+    assert sum(clock.slept) == pytest.approx(30)
+
+
+def test_tokens_are_limited_too(redis_client, clock):
+    budget = RateBudget(requests_per_minute=100, tokens_per_minute=600)
+    
+    budget.acquire(600)
+    budget.acquire(300)
+    
+    assert sum(clock.slept) == pytest.approx(30)
+
+
+def test_budgets_with_other_names_are_separate(redis_client, clock):
+    RateBudget(1, 1000, name="a").acquire()
+    RateBudget(1, 1000, name="b").acquire()
+    
+    assert clock.slept == []
+
+
+def test_falls_back_to_a_local_budget_without_redis(monkeypatch, clock):
+    from app.core import redis_client
+    
+    def unavailable():
+        raise ConnectionError("redis down")
+    
+    monkeypatch.setattr(redis_client, "get_redis", unavailable)
+    budget = RateBudget(requests_per_minute=1, tokens_per_minute=1000)
+    
+    budget.acquire()
+    budget.acquire()
+    
+    assert sum(clock.slept) == pytest.approx(60)
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models import LocationSyncSchedule, Review
+from app.services.sync_schedule import claim_due_locations
+from app.tasks import review_tasks
+
+
+def _next_sync_at(db, location):
+    db.expire_all()
+    return db.get(LocationSyncSchedule, location.id).next_sync_at.replace(tzinfo=None)
+
+
+def test_failed_fetch_is_not_recorded_as_a_sync(db, location, google):
+    now = datetime.utcnow()
+    assert claim_due_locations(db, now=now) == [location.id]
+    db.commit()
+    google.reviews = None
+    
+    assert review_tasks.sync_location_reviews(location.id) == f"Failed to fetch reviews for location {location.id}"
+    
+    schedule = db.get(LocationSyncSchedule, location.id)
+    assert schedule.last_synced_at is None
+    # Retried once the claim lease runs out
+    assert _next_sync_at(db, location) == now + timedelta(seconds=settings.REVIEW_SYNC_MIN_INTERVAL_SECONDS)
+
+
+def test_empty_fetch_is_recorded(db, location, google):
+    assert review_tasks.sync_location_reviews(location.id).startswith("Synced 0 new reviews")
+    
+    schedule = db.get(LocationSyncSchedule, location.id)
+    assert schedule.last_synced_at is not None
+    assert _next_sync_at(db, location) > datetime.utcnow()
+
+
+def test_syncs_fetch_changes_since_the_previous_sync(db, location, google):
+    review_tasks.sync_location_reviews(location.id)
+    first_sync = db.get(LocationSyncSchedule, location.id).last_synced_at.replace(tzinfo=None)
+    db.expire_all()
+    
+    review_tasks.sync_location_reviews(location.id)
+    
+    assert [call[2] for call in google.calls] == [None, first_sync]
+
+
+def test_full_fetch_once_per_reconcile_interval(db, location, google):
+    review_tasks.sync_location_reviews(location.id)
+    schedule = db.get(LocationSyncSchedule, location.id)
+    schedule.last_reconciled_at = datetime.utcnow() - timedelta(seconds=settings.REVIEW_RECONCILE_INTERVAL_SECONDS)
+    db.commit()
+    
+    review_tasks.sync_location_reviews(location.id)
+    
+    assert [call[2] for call in google.calls] == [None, None]
+    db.expire_all()
+    assert schedule.last_reconciled_at.replace(tzinfo=None) > datetime.utcnow() - timedelta(minutes=1)
+
+
+def test_sign_stored_reviews_triages_and_signs_old_reviews(db, location):
+    comment = "The coffee was cold and the staff ignored us for twenty minutes at the counter"
+    db.add_all([
+        Review(location_id=location.id, google_review_id="old", rating=1.0, comment=comment),
+        Review(location_id=location.id, google_review_id="no-comment", rating=5.0, comment=None)
+    ])
+    db.commit()
+    
+    assert review_tasks.sign_stored_reviews(batch_size=1) == "Classified 2 and signed 1 stored reviews"
+    
+    db.expire_all()
+    old = db.query(Review).filter_by(google_review_id="old").one()
+    assert old.sentiment == "negative"
+    assert old.content_signature is not None
+    no_comment = db.query(Review).filter_by(google_review_id="no-comment").one()
+    assert no_comment.sentiment is not None
+    assert no_comment.content_signature is None
+    # Nothing left to do on a second run
+    assert review_tasks.sign_stored_reviews() == "Classified 0 and signed 0 stored reviews"
@@ -0,0 +1,52 @@
+import pytest
+
+from app.core.config import settings
+from app.services.sync_schedule import sync_interval, updated_rate
+
+
+class FixedRandom:
+    def __init__(self, pick):
+        self.pick = pick
+    
+    def uniform(self, low, high):
+        return {"low": low, "mid": (low + high) / 2, "high": high}[self.pick]
+
+
+@pytest.fixture(autouse=True)
+def schedule_settings(monkeypatch):
+    monkeypatch.setattr(settings, "REVIEW_SYNC_TARGET_REVIEWS", 1.0)
+    monkeypatch.setattr(settings, "REVIEW_SYNC_MIN_INTERVAL_SECONDS", 900.0)
+    monkeypatch.setattr(settings, "REVIEW_RECONCILE_INTERVAL_SECONDS", 48 * 3600.0)
+    monkeypatch.setattr(settings, "REVIEW_SYNC_JITTER", 0.2)
+    monkeypatch.setattr(settings, "REVIEW_SYNC_RATE_HALF_LIFE_DAYS", 14.0)
+
+
+def test_interval_targets_one_review_per_sync():
+    assert sync_interval(4.0, FixedRandom("mid")) == pytest.approx(6 * 3600)
+
+
+@pytest.mark.parametrize("rate", [0.0, -1.0, 0.01])
+def test_quiet_locations_wait_the_reconcile_interval(rate):
+    assert sync_interval(rate, FixedRandom("mid")) == pytest.approx(48 * 3600)
+
+
+def test_busy_locations_wait_the_minimum_interval():
+    assert sync_interval(10000.0, FixedRandom("mid")) == pytest.approx(900)
+
+
+def test_interval_is_jittered_both_ways():
+    assert sync_interval(4.0, FixedRandom("low")) == pytest.approx(6 * 3600 * 0.8)
+    assert sync_interval(4.0, FixedRandom("high")) == pytest.approx(6 * 3600 * 1.2)
+
+
+def test_rate_moves_halfway_over_one_half_life():
+    assert updated_rate(2.0, arrivals=56, elapsed_days=14.0) == pytest.approx(3.0)
+
+
+def test_rate_is_unchanged_by_matching_observations():
+    assert updated_rate(2.0, arrivals=2, elapsed_days=1.0) == pytest.approx(2.0)
+
+
+def test_short_observations_carry_little_weight():
+    # One review in a quarter hour is 100 a day, but covers very little time
+    assert 2.0 < updated_rate(2.0, arrivals=1, elapsed_days=0.01) < 2.1
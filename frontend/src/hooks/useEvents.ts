@@ -0,0 +1,89 @@
+import { useEffect, useRef } from 'react';
+import { API_URL, eventsAPI } from '../services/api';
+
+export type ServerEvent =
+  | { type: 'invalidate'; resources: string[] }
+  | {
+      type: 'task';
+      task_id: string;
+      task: string;
+      state: string;
+      progress?: Record<string, number>;
+      result?: string;
+    }
+  | { type: 'resync' };
+
+// Invalidations arriving within this window are delivered as one event
+const INVALIDATE_DEBOUNCE_MS = 500;
+// Wait before reconnecting with a fresh stream token, like the server's retry: hint
+const RECONNECT_DELAY_MS = 5000;
+
+export const useEvents = (onEvent: (event: ServerEvent) => void) => {
+  const handler = useRef(onEvent);
+  handler.current = onEvent;
+
+  useEffect(() => {
+    if (!localStorage.getItem('token')) {
+      return;
+    }
+
+    const pending = new Set<string>();
+    let timer: ReturnType<typeof setTimeout> | undefined;
+    let reconnect: ReturnType<typeof setTimeout> | undefined;
+    let source: EventSource | undefined;
+    let stopped = false;
+    let opened = false;
+
+    const onInvalidate = (message: MessageEvent) => {
+      JSON.parse(message.data).resources.forEach((resource: string) => pending.add(resource));
+      clearTimeout(timer);
+      timer = setTimeout(() => {
+        handler.current({ type: 'invalidate', resources: Array.from(pending) });
+        pending.clear();
+      }, INVALIDATE_DEBOUNCE_MS);
+    };
+    const onMessage = (message: MessageEvent) => handler.current(JSON.parse(message.data));
+
+    const connect = async () => {
+      let streamToken: string;
+      try {
+        streamToken = (await eventsAPI.getStreamToken()).data.token;
+      } catch {
+        reconnect = setTimeout(connect, RECONNECT_DELAY_MS);
+        return;
+      }
+      if (stopped) {
+        return;
+      }
+
+      // EventSource can't send headers, so a short-lived stream token goes in the query string
+      const current = new EventSource(`${API_URL}/events/?token=${encodeURIComponent(streamToken)}`);
+      current.addEventListener('invalidate', onInvalidate);
+      current.addEventListener('task', onMessage);
+      current.addEventListener('resync', onMessage);
+      current.onopen = () => {
+        // Events sent while reconnecting are lost, so views re-read their data
+        if (opened) {
+          handler.current({ type: 'resync' });
+        }
+        opened = true;
+      };
+      current.onerror = () => {
+        // The browser retries dropped streams itself, but gives up once the
+        // server refuses one, e.g. because the stream token has expired
+        if (current.readyState === EventSource.CLOSED) {
+          reconnect = setTimeout(connect, RECONNECT_DELAY_MS);
+        }
+      };
+      source = current;
+    };
+    connect();
+
+    return () => {
+      stopped = true;
+      clearTimeout(timer);
+      clearTimeout(reconnect);
+      source?.close();
+    };
+  }, []);
+};
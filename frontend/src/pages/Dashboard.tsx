@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import Layout from '../components/layout/Layout';
-import { locationsAPI, postsAPI, reviewsAPI } from '../services/api';
+import { statsAPI } from '../services/api';
 import { MapPin, FileText, Star, TrendingUp } from 'lucide-react';
 
 export default function Dashboard() {
@@ -19,22 +19,15 @@ export default function Dashboard() {
 
   const fetchStats = async () => {
     try {
-      const [locationsRes, postsRes, reviewsRes] = await Promise.all([
-        locationsAPI.getAll(),
-        postsAPI.getAll(),
-        reviewsAPI.getAll(),
-      ]);
-
-      const reviews = reviewsRes.data;
-      const avgRating = reviews.length > 0
-        ? reviews.reduce((acc: number, r: any) => acc + r.rating, 0) / reviews.length
-        : 0;
+      const { data } = await statsAPI.get();
+      const posts = Object.values(data.posts_by_status as Record<string, number>)
+        .reduce((acc, count) => acc + count, 0);
 
       setStats({
-        locations: locationsRes.data.length,
-        posts: postsRes.data.length,
-        reviews: reviews.length,
-        avgRating: Math.round(avgRating * 10) / 10,
+        locations: data.location_count,
+        posts,
+        reviews: data.review_count,
+        avgRating: data.average_rating ?? 0,
       });
     } catch (error) {
       console.error('Failed to fetch stats:', error);
@@ -1,12 +1,14 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useRef, useState } from 'react';
 import Layout from '../components/layout/Layout';
-import { locationsAPI } from '../services/api';
+import { locationsAPI, tasksAPI } from '../services/api';
+import { useEvents } from '../hooks/useEvents';
 import { MapPin, RefreshCw, Settings } from 'lucide-react';
 
 export default function Locations() {
   const [locations, setLocations] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const [syncing, setSyncing] = useState(false);
+  const syncTaskId = useRef<string | null>(null);
 
   useEffect(() => {
     fetchLocations();
@@ -23,16 +25,49 @@ export default function Locations() {
     }
   };
 
+  const finishSync = (state: string, result?: string) => {
+    syncTaskId.current = null;
+    setSyncing(false);
+    if (state === 'FAILURE') {
+      console.error('Failed to sync locations:', result);
+      alert('Failed to sync locations. Make sure your Google account is connected.');
+    } else {
+      alert(result || 'Locations synced successfully');
+    }
+    fetchLocations();
+  };
+
+  // For when the task finished while the event stream wasn't listening
+  const checkSync = async (taskId: string) => {
+    const status = (await tasksAPI.get(taskId)).data;
+    if (syncTaskId.current === taskId && ['SUCCESS', 'FAILURE'].includes(status.state)) {
+      finishSync(status.state, status.result);
+    }
+  };
+
+  useEvents((event) => {
+    if (event.type === 'task' && event.task_id === syncTaskId.current) {
+      if (['SUCCESS', 'FAILURE'].includes(event.state)) {
+        finishSync(event.state, event.result);
+      }
+    } else if (event.type === 'resync' || (event.type === 'invalidate' && event.resources.includes('locations'))) {
+      fetchLocations();
+      if (event.type === 'resync' && syncTaskId.current) {
+        checkSync(syncTaskId.current);
+      }
+    }
+  });
+
   const handleSync = async () => {
     setSyncing(true);
     try {
-      await locationsAPI.sync();
-      alert('Locations synced successfully');
-      fetchLocations();
+      const { data } = await locationsAPI.sync();
+      syncTaskId.current = data.task_id;
+      await checkSync(data.task_id);
     } catch (error) {
       console.error('Failed to sync locations:', error);
       alert('Failed to sync locations. Make sure your Google account is connected.');
-    } finally {
+      syncTaskId.current = null;
       setSyncing(false);
     }
   };
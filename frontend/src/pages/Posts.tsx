@@ -1,6 +1,7 @@
 import { useEffect, useState } from 'react';
 import Layout from '../components/layout/Layout';
 import { postsAPI, locationsAPI } from '../services/api';
+import { useEvents } from '../hooks/useEvents';
 import { Plus, Send, Trash2, Sparkles } from 'lucide-react';
 import { format } from 'date-fns';
 
@@ -18,6 +19,15 @@ export default function Posts() {
     fetchData();
   }, []);
 
+  useEvents((event) => {
+    if (
+      event.type === 'resync' ||
+      (event.type === 'invalidate' && event.resources.some((r) => ['posts', 'locations'].includes(r)))
+    ) {
+      fetchData();
+    }
+  });
+
   const fetchData = async () => {
     try {
       const [postsRes, locationsRes] = await Promise.all([
@@ -62,7 +72,6 @@ export default function Posts() {
     try {
       await postsAPI.publish(postId);
       alert('Post queued for publishing');
-      fetchData();
     } catch (error) {
       console.error('Failed to publish post:', error);
     }
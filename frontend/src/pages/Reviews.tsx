@@ -1,6 +1,7 @@
 import { useEffect, useState } from 'react';
 import Layout from '../components/layout/Layout';
 import { reviewsAPI } from '../services/api';
+import { useEvents } from '../hooks/useEvents';
 import { Star, MessageSquare, Sparkles } from 'lucide-react';
 import { format } from 'date-fns';
 
@@ -15,6 +16,12 @@ export default function Reviews() {
     fetchReviews();
   }, []);
 
+  useEvents((event) => {
+    if (event.type === 'resync' || (event.type === 'invalidate' && event.resources.includes('reviews'))) {
+      fetchReviews();
+    }
+  });
+
   const fetchReviews = async () => {
     try {
       const response = await reviewsAPI.getAll();
@@ -53,7 +60,6 @@ export default function Reviews() {
     try {
       await reviewsAPI.sync();
       alert('Reviews sync started');
-      setTimeout(fetchReviews, 2000);
     } catch (error) {
       console.error('Failed to sync reviews:', error);
     }
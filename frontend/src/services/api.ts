@@ -1,6 +1,6 @@
 import axios from 'axios';
 
-const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1';
+export const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api/v1';
 
 const api = axios.create({
   baseURL: API_URL,
@@ -50,6 +50,7 @@ export const locationsAPI = {
   update: (id: number, data: any) => api.put(`/locations/${id}`, data),
   delete: (id: number) => api.delete(`/locations/${id}`),
   sync: () => api.post('/locations/sync'),
+  getSyncStatus: (taskId: string) => api.get(`/locations/sync/${taskId}`),
 };
 
 // Posts
@@ -79,4 +80,20 @@ export const reviewsAPI = {
     api.post('/reviews/sync', null, { params: { location_id: locationId } }),
 };
 
+// Tasks
+export const tasksAPI = {
+  get: (taskId: string) => api.get(`/tasks/${taskId}`),
+};
+
+// Events
+export const eventsAPI = {
+  getStreamToken: () => api.post('/events/token'),
+};
+
+// Stats
+export const statsAPI = {
+  get: (locationId?: number) =>
+    api.get('/stats/', { params: { location_id: locationId } }),
+};
+
 export default api;